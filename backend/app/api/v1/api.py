@@ -1,7 +1,9 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import interviews
+from app.api.v1.endpoints import interviews, jobs, live
 api_router = APIRouter()
 
 # include all endpoint routers with their prefixes and tags
 #api_router.include_router(auth.router, prefix="/auth", tags=["authentication"])
-api_router.include_router(interviews.router, prefix="/interviews", tags=["interviews"]) 
\ No newline at end of file
+api_router.include_router(interviews.router, prefix="/interviews", tags=["interviews"])
+api_router.include_router(jobs.router, prefix="/jobs", tags=["jobs"])
+api_router.include_router(live.router, prefix="/live", tags=["live"])
@@ -1,11 +1,14 @@
 #  API endpoints for InterviewAI platform
 # handles  interview creation, analysis, file uploads, and metrics
-from fastapi import APIRouter, HTTPException, status, UploadFile, File, Depends
+from fastapi import APIRouter, HTTPException, status, UploadFile, File, Depends, Header, Query, Request, Response
+from fastapi.responses import PlainTextResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, tuple_
+from sqlalchemy.orm import load_only
 from typing import List, Optional
+import asyncio
+import base64
 import os
-import uuid
 from datetime import datetime
 import json
 import logging
@@ -13,8 +16,19 @@ import time
 
 # imports for database, services, and models
 from app.core.database import get_db
-from app.services.ai_analysis import transcribe_audio, analyze_sentiment, analyze_eye_contact, extract_audio_from_video
+from app.services.analysis_executor import analysis_executor
+from app.services.loop_monitor import loop_monitor
 from app.services.metrics import metrics_service
+from app.services.model_registry import model_registry
+from app.services.response_cache import response_cache, etag_matches
+from app.services.result_cache import result_cache
+from app.services.pipeline import (
+    analyze_video, analyze_sentiment, build_interview, build_response, rescore_sentiment,
+    transcribe_media_stream, AnalysisError
+)
+from app.services.tracing import tracer, span
+from app.services.storage import media_storage
+from app.services.uploads import UploadRejected
 from app.core.config import settings
 from app.models.interview import Interview
 from app.schemas.interview import (
@@ -48,6 +62,8 @@ async def create_interview(
         db.add(db_interview)
         await db.commit()
         await db.refresh(db_interview)
+        # sqlite can hand out the id of a deleted row again
+        response_cache.invalidate(db_interview.id)
         
         processing_time = time.time() - start_time
         logger.info(f"Interview created successfully: ID {db_interview.id} (took {processing_time:.2f}s)")
@@ -61,31 +77,125 @@ async def create_interview(
         logger.error(f"Error creating interview: {e} (took {processing_time:.2f}s)")
         raise HTTPException(status_code=500, detail="Failed to create interview")
 
-# async function to retrieve all interviews from the database 
+# columns returned by the list endpoint, the transcript and feedback blobs are never loaded for it
+LIST_COLUMNS = (Interview.id, Interview.title, Interview.interview_type, Interview.status,
+                Interview.created_at, Interview.updated_at)
+
+
+def encode_cursor(interview) -> str:
+    # opaque cursor pointing just past the given row in (created_at, id) order
+    raw = json.dumps([interview.created_at.isoformat(), interview.id])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str):
+    try:
+        created_at, interview_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(created_at), int(interview_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+# async function to retrieve interviews from the database, newest first, one page at a time
 # Depends(get_db) tels fastAPI to provide a db connection , fast api willcall get_db() and pass result to thsi function
+# keyset pagination - the cursor holds the (created_at, id) of the last row so every page is an index range scan
 @router.get("/", response_model=List[InterviewSchema])
-async def get_interviews(db: AsyncSession = Depends(get_db)):
-    # retrieve all interviews from the database
+async def get_interviews(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
     start_time = time.time()
-    logger.info("Fetching all interviews")
+    limit = min(limit or settings.interviews_page_size, settings.interviews_max_page_size)
+    logger.info(f"Fetching interviews (limit {limit})")
     
     try:
-        result = await db.execute(select(Interview).order_by(Interview.created_at.desc()))
+        query = (
+            select(Interview)
+            .options(load_only(*LIST_COLUMNS))
+            .order_by(Interview.created_at.desc(), Interview.id.desc())
+            .limit(limit + 1)  # one extra row tells us whether there is a next page
+        )
+        if cursor:
+            query = query.where(tuple_(Interview.created_at, Interview.id) < tuple_(*decode_cursor(cursor)))
+        result = await db.execute(query)
         interviews = result.scalars().all()
+        if len(interviews) > limit:
+            interviews = interviews[:limit]
+            response.headers["X-Next-Cursor"] = encode_cursor(interviews[-1])
         processing_time = time.time() - start_time
         logger.info(f"Retrieved {len(interviews)} interviews (took {processing_time:.2f}s)")
         metrics_service.record_api_request("/api/v1/interviews/", "GET", 200, processing_time)
         
         return interviews
+    except HTTPException:
+        processing_time = time.time() - start_time
+        metrics_service.record_api_request("/api/v1/interviews/", "GET", 400, processing_time)
+        raise
     except Exception as e:
         processing_time = time.time() - start_time
         logger.error(f"Error fetching interviews: {e} (took {processing_time:.2f}s)")
         metrics_service.record_api_request("/api/v1/interviews/", "GET", 500, processing_time)
         raise HTTPException(status_code=500, detail="Failed to fetch interviews")
 
+# re-runs sentiment over every stored transcript, e.g. after the sentiment engine changed
+@router.post("/rescore-sentiment/")
+async def rescore_stored_sentiment(
+    batch_size: int = Query(500, ge=1, le=5000),
+    db: AsyncSession = Depends(get_db)
+):
+    start_time = time.time()
+    try:
+        rescored = await rescore_sentiment(db, batch_size)
+    except Exception as e:
+        processing_time = time.time() - start_time
+        logger.error(f"Sentiment rescoring failed: {e} (took {processing_time:.2f}s)")
+        metrics_service.record_api_request("/api/v1/interviews/rescore-sentiment/", "POST", 500, processing_time)
+        raise HTTPException(status_code=500, detail="Sentiment rescoring failed")
+    processing_time = time.time() - start_time
+    logger.info(f"Rescored sentiment of {rescored} interviews (took {processing_time:.2f}s)")
+    metrics_service.record_api_request("/api/v1/interviews/rescore-sentiment/", "POST", 200, processing_time)
+    return {"rescored": rescored, "processing_time": round(processing_time, 2)}
+
+# declared before /{interview_id} so "metrics" is not parsed as an interview id
+@router.get("/metrics")
+async def get_metrics():
+    logger.info("Metrics endpoint accessed")
+    try:
+        #helper method to get metrics 
+        metrics_summary = metrics_service.get_summary()
+        metrics_summary["result_cache"] = result_cache.stats()
+        metrics_summary["response_cache"] = response_cache.stats()
+        metrics_summary["traces"] = tracer.recent_traces()
+        metrics_summary["event_loop"] = loop_monitor.stats()
+        metrics_summary["storage"] = media_storage.stats()
+        logger.info("Metrics retrieved successfully")
+        return {
+            "status": "success",
+            "data": metrics_summary,
+            "timestamp": datetime.now().isoformat()
+        }
+    except Exception as e:
+        logger.error(f"Error retrieving metrics: {e}")
+        raise HTTPException(status_code=500, detail="Failed to retrieve metrics")
+
+# prometheus scrape target - latency histograms per endpoint and per traced stage
+@router.get("/metrics/prometheus", response_class=PlainTextResponse)
+async def get_prometheus_metrics():
+    return PlainTextResponse(metrics_service.export_prometheus(), media_type="text/plain; version=0.0.4")
+
+def cached_json_response(etag: str, body: bytes, if_none_match: Optional[str]) -> Response:
+    # 304 when the client already holds this version, clients must revalidate before reusing it
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
 @router.get("/{interview_id}", response_model=InterviewWithQuestions)
 async def get_interview(
     interview_id: int,
+    if_none_match: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db)
 ):
     # retrieve a specific interview by its id
@@ -93,28 +203,33 @@ async def get_interview(
     logger.info(f"Fetching interview ID: {interview_id}")
     
     try:
-        # query specific interview by id
-        result = await db.execute(select(Interview).where(Interview.id == interview_id))
-        interview = result.scalar_one_or_none()
-        if not interview:
-            logger.warning(f"Interview not found: ID {interview_id}")
-            processing_time = time.time() - start_time
-            metrics_service.record_api_request(f"/api/v1/interviews/{interview_id}", "GET", 404, processing_time)
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Interview not found"
-            )
+        cached = response_cache.get("interview", interview_id)
+        if cached is None:
+            # query specific interview by id
+            result = await db.execute(select(Interview).where(Interview.id == interview_id))
+            interview = result.scalar_one_or_none()
+            if not interview:
+                logger.warning(f"Interview not found: ID {interview_id}")
+                processing_time = time.time() - start_time
+                metrics_service.record_api_request("/api/v1/interviews/{interview_id}", "GET", 404, processing_time)
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Interview not found"
+                )
+            payload = InterviewWithQuestions.model_validate(interview).model_dump(mode="json")
+            cached = response_cache.put("interview", interview_id, payload)
         
+        response = cached_json_response(*cached, if_none_match)
         processing_time = time.time() - start_time
         logger.info(f"Interview retrieved successfully: ID {interview_id} (took {processing_time:.2f}s)")
-        metrics_service.record_api_request(f"/api/v1/interviews/{interview_id}", "GET", 200, processing_time)
-        return interview
+        metrics_service.record_api_request("/api/v1/interviews/{interview_id}", "GET", response.status_code, processing_time)
+        return response
     except HTTPException:
         raise
     except Exception as e:
         processing_time = time.time() - start_time
         logger.error(f"Error fetching interview {interview_id}: {e} (took {processing_time:.2f}s)")
-        metrics_service.record_api_request(f"/api/v1/interviews/{interview_id}", "GET", 500, processing_time)
+        metrics_service.record_api_request("/api/v1/interviews/{interview_id}", "GET", 500, processing_time)
         raise HTTPException(status_code=500, detail="Failed to fetch interview")
 # checks the non physical attributes of person 
 @router.post("/upload-audio/")
@@ -123,25 +238,37 @@ async def upload_audio(file: UploadFile = File(...)):
     start_time = time.time()
     logger.info(f"Processing audio upload: {file.filename}")
     
+    file_location = None
     try:
-        # save uploaded file to local storage
-        file_location = f"uploads/{file.filename}"
-        with open(file_location, "wb") as f:
-            f.write(await file.read())
+        # stream uploaded file to local storage in chunks, under a key of its own
+        upload = await media_storage.save_upload(file)
+        file_location = upload.path
         
-        # process audio using local ai services 
-        transcript = transcribe_audio(file_location)
-        sentiment = analyze_sentiment(transcript)
+        # process audio using local ai services in the analysis pool
+        # ffmpeg decodes any supported container so mp3 works as well as wav
+        transcription = await analysis_executor.run(transcribe_media_stream, file_location)
+        if transcription is None:
+            raise RuntimeError("Audio decoding failed (ffmpeg required)")
+        transcript = transcription["transcript"]
+        sentiment = await analysis_executor.run(analyze_sentiment, transcript, transcription["word_track"])
         
         processing_time = time.time() - start_time
         logger.info(f"Audio processing completed: {file.filename} (took {processing_time:.2f}s)")
         metrics_service.record_api_request("/api/v1/interviews/upload-audio/", "POST", 200, processing_time)
         return {"transcript": transcript, "sentiment": sentiment}
+    except UploadRejected as e:
+        processing_time = time.time() - start_time
+        logger.warning(f"Audio upload rejected: {file.filename} - {e.detail}")
+        metrics_service.record_api_request("/api/v1/interviews/upload-audio/", "POST", e.status_code, processing_time)
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
     except Exception as e:
         processing_time = time.time() - start_time
         logger.error(f"Audio processing failed: {file.filename} - {e} (took {processing_time:.2f}s)")
         metrics_service.record_api_request("/api/v1/interviews/upload-audio/", "POST", 500, processing_time)
         raise HTTPException(status_code=500, detail="Audio processing failed")
+    finally:
+        # nothing refers to the audio once it is transcribed
+        media_storage.discard(file_location)
 #this looks at physical attributes of person 
 @router.post("/upload-video/")
 async def upload_video(
@@ -154,165 +281,221 @@ async def upload_video(
     start_time = time.time()
     logger.info(f"Processing video upload: {file.filename} - Question: {question[:50]}...")
     
-    # import analysis functions for performance metrics calculation
-    from app.services.ai_analysis import generate_interview_tips, calculate_speech_rate, count_filler_words, calculate_overall_score
-    file_location = f"uploads/{file.filename}"
+    file_location = None
     
-    try:
-        #here you save uplaoded files to lcoal storage , then analyze eye contact using media pipe
-        # computer vision and I extract audio from video using ffmpeg and  do speech analysis and then calc
-         # the metrics, finally save to db 
-        with open(file_location, "wb") as f:
-            f.write(await file.read())
-        logger.info(f"Saved uploaded file to {file_location}")
+    # root span of the request trace, every pipeline stage below nests under it
+    with span("upload_video", question_type=question_type):
+        try:
+            #here you save uplaoded files to lcoal storage , then analyze eye contact using media pipe
+            # computer vision and I extract audio from video using ffmpeg and  do speech analysis and then calc
+             # the metrics, finally save to db 
+            with span("upload_write") as write_span:
+                upload = await media_storage.save_upload(file)
+                file_location = upload.path
+                write_span.set(bytes=upload.size)
+            logger.info(f"Saved uploaded file to {file_location} ({upload.size} bytes, sha256 {upload.sha256[:12]})")
 
-        logger.info("Starting eye contact analysis...")
-        eye_contact = analyze_eye_contact(file_location)
-        if not eye_contact or 'eye_contact_percentage' not in eye_contact:
-            logger.error("Eye contact analysis failed.")
-            processing_time = time.time() - start_time
-            metrics_service.record_analysis_failure("eye_contact_analysis", processing_time)
-            raise HTTPException(status_code=500, detail="Eye contact analysis failed.")
-        logger.info(f"Eye contact analysis completed: {eye_contact.get('eye_contact_percentage', 0)}%")
+            # vision and audio branches run concurrently inside the pipeline
+            analysis = await analyze_video(file_location, question, question_type, content_hash=upload.sha256)
 
-        audio_path = file_location + ".wav"
-        transcript = ""
-        sentiment = {}
-        duration_seconds = 0
+            logger.info("Saving interview to database...")
+            db_interview = build_interview(file_location, question, question_type, analysis)
+            with span("db_commit"):
+                db.add(db_interview)
+                await db.flush()
+                media_storage.track(db, db_interview.id, "video", file_location)
+                await db.commit()
+                await db.refresh(db_interview)
+            response_cache.invalidate(db_interview.id)
+            # saved with the interview now, nothing below may discard it
+            file_location = None
         
-        logger.info("Starting audio extraction...")
-        if extract_audio_from_video(file_location, audio_path):
-            # calculate audio duration for speech rate calculation
-            import wave
-            wf = wave.open(audio_path, "rb")
-            frames = wf.getnframes()
-            rate = wf.getframerate()
-            duration_seconds = frames / float(rate)
-            wf.close()
-            
-            # transcribe audio using vosk speech recognition
-            logger.info("Starting transcription...")
-            transcript = transcribe_audio(audio_path)
-            logger.info(f"Transcription completed: {len(transcript)} characters")
-            
-            # analyze sentiment using textblob nlp library
-            logger.info("Starting sentiment analysis...")
-            sentiment = analyze_sentiment(transcript)
-            logger.info(f"Sentiment analysis completed: {sentiment.get('sentiment', 'unknown')}")
-        else:
-            logger.error("Audio extraction failed (ffmpeg required)")
             processing_time = time.time() - start_time
-            metrics_service.record_analysis_failure("audio_extraction", processing_time)
-            raise HTTPException(status_code=500, detail="Audio extraction failed (ffmpeg required)")
+            logger.info(f"Interview analysis saved with ID {db_interview.id} (total time: {processing_time:.2f}s)")
         
-        # validate analysis results before continuing 
-        if not transcript:
-            logger.error("Transcription failed.")
+            # record successful analysis metrics for monitoring saves to metrics directory in backend
+            metrics_service.record_api_request("/api/v1/interviews/upload-video/", "POST", 200, processing_time)
+            metrics_service.record_analysis_success(
+                db_interview.id, 
+                processing_time,
+                analysis["eye_contact"].get("eye_contact_percentage", 0),
+                analysis["sentiment"].get("polarity", 0),
+                analysis["speech_rate"],
+                analysis["overall_score"]
+            )
+        
+            # return  analysis results to frontend
+            return build_response(db_interview.id, analysis)
+        except AnalysisError as e:
             processing_time = time.time() - start_time
-            metrics_service.record_analysis_failure("transcription", processing_time)
-            raise HTTPException(status_code=500, detail="Transcription failed.")
-        if not sentiment or 'polarity' not in sentiment:
-            logger.error("Sentiment analysis failed.")
+            metrics_service.record_analysis_failure(e.stage, processing_time)
+            metrics_service.record_api_request("/api/v1/interviews/upload-video/", "POST", 500, processing_time)
+            raise HTTPException(status_code=500, detail=e.detail)
+        except UploadRejected as e:
             processing_time = time.time() - start_time
-            metrics_service.record_analysis_failure("sentiment_analysis", processing_time)
-            raise HTTPException(status_code=500, detail="Sentiment analysis failed.")
-
-        logger.info("Calculating performance metrics...")
-        speech_rate = calculate_speech_rate(transcript, duration_seconds)
-        filler_word_count = count_filler_words(transcript)
-        overall_score = calculate_overall_score(
-            eye_contact.get("eye_contact_percentage", 0),
-            sentiment.get("polarity", 0),
-            speech_rate,
-            filler_word_count
-        )
-        # helper method to generate interview tips
-        ai_feedback = generate_interview_tips(eye_contact, sentiment, transcript, question_type, question)
-        
-        logger.info(f"Performance metrics calculated - Score: {overall_score}%, Speech Rate: {speech_rate:.1f} wpm, Fillers: {filler_word_count}")
+            logger.warning(f"Video upload rejected: {file.filename} - {e.detail}")
+            metrics_service.record_api_request("/api/v1/interviews/upload-video/", "POST", e.status_code, processing_time)
+            raise HTTPException(status_code=e.status_code, detail=e.detail)
+        except HTTPException:
+            raise
+        except Exception as e:
+            processing_time = time.time() - start_time
+            logger.error(f"Error in upload-video analysis: {e} (took {processing_time:.2f}s)")
+            metrics_service.record_analysis_failure("general_error", processing_time)
+            metrics_service.record_api_request("/api/v1/interviews/upload-video/", "POST", 500, processing_time)
+            raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+        finally:
+            # the upload of a failed analysis belongs to no interview
+            media_storage.discard(file_location)
 
-        logger.info("Saving interview to database...")
-        db_interview = Interview(
-            title=question[:100] if question else "Interview",
-            interview_type=question_type or "general",
-            status="completed",
-            video_file_path=file_location,
-            audio_file_path=audio_path,
-            duration_seconds=int(duration_seconds),
-            transcript=transcript,
-            sentiment_score=sentiment.get("polarity", 0),
-            confidence_score=sentiment.get("subjectivity", 0),
-            eye_contact_score=eye_contact.get("eye_contact_percentage", 0),
-            speech_rate=speech_rate,
-            filler_word_count=filler_word_count,
-            ai_feedback=json.dumps(ai_feedback),
-            improvement_suggestions="", # empty for now
-            overall_score=overall_score,
-            completed_at=datetime.utcnow()
+# a mock interview session in one request - every answer is analyzed concurrently (at most
+# batch_max_concurrency at a time) and all interviews are saved in a single transaction,
+# one failed answer does not fail the others
+@router.post("/upload-batch/")
+async def upload_batch(
+    files: List[UploadFile] = File(...),
+    questions: List[str] = File(...),
+    question_types: List[str] = File(...),
+    db: AsyncSession = Depends(get_db)
+):
+    start_time = time.time()
+    if not (len(files) == len(questions) == len(question_types)):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Each file needs exactly one question and question_type"
         )
-        db.add(db_interview)
-        await db.commit()
-        await db.refresh(db_interview)
-        
-        processing_time = time.time() - start_time
-        logger.info(f"Interview analysis saved with ID {db_interview.id} (total time: {processing_time:.2f}s)")
-        
-        # record successful analysis metrics for monitoring saves to metrics directory in backend
-        metrics_service.record_analysis_success(
-            db_interview.id, 
-            processing_time,
-            eye_contact.get("eye_contact_percentage", 0),
-            sentiment.get("polarity", 0),
-            speech_rate,
-            overall_score
+    if len(files) > settings.batch_max_items:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.batch_max_items} files per batch"
         )
-        
-        # return  analysis results to frontend
-        return {
-            "id": db_interview.id,
-            "eye_contact": eye_contact,
-            "transcript": transcript,
-            "sentiment": sentiment,
-            "speech_rate": speech_rate,
-            "filler_word_count": filler_word_count,
-            "overall_score": overall_score,
-            "ai_feedback": ai_feedback
-        }
-    except Exception as e:
-        processing_time = time.time() - start_time
-        logger.error(f"Error in upload-video analysis: {e} (took {processing_time:.2f}s)")
-        metrics_service.record_analysis_failure("general_error", processing_time)
-        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+    logger.info(f"Processing batch upload of {len(files)} videos")
+    semaphore = asyncio.Semaphore(settings.batch_max_concurrency)
+
+    async def analyze_item(index: int):
+        file = files[index]
+        file_location = None
+        async with semaphore:
+            item_start = time.time()
+            try:
+                with span("batch_item", index=index):
+                    # answers recorded in the browser often share a filename, every upload gets its own key
+                    upload = await media_storage.save_upload(file)
+                    file_location = upload.path
+                    analysis = await analyze_video(
+                        file_location, questions[index], question_types[index], content_hash=upload.sha256
+                    )
+                return {"index": index, "file_location": file_location, "analysis": analysis,
+                        "processing_time": time.time() - item_start}
+            except AnalysisError as e:
+                metrics_service.record_analysis_failure(e.stage, time.time() - item_start)
+                media_storage.discard(file_location)
+                return {"index": index, "status_code": 500, "error": e.detail}
+            except UploadRejected as e:
+                return {"index": index, "status_code": e.status_code, "error": e.detail}
+            except Exception as e:
+                logger.error(f"Batch item {index} ({file.filename}) failed: {e}")
+                metrics_service.record_analysis_failure("general_error", time.time() - item_start)
+                media_storage.discard(file_location)
+                return {"index": index, "status_code": 500, "error": f"Analysis failed: {str(e)}"}
+
+    with span("upload_batch", items=len(files)):
+        outcomes = await asyncio.gather(*[analyze_item(index) for index in range(len(files))])
+        analyzed = [outcome for outcome in outcomes if "analysis" in outcome]
+
+        # every successful answer is saved in one transaction
+        interviews = []
+        interview_ids = []
+        try:
+            with span("db_commit", rows=len(analyzed)):
+                for outcome in analyzed:
+                    index = outcome["index"]
+                    interviews.append(build_interview(
+                        outcome["file_location"], questions[index], question_types[index], outcome["analysis"]
+                    ))
+                db.add_all(interviews)
+                # ids are assigned on flush, read them before commit expires the rows
+                await db.flush()
+                interview_ids = [interview.id for interview in interviews]
+                for outcome, interview_id in zip(analyzed, interview_ids):
+                    media_storage.track(db, interview_id, "video", outcome["file_location"])
+                await db.commit()
+        except Exception as e:
+            processing_time = time.time() - start_time
+            logger.error(f"Failed to save batch interviews: {e} (took {processing_time:.2f}s)")
+            for outcome in analyzed:
+                media_storage.discard(outcome["file_location"])
+            metrics_service.record_api_request("/api/v1/interviews/upload-batch/", "POST", 500, processing_time)
+            raise HTTPException(status_code=500, detail="Failed to save interviews")
+
+    results = []
+    saved = {outcome["index"]: (outcome, interview_id) for outcome, interview_id in zip(analyzed, interview_ids)}
+    for outcome in outcomes:
+        index = outcome["index"]
+        item = {"index": index, "filename": files[index].filename}
+        if index in saved:
+            outcome, interview_id = saved[index]
+            analysis = outcome["analysis"]
+            response_cache.invalidate(interview_id)
+            metrics_service.record_analysis_success(
+                interview_id,
+                outcome["processing_time"],
+                analysis["eye_contact"].get("eye_contact_percentage", 0),
+                analysis["sentiment"].get("polarity", 0),
+                analysis["speech_rate"],
+                analysis["overall_score"]
+            )
+            item.update(status="completed", result=build_response(interview_id, analysis))
+        else:
+            item.update(status="failed", status_code=outcome["status_code"], error=outcome["error"])
+        results.append(item)
+
+    processing_time = time.time() - start_time
+    logger.info(f"Batch upload finished: {len(analyzed)}/{len(files)} analyzed (took {processing_time:.2f}s)")
+    metrics_service.record_api_request("/api/v1/interviews/upload-batch/", "POST", 200, processing_time)
+    return {
+        "completed": len(analyzed),
+        "failed": len(files) - len(analyzed),
+        "processing_time": round(processing_time, 2),
+        "results": results,
+    }
 
 @router.get("/{interview_id}/analysis", response_model=InterviewAnalysis)
 async def get_interview_analysis(
     interview_id: int,
+    if_none_match: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db)
 ):
     try:
-        # get interview and check if analysis exists
-        result = await db.execute(select(Interview).where(Interview.id == interview_id))
-        interview = result.scalar_one_or_none()
-        if not interview:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Interview not found"
-            )
-        if not interview.analysis:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Analysis not available"
+        cached = response_cache.get("analysis", interview_id)
+        if cached is None:
+            # get interview and check if analysis exists
+            result = await db.execute(
+                select(Interview).options(load_only(Interview.id, Interview.analysis)).where(Interview.id == interview_id)
             )
-            
-        # parse and return analysis data from json string
-        analysis_data = json.loads(interview.analysis)
-        return InterviewAnalysis(
-            interview_id=interview_id,
-            feedback=analysis_data.get('feedback', {}),
-            skill_gaps=analysis_data.get('skill_gaps', {}),
-            sentiment=analysis_data.get('sentiment', {}),
-            eye_contact=analysis_data.get('eye_contact', {})
-        )
+            interview = result.scalar_one_or_none()
+            if not interview:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Interview not found"
+                )
+            if not interview.analysis:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Analysis not available"
+                )
+                
+            # parse analysis data from json string, the serialized response is cached
+            analysis_data = json.loads(interview.analysis)
+            payload = InterviewAnalysis(
+                interview_id=interview_id,
+                feedback=analysis_data.get('feedback', {}),
+                skill_gaps=analysis_data.get('skill_gaps', {}),
+                sentiment=analysis_data.get('sentiment', {}),
+                eye_contact=analysis_data.get('eye_contact', {})
+            ).model_dump(mode="json")
+            cached = response_cache.put("analysis", interview_id, payload)
+        return cached_json_response(*cached, if_none_match)
     except HTTPException:
         raise
     except Exception as e:
@@ -335,15 +518,14 @@ async def delete_interview(
                 detail="Interview not found"
             )
             
-        # delete associated files from filesystem
-        if interview.audio_file and os.path.exists(interview.audio_file):
-            os.remove(interview.audio_file)
-        if interview.video_file and os.path.exists(interview.video_file):
-            os.remove(interview.video_file)
-            
-        # delete interview record from database
+        # artifact rows and the interview record go in one transaction
+        media_paths = await media_storage.delete_interview_media(db, interview)
         await db.delete(interview)
         await db.commit()
+        response_cache.invalidate(interview_id)
+
+        # the recording and every tracked artifact leave the disk only once the rows are gone
+        await media_storage.discard_all(media_paths)
         
         logger.info(f"Interview {interview_id} deleted successfully")
         return {"success": True, "message": "Interview deleted successfully"}
@@ -353,34 +535,18 @@ async def delete_interview(
         logger.error(f"Error deleting interview {interview_id}: {e}")
         raise HTTPException(status_code=500, detail="Failed to delete interview")
 
-@router.get("/metrics")
-async def get_metrics():
-    logger.info("Metrics endpoint accessed")
-    try:
-        #helper method to get metrics 
-        metrics_summary = metrics_service.get_summary()
-        logger.info("Metrics retrieved successfully")
-        return {
-            "status": "success",
-            "data": metrics_summary,
-            "timestamp": datetime.now().isoformat()
-        }
-    except Exception as e:
-        logger.error(f"Error retrieving metrics: {e}")
-        raise HTTPException(status_code=500, detail="Failed to retrieve metrics")
-
 @router.get("/health/ai")
-async def check_ai_health():
+async def check_ai_health(request: Request):
     # check health status of all ai services and dependencies
     logger.info("AI health check endpoint accessed")
     try:
-        vosk_model_path = "vosk-model-small-en-us-0.15/vosk-model-small-en-us-0.15"
+        vosk_model_path = settings.vosk_model_path
         vosk_available = os.path.exists(vosk_model_path)
         
-        # check if ffmpeg is available in system path
+        # check if ffmpeg is available in system path, in a thread so the loop keeps serving
         import subprocess
         try:
-            subprocess.run(["ffmpeg", "-version"], capture_output=True, check=True)
+            await asyncio.to_thread(subprocess.run, ["ffmpeg", "-version"], capture_output=True, check=True)
             ffmpeg_available = True
         except (subprocess.CalledProcessError, FileNotFoundError):
             ffmpeg_available = False
@@ -397,7 +563,13 @@ async def check_ai_health():
                     "status": "available" if ffmpeg_available else "unavailable"
                 },
                 "mediapipe_eye_contact": "available",
-                "textblob_sentiment": "available"
+                "lexicon_sentiment": "available"
+            },
+            # lazy model loading - load times and readiness in this process and in the analysis pool
+            "models": model_registry.status(),
+            "analysis_workers": analysis_executor.worker_status,
+            "startup": {
+                "import_seconds": round(getattr(request.app.state, "import_seconds", 0.0), 3)
             },
             "timestamp": datetime.now().isoformat()
         }
@@ -0,0 +1,101 @@
+#  API endpoints for asynchronous analysis jobs
+# uploads return 202 with a job id straight away, progress is polled or streamed over sse
+from fastapi import APIRouter, HTTPException, status, UploadFile, File
+from fastapi.responses import JSONResponse, StreamingResponse
+import asyncio
+import json
+import logging
+import time
+
+from app.core.config import settings
+from app.services.jobs import job_manager, TERMINAL_STATUSES
+from app.services.metrics import metrics_service
+from app.services.storage import media_storage
+from app.services.uploads import UploadRejected
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+def _public_job(job):
+    # the payload holds server side paths, keep it out of responses
+    return {key: value for key, value in job.items() if key != "payload"}
+
+
+@router.post("/upload-video", status_code=status.HTTP_202_ACCEPTED)
+async def queue_video_analysis(
+    file: UploadFile = File(...),
+    question: str = File(...),
+    question_type: str = File(...)
+):
+    # save the upload and queue it for analysis, the connection is released immediately
+    start_time = time.time()
+    logger.info(f"Queueing video upload: {file.filename} - Question: {question[:50]}...")
+    upload = None
+    try:
+        upload = await media_storage.save_upload(file)
+        job = await job_manager.queue.enqueue({
+            "video_path": upload.path,
+            "sha256": upload.sha256,
+            "question": question,
+            "question_type": question_type,
+        })
+    except UploadRejected as e:
+        logger.warning(f"Video upload rejected: {file.filename} - {e.detail}")
+        metrics_service.record_api_request("/api/v1/jobs/upload-video", "POST", e.status_code, time.time() - start_time)
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    except Exception as e:
+        logger.error(f"Failed to queue video analysis: {e}")
+        media_storage.discard(upload.path if upload else None)
+        metrics_service.record_api_request("/api/v1/jobs/upload-video", "POST", 500, time.time() - start_time)
+        raise HTTPException(status_code=500, detail="Failed to queue analysis")
+
+    processing_time = time.time() - start_time
+    logger.info(f"Queued analysis job {job['id']} (took {processing_time:.2f}s)")
+    metrics_service.record_api_request("/api/v1/jobs/upload-video", "POST", 202, processing_time)
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content={
+            "job_id": job["id"],
+            "status": job["status"],
+            "status_url": f"/api/v1/jobs/{job['id']}",
+            "events_url": f"/api/v1/jobs/{job['id']}/events",
+        },
+        headers={"Location": f"/api/v1/jobs/{job['id']}"},
+    )
+
+
+@router.get("/{job_id}")
+async def get_job(job_id: str):
+    # current status, stage progress and (once completed) the analysis result
+    job = await job_manager.queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return _public_job(job)
+
+
+@router.get("/{job_id}/events")
+async def stream_job_events(job_id: str):
+    # server-sent events with the job state every time it changes, closes once the job finishes
+    if not await job_manager.queue.get(job_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+
+    async def events():
+        last_update = None
+        while True:
+            job = await job_manager.queue.get(job_id)
+            if job is None:
+                yield "event: error\ndata: {\"detail\": \"Job expired\"}\n\n"
+                return
+            if job["updated_at"] != last_update:
+                last_update = job["updated_at"]
+                yield f"event: {job['status']}\ndata: {json.dumps(_public_job(job))}\n\n"
+            if job["status"] in TERMINAL_STATUSES:
+                return
+            await asyncio.sleep(settings.job_poll_interval)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
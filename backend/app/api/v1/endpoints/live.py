@@ -0,0 +1,154 @@
+#  websocket endpoint for live interviews - the answer is analyzed while it is recorded
+#
+#   ws /api/v1/live/interview?question=...&question_type=...&sample_rate=16000
+#   client -> server: binary b"A" + 16 bit mono pcm chunk, binary b"V" + jpeg/png video frame,
+#                     text {"type": "stop"} once the answer is over (closing the socket works too)
+#   server -> client: json messages - ready, partial / final transcript, eye_contact, result, error
+#
+# the interview row is built from the state accumulated during the stream, so the result is
+# available right after the answer ends instead of after a full upload + analysis
+from fastapi import APIRouter, Query, WebSocket, WebSocketDisconnect
+import asyncio
+import json
+import logging
+import time
+from typing import Optional
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.services.ai_analysis import AUDIO_SAMPLE_RATE
+from app.services.live_session import LiveSession
+from app.services.metrics import metrics_service
+from app.services.pipeline import AnalysisError, build_interview, build_response, score_analysis
+from app.services.response_cache import response_cache
+from app.services.tracing import span
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+# sessions currently streaming, each holds a recognizer and a face mesh
+active_sessions = 0
+
+
+async def finalize_live_session(session: LiveSession) -> dict:
+    # flush the recognizer, score and save - everything expensive already happened during the stream
+    start_time = time.time()
+    with span("live_finalize", audio_seconds=round(session.audio_seconds, 2), frames=session.sampled_frames):
+        state = await asyncio.to_thread(session.finish)
+        if not state["transcript"]:
+            raise AnalysisError("transcription", "No speech was recognized in the live session.")
+        analysis = score_analysis(
+            state["eye_contact"], state["transcript"], state["word_track"], state["sentiment"],
+            state["duration_seconds"], session.question, session.question_type
+        )
+        async with SessionLocal() as db:
+            with span("db_commit"):
+                db_interview = build_interview(None, session.question, session.question_type, analysis)
+                db.add(db_interview)
+                await db.commit()
+                await db.refresh(db_interview)
+    response_cache.invalidate(db_interview.id)
+    metrics_service.record_analysis_success(
+        db_interview.id,
+        time.time() - start_time,
+        analysis["eye_contact"].get("eye_contact_percentage", 0),
+        analysis["sentiment"].get("polarity", 0),
+        analysis["speech_rate"],
+        analysis["overall_score"]
+    )
+    logger.info(f"Live session saved as interview {db_interview.id} ({time.time() - start_time:.2f}s after the stream ended)")
+    return build_response(db_interview.id, analysis)
+
+
+async def _handle_binary(session: LiveSession, data: bytes) -> Optional[dict]:
+    # one tagged binary message -> the event to send back, bad input answers with an error event
+    kind, payload = data[:1], data[1:]
+    if kind not in (b"A", b"V"):
+        return {"type": "error", "detail": "Binary messages must start with b'A' (audio) or b'V' (video)"}
+    if not payload:
+        return {"type": "error", "detail": "Empty audio or video payload"}
+    try:
+        if kind == b"A":
+            return await asyncio.to_thread(session.accept_audio, payload)
+        return await asyncio.to_thread(session.accept_frame, payload)
+    except Exception as e:
+        logger.error(f"Live session could not process a {'audio' if kind == b'A' else 'video'} message: {e}")
+        return {"type": "error", "detail": "Could not process the message"}
+
+
+@router.websocket("/interview")
+async def live_interview(
+    websocket: WebSocket,
+    question: str = "",
+    question_type: str = "general",
+    sample_rate: int = Query(AUDIO_SAMPLE_RATE, ge=8000, le=48000)
+):
+    global active_sessions
+    if active_sessions >= settings.live_max_sessions:
+        # 1013 = try again later
+        await websocket.close(code=1013)
+        return
+    # taken before the first await so concurrent connects can't all pass the check above
+    active_sessions += 1
+    session = None
+    connected = False
+    try:
+        await websocket.accept()
+        connected = True
+        session = LiveSession(question, question_type, sample_rate)
+        logger.info(f"Live session started - Question: {question[:50]}...")
+        await websocket.send_json({"type": "ready", "sample_rate": sample_rate, "max_seconds": settings.live_max_seconds})
+        # a client that goes away mid answer still gets its interview saved
+        try:
+            while True:
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    connected = False
+                    break
+                if message.get("bytes") is not None:
+                    event = await _handle_binary(session, message["bytes"])
+                    if event:
+                        await websocket.send_json(event)
+                    if session.audio_seconds >= settings.live_max_seconds:
+                        logger.info("Live session reached its maximum length, finishing")
+                        break
+                elif message.get("text"):
+                    try:
+                        control = json.loads(message["text"])
+                    except ValueError:
+                        control = {}
+                    if isinstance(control, dict) and control.get("type") == "stop":
+                        break
+        except WebSocketDisconnect:
+            connected = False
+
+        try:
+            result = await finalize_live_session(session)
+            if connected:
+                await websocket.send_json({"type": "result", "data": result})
+        except AnalysisError as e:
+            metrics_service.record_analysis_failure(e.stage, time.time() - session.started)
+            if connected:
+                await websocket.send_json({"type": "error", "detail": e.detail})
+        except WebSocketDisconnect:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to finalize live session: {e}")
+            metrics_service.record_analysis_failure("general_error", time.time() - session.started)
+            if connected:
+                await websocket.send_json({"type": "error", "detail": f"Analysis failed: {str(e)}"})
+        if connected:
+            await websocket.close()
+    except WebSocketDisconnect:
+        logger.info("Live session client disconnected")
+    except Exception as e:
+        logger.error(f"Live session failed: {e}")
+        if connected:
+            try:
+                await websocket.close(code=1011)
+            except Exception:
+                pass
+    finally:
+        active_sessions -= 1
+        if session is not None:
+            session.close()
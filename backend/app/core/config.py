@@ -10,16 +10,68 @@ class Settings(BaseSettings):
     environment: str = "development"
     # usig sql lite for local development
     database_url: str = "sqlite:///./interview_ai.db"
+    sql_echo: bool = False  # log every sql statement, separate from debug
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_recycle_seconds: int = 3600
+    # wal journal, synchronous=normal, busy timeout, mmap and page cache pragmas on every connection
+    sqlite_performance_mode: bool = True
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_cache_size_kb: int = 64 * 1024  # 64MB page cache per connection
+    sqlite_mmap_size: int = 256 * 1024 * 1024  # 256MB memory mapped reads
     redis_url: str = "redis://localhost:6379"
     
     # file upload  for video/audio files
     upload_folder: str = "./uploads"
     max_file_size: int = 100 * 1024 * 1024  # 100MB
-    allowed_extensions: list = [".mp4", ".wav", ".mp3", ".jpg", ".png"]
+    allowed_extensions: list = [".mp4", ".webm", ".wav", ".mp3", ".jpg", ".png"]
+    upload_chunk_size: int = 1024 * 1024  # 1MB chunks when streaming uploads to disk
+    upload_multipart_slack: int = 64 * 1024  # multipart boundaries, part headers and form fields on top of the files
+    # media storage garbage collection - total size of the upload folder and how long media is kept
+    storage_quota_bytes: int = 20 * 1024 * 1024 * 1024  # 20GB
+    storage_max_age_days: float = 30.0  # 0 keeps media until the quota forces it out
+    storage_gc_interval_seconds: float = 3600.0
+    storage_gc_grace_seconds: float = 3600.0  # newer files are never collected, they may still be analyzed
+    # POST /interviews/upload-batch/ - answers analyzed at the same time and answers per request
+    batch_max_concurrency: int = 4
+    batch_max_items: int = 20
     
     # ai  - all features use local processing (no api keys needed)
     use_local_ai: bool = True
-    mock_ai_responses: bool = True
+    # deterministic stub analyzers instead of the models and ffmpeg (load tests of the api layer),
+    # each stub call costs mock_ai_cost_ms of sleep or, with mock_ai_cost_mode "cpu", of busy spinning
+    mock_ai_responses: bool = False
+    mock_ai_cost_ms: float = 50.0
+    mock_ai_cost_mode: str = "sleep"
+    vosk_model_path: str = "vosk-model-small-en-us-0.15/vosk-model-small-en-us-0.15"
+    # load models in the background at startup instead of on the first request
+    ai_warmup_on_startup: bool = True
+    # process pool for cpu bound analysis (0 = run in a thread pool inside the api process)
+    analysis_workers: int = 2
+    analysis_start_method: str = "spawn"
+    # long audio is cut into overlapping windows transcribed in parallel by the analysis pool
+    transcription_parallel: bool = True
+    transcription_parallel_min_seconds: float = 60.0  # shorter audio is streamed through one recognizer
+    transcription_window_seconds: float = 30.0
+    transcription_overlap_seconds: float = 2.0
+    # eye contact analysis mode: "full" runs face mesh on every frame at full resolution,
+    # "sampled" analyzes eye_contact_sample_fps frames per second, downscales wide frames
+    # and crops to the tracked face box after the first detection
+    eye_contact_mode: str = "full"
+    eye_contact_sample_fps: float = 5.0
+    eye_contact_max_width: int = 640  # 0 = keep original resolution
+    eye_contact_roi_margin: float = 0.25  # padding around the tracked face box
+    # sentiment timeline resolution (seconds of speech per polarity point)
+    sentiment_segment_seconds: float = 10.0
+    # speech analytics from word timestamps - pace curve windows and what counts as a pause
+    pace_window_seconds: float = 10.0
+    pace_step_seconds: float = 5.0
+    pause_min_seconds: float = 0.5
+    long_pause_seconds: float = 2.0
+    # long videos are split into time ranges analyzed in parallel by the analysis pool
+    eye_contact_segmented: bool = True
+    eye_contact_segment_min_seconds: float = 30.0  # shortest segment worth its own worker
+    eye_contact_segment_warmup_seconds: float = 1.0  # frames fed to face mesh before each segment
     
     frontend_url: str = "http://localhost:3000"
     api_url: str = "http://localhost:8000"
@@ -32,6 +84,32 @@ class Settings(BaseSettings):
         "http://127.0.0.1:8000"
     ]
     
+    # GET /interviews page size (newest first, the next page is fetched with the X-Next-Cursor header)
+    interviews_page_size: int = 50
+    interviews_max_page_size: int = 200
+    
+    # cached GET /interviews/{id} and /{id}/analysis responses with etags, dropped on writes
+    response_cache_enabled: bool = True
+    response_cache_entries: int = 512
+    response_cache_ttl_seconds: float = 30.0
+    
+    # live interview websocket - concurrent sessions and the longest answer accepted
+    live_max_sessions: int = 4
+    live_max_seconds: float = 600.0
+    
+    # content addressed cache of analysis results for duplicate uploads
+    result_cache_enabled: bool = True
+    result_cache_dir: str = "./cache/results"
+    result_cache_memory_entries: int = 128
+    result_cache_max_bytes: int = 256 * 1024 * 1024  # 256MB on disk
+    result_cache_max_age_seconds: int = 7 * 24 * 60 * 60  # one week
+    
+    # asynchronous analysis jobs - "memory" keeps the queue in process, "redis" uses redis_url
+    job_backend: str = "memory"
+    job_workers: int = 2
+    job_ttl_seconds: int = 24 * 60 * 60
+    job_poll_interval: float = 0.5  # seconds between sse checks for job updates
+    
     # logging configuration for application logs
     log_level: str = "INFO"
     log_file: str = "./logs/app.log"
@@ -41,6 +119,14 @@ class Settings(BaseSettings):
     # monitoring configuration for metrics collection
     enable_metrics: bool = True
     metrics_path: str = "./metrics"
+    metrics_flush_interval: float = 5.0  # seconds between background flushes of app_metrics.json
+    metrics_flush_events: int = 50  # flush early once this many events are buffered
+    # event loop lag sampling - stalls longer than the threshold are reported with the blocking stack
+    loop_monitor_enabled: bool = True
+    loop_monitor_interval: float = 0.1  # seconds between lag samples
+    loop_monitor_threshold: float = 0.25
+    loop_monitor_max_stalls: int = 20  # recent stalls kept for /metrics
+    loop_monitor_stack_depth: int = 15
     class Config:
         env_file = ".env"
         case_sensitive = False
@@ -48,5 +134,5 @@ class Settings(BaseSettings):
 settings = Settings()
 # ensure required directories exist for file uploads and logs
 os.makedirs(settings.upload_folder, exist_ok=True)
-os.makedirs("./logs", exist_ok=True)
+os.makedirs(os.path.dirname(settings.log_file) or ".", exist_ok=True)
 os.makedirs(settings.metrics_path, exist_ok=True) 
\ No newline at end of file
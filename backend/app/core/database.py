@@ -1,19 +1,57 @@
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.core.config import settings
 
 # convert sqlite url to async format for aiosqlite
 # since fastapi uses asyncio, we need to use aiosqlite ( asych wrapper around sqlite)instead of sqlite3
 SQLALCHEMY_DATABASE_URL = settings.database_url.replace("sqlite:///", "sqlite+aiosqlite:///")
+IS_SQLITE = "sqlite" in SQLALCHEMY_DATABASE_URL
+# aiosqlite defaults to opening a new connection per session, keep a pool of them instead
+# so connections (and their pragmas) are reused - in-memory databases keep the default pool
+POOL_OPTIONS = {
+    "pool_size": settings.db_pool_size,
+    "max_overflow": settings.db_max_overflow,
+    "pool_recycle": settings.db_pool_recycle_seconds,
+}
+if IS_SQLITE and ":memory:" in SQLALCHEMY_DATABASE_URL:
+    POOL_OPTIONS = {}
+elif IS_SQLITE:
+    POOL_OPTIONS["poolclass"] = AsyncAdaptedQueuePool
 # create async database engine for sqlite
 engine = create_async_engine(
     SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in SQLALCHEMY_DATABASE_URL else {},
-    echo=settings.debug
+    connect_args={"check_same_thread": False} if IS_SQLITE else {},
+    echo=settings.sql_echo,
+    **POOL_OPTIONS
 )
+
+# sqlite performance profile, applied to every new pooled connection:
+# wal lets list reads run while an upload commits, synchronous=normal is safe with wal and
+# skips an fsync per commit, busy_timeout waits for the write lock instead of failing at once
+if IS_SQLITE and settings.sqlite_performance_mode:
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}")
+        cursor.execute(f"PRAGMA cache_size=-{int(settings.sqlite_cache_size_kb)}")  # negative = KiB
+        cursor.execute(f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, class_=AsyncSession)
 Base = declarative_base()
+
+def create_missing_indexes(connection):
+    # indexes added to models after their table was created on an existing database
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+
 # dependency function to get database session
 async def get_db():
     async with SessionLocal() as session:
@@ -1,3 +1,6 @@
+import time
+_import_started = time.perf_counter()
+
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
@@ -5,24 +8,32 @@ import uvicorn
 from contextlib import asynccontextmanager
 import logging
 import os
+import asyncio
 from datetime import datetime
 
 # import application configuration and components
 from app.core.config import settings
-from app.core.database import engine, Base
+from app.core.database import engine, Base, create_missing_indexes
 from app.api.v1.api import api_router
+from app.services.analysis_executor import analysis_executor
+from app.services.model_registry import model_registry
+from app.services.jobs import job_manager
+from app.services.loop_monitor import loop_monitor
+from app.services.metrics import metrics_service
+from app.services.storage import media_storage
+from app.services.uploads import UploadLimitMiddleware
 
 # configure logging for the application
 def setup_logging():
     # create logs directory if it doesn't exist
-    os.makedirs("logs", exist_ok=True)
+    os.makedirs(os.path.dirname(settings.log_file) or ".", exist_ok=True)
     
     # configure logging format with timestamp, module, level, and message
     log_format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     date_format = "%Y-%m-%d %H:%M:%S"
     
     # configure file handler for  logging
-    file_handler = logging.FileHandler("logs/app.log")
+    file_handler = logging.FileHandler(settings.log_file)
     file_handler.setLevel(logging.INFO)
     file_formatter = logging.Formatter(log_format, date_format)
     file_handler.setFormatter(file_formatter)
@@ -54,11 +65,39 @@ async def lifespan(app: FastAPI):
     try:
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
+            # create_all skips indexes of tables that already exist
+            await conn.run_sync(create_missing_indexes)
         logger.info(" Database tables created successfully")
     except Exception as e:
         logger.error(f" Failed to create database tables: {e}")
         raise
     
+    # start the process pool used for video/audio analysis
+    analysis_executor.start()
+    
+    # background flushing of the metrics file
+    metrics_service.start()
+    
+    # event loop lag sampling, blocking calls in handlers show up in /metrics
+    if settings.loop_monitor_enabled:
+        loop_monitor.start()
+    
+    # queue and workers for asynchronous analysis jobs
+    await job_manager.start()
+    
+    # periodic retention / quota garbage collection of the upload folder
+    media_storage.start()
+    
+    # load ai models in the background, requests are served while this runs
+    warmup_task = None
+    if settings.mock_ai_responses:
+        logger.warning(" Mock AI responses enabled - uploads get stub analysis results")
+    if settings.ai_warmup_on_startup:
+        if analysis_executor.max_workers == 0 and not settings.mock_ai_responses:
+            # thread mode - analysis runs in this process so its registry needs the models
+            model_registry.start_background_warm_up()
+        warmup_task = asyncio.create_task(analysis_executor.warm_up())
+    
     # log startup metrics and completion
     startup_time = datetime.now()
     logger.info(f" Application startup completed at {startup_time}")
@@ -67,6 +106,16 @@ async def lifespan(app: FastAPI):
     
     # shutdown phase - cleanup resources
     logger.info(" Shutting down Backend...")
+    if warmup_task is not None and not warmup_task.done():
+        warmup_task.cancel()
+    await job_manager.stop()
+    await loop_monitor.stop()
+    await media_storage.stop()
+    # write any buffered metrics before exiting
+    metrics_service.stop()
+    analysis_executor.shutdown()
+    # close pooled database connections, aiosqlite keeps a thread per open connection
+    await engine.dispose()
 
 # create fastapi application instance with metadata and lifespan
 app = FastAPI(
@@ -78,6 +127,17 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# body size limit on the upload endpoints, enforced before the multipart form is spooled and parsed
+# (added before cors so its 413 still carries the cors headers)
+app.add_middleware(
+    UploadLimitMiddleware,
+    routes={
+        "/api/v1/interviews/upload-audio/": 1,
+        "/api/v1/interviews/upload-video/": 1,
+        "/api/v1/jobs/upload-video": 1,
+        "/api/v1/interviews/upload-batch/": settings.batch_max_items,
+    },
+)
 # cors middleware configuration for frontend communication
 #necessary so that my frontend on 3000 can make requests to fast api backend on 8000
 app.add_middleware(
@@ -86,9 +146,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"], 
     allow_headers=["*"],  
+    expose_headers=["X-Next-Cursor", "Location"],  # pagination cursor and job status urls
 )
 app.include_router(api_router, prefix="/api/v1")
 
+# cold start cost of importing the app (reported on /api/v1/interviews/health/ai)
+app.state.import_seconds = time.perf_counter() - _import_started
+logger.info(f" Application imported in {app.state.import_seconds:.2f}s")
+
 @app.get("/")
 async def root():
     logger.info(" Root endpoint accessed")
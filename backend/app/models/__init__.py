@@ -0,0 +1,4 @@
+from .interview import Interview
+from .media_artifact import MediaArtifact
+
+__all__ = ["Interview", "MediaArtifact"]
@@ -0,0 +1,40 @@
+# database model for interviews, one row per recorded answer
+from sqlalchemy import Column, DateTime, Float, Index, Integer, String, Text
+from datetime import datetime
+
+from app.core.database import Base
+
+
+class Interview(Base):
+    __tablename__ = "interviews"
+    __table_args__ = (
+        # backs the newest-first keyset pagination of GET /interviews
+        Index("ix_interviews_created_at_id", "created_at", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    title = Column(String(255), nullable=False)
+    interview_type = Column(String(50), index=True)  # technical, behavioral, general ...
+    status = Column(String(50), default="created", index=True)  # created, completed
+
+    # uploaded media on disk
+    video_file_path = Column(String(500))
+    audio_file_path = Column(String(500))
+    duration_seconds = Column(Integer)
+
+    # analysis results - transcript and feedback can be large, list views defer them
+    transcript = Column(Text)
+    sentiment_score = Column(Float)
+    confidence_score = Column(Float)
+    eye_contact_score = Column(Float)
+    speech_rate = Column(Float)
+    filler_word_count = Column(Integer)
+    ai_feedback = Column(Text)  # json string
+    improvement_suggestions = Column(Text)
+    overall_score = Column(Float)
+    analysis = Column(Text)  # json string with feedback, skill gaps, sentiment and eye contact
+
+    completed_at = Column(DateTime)
+    # indexed through ix_interviews_created_at_id (created_at is its leading column)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
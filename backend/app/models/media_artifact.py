@@ -0,0 +1,16 @@
+# files kept on disk for an interview - the uploaded recording and anything derived from it
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Integer, String
+from datetime import datetime
+
+from app.core.database import Base
+
+
+class MediaArtifact(Base):
+    __tablename__ = "media_artifacts"
+
+    id = Column(Integer, primary_key=True, index=True)
+    interview_id = Column(Integer, ForeignKey("interviews.id", ondelete="CASCADE"), nullable=False, index=True)
+    kind = Column(String(50), nullable=False)  # video, audio ...
+    path = Column(String(500), nullable=False, index=True)  # storage path under the upload folder
+    size_bytes = Column(BigInteger, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -18,8 +18,8 @@ class InterviewUpdate(InterviewBase):
 
 class Interview(InterviewBase):
     id: int  # unique database identifier
-    created_at: Optional[str] = None  # timestamp when interview was created
-    updated_at: Optional[str] = None  # timestamp when interview was last updated
+    created_at: Optional[datetime] = None  # timestamp when interview was created
+    updated_at: Optional[datetime] = None  # timestamp when interview was last updated
     
     class Config:
         from_attributes = True  # enables orm compatibility for sqlalchemy models
@@ -1,164 +1,458 @@
 # ai analysis service using local models for speech-to-text, sentiment, and eye contact analysis
 import json
 import random
+import numpy as np
 from typing import Dict, List, Optional
 import logging
-from vosk import Model, KaldiRecognizer
 import wave
-from textblob import TextBlob
-import cv2
-import mediapipe as mp
 import subprocess
-import os
-import re
+
+from app.core.config import settings
+# vosk, the sentiment lexicon, opencv and mediapipe are loaded on first use through the registry
+from app.services.model_registry import model_registry
+from app.services.text_analytics import STAR_KEYWORDS, TextAnalysis, analyze_text
+from app.services.tracing import span
+from app.services.word_track import WordTrack
 
 logger = logging.getLogger(__name__)
 
-vosk_model_path = "vosk-model-small-en-us-0.15/vosk-model-small-en-us-0.15"
-vosk_model = Model(vosk_model_path)
+# bump an analyzer's version whenever its output changes so cached results are not reused
+ANALYZER_VERSIONS = {"eye_contact": 4, "transcription": 5, "sentiment": 3, "scoring": 2}
 
-def transcribe_audio(file_path):
-    #transcribe audio file using vosk speech recognition
-    # open wave file for reading
-    wf = wave.open(file_path, "rb")
-    rec = KaldiRecognizer(vosk_model, wf.getframerate())
+AUDIO_SAMPLE_RATE = 16000  # vosk small model expects 16 kHz mono
+PCM_CHUNK_BYTES = 8000  # 4000 frames of 16 bit mono audio per AcceptWaveform call
+
+def _recognize_chunks(sample_rate, chunks, offset_seconds=0.0):
+    # feed pcm chunks through a vosk recognizer, returns (transcript, word_track)
+    # the word track holds vosk's per word start / end / conf shifted by offset_seconds
+    vosk_model = model_registry.get("vosk")
+    from vosk import KaldiRecognizer
+    rec = KaldiRecognizer(vosk_model, sample_rate)
     rec.SetWords(True)
     results = []
     
-    while True:
-        data = wf.readframes(4000)
-        if len(data) == 0:
-            break
+    for data in chunks:
         if rec.AcceptWaveform(data):
             results.append(json.loads(rec.Result()))
     
     results.append(json.loads(rec.FinalResult()))
     # combine all transcribed text
     transcript = " ".join([r.get("text", "") for r in results])
-    return transcript
+    return transcript, WordTrack.from_vosk(results, offset_seconds)
 
-def analyze_sentiment(text):
-    # create textblob object for sentiment analysis
-    blob = TextBlob(text)
-    # get polarity score (-1 to 1, where -1 is negative, 1 is positive)
-    polarity = blob.sentiment.polarity
-    
-    # classify sentiment based on polarity threshold
-    if polarity > 0.1:
-        sentiment = "positive"
-    elif polarity < -0.1:
-        sentiment = "negative"
-    else:
-        sentiment = "neutral"
-    
-    return {"sentiment": sentiment, "polarity": polarity}
+def transcribe_audio(file_path):
+    #transcribe wav file using vosk speech recognition
+    # open wave file for reading, the duration comes from the header
+    wf = wave.open(file_path, "rb")
+    try:
+        chunks = iter(lambda: wf.readframes(4000), b"")
+        transcript, word_track = _recognize_chunks(wf.getframerate(), chunks)
+        duration_seconds = wf.getnframes() / float(wf.getframerate())
+        return {"transcript": transcript, "word_track": word_track, "duration_seconds": duration_seconds}
+    finally:
+        wf.close()
+
+def transcribe_media_stream(media_path):
+    # decode any container/codec with ffmpeg straight to 16 kHz mono s16le on stdout and
+    # stream it into vosk - no temporary wav is written, duration comes from the byte count
+    # returns None when ffmpeg is missing or can't decode the file
+    command = [
+        "ffmpeg", "-nostdin", "-i", media_path, "-vn", "-acodec", "pcm_s16le",
+        "-ar", str(AUDIO_SAMPLE_RATE), "-ac", "1", "-f", "s16le", "pipe:1"
+    ]
+    try:
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    except FileNotFoundError:
+        logger.warning("ffmpeg not found. Audio analysis will be skipped.")
+        return None
+
+    total_bytes = 0
+    def pcm_chunks():
+        nonlocal total_bytes
+        while True:
+            data = process.stdout.read(PCM_CHUNK_BYTES)
+            if not data:
+                break
+            total_bytes += len(data)
+            yield data
+
+    with span("ffmpeg_vosk_stream") as stream_span:
+        try:
+            transcript, word_track = _recognize_chunks(AUDIO_SAMPLE_RATE, pcm_chunks())
+        finally:
+            process.stdout.close()
+            returncode = process.wait()
+        # 2 bytes per sample, one channel
+        duration_seconds = total_bytes / (2.0 * AUDIO_SAMPLE_RATE)
+        stream_span.set(audio_seconds=round(duration_seconds, 2), transcript_chars=len(transcript))
+    if returncode != 0 and total_bytes == 0:
+        logger.error(f"ffmpeg could not decode audio from {media_path} (exit code {returncode})")
+        return None
+
+    return {"transcript": transcript, "word_track": word_track, "duration_seconds": duration_seconds}
+
+def probe_media_duration(media_path):
+    # container duration in seconds from ffprobe, without decoding anything
+    # returns None when ffprobe is missing or the file has no duration in its header
+    command = [
+        "ffprobe", "-v", "error", "-show_entries", "format=duration",
+        "-of", "default=noprint_wrappers=1:nokey=1", media_path
+    ]
+    try:
+        result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, timeout=30)
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        return None
+    try:
+        return float(result.stdout.strip())
+    except ValueError:
+        # "N/A" for streams without a duration, e.g. webm straight from MediaRecorder
+        return None
+
+def decode_audio_pcm(media_path):
+    # decode the whole audio track to 16 kHz mono s16le bytes in memory (32 KB per second)
+    # returns None when ffmpeg is missing or can't decode the file
+    command = [
+        "ffmpeg", "-nostdin", "-i", media_path, "-vn", "-acodec", "pcm_s16le",
+        "-ar", str(AUDIO_SAMPLE_RATE), "-ac", "1", "-f", "s16le", "pipe:1"
+    ]
+    try:
+        with span("ffmpeg_extraction") as extraction_span:
+            result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+            extraction_span.set(audio_seconds=round(len(result.stdout) / (2.0 * AUDIO_SAMPLE_RATE), 2))
+    except FileNotFoundError:
+        logger.warning("ffmpeg not found. Audio analysis will be skipped.")
+        return None
+    if result.returncode != 0 and not result.stdout:
+        logger.error(f"ffmpeg could not decode audio from {media_path} (exit code {result.returncode})")
+        return None
+    return result.stdout
+
+def plan_transcription_windows(pcm_bytes, window_seconds, overlap_seconds):
+    # split pcm of pcm_bytes length into overlapping windows
+    # returns [(start_byte, end_byte, offset_seconds)], consecutive windows share overlap_seconds
+    bytes_per_second = 2 * AUDIO_SAMPLE_RATE
+    window = max(int(window_seconds * bytes_per_second) // 2 * 2, 2)
+    overlap = min(int(overlap_seconds * bytes_per_second) // 2 * 2, window // 2)
+    windows = []
+    start = 0
+    while True:
+        end = min(start + window, pcm_bytes)
+        windows.append((start, end, start / float(bytes_per_second)))
+        if end >= pcm_bytes:
+            break
+        start = end - overlap
+    return windows
+
+def transcribe_pcm_window(pcm, offset_seconds=0.0):
+    # transcribe one window of 16 kHz mono s16le pcm in its own recognizer
+    # word timestamps are returned relative to the start of the whole recording
+    chunks = (pcm[i:i + PCM_CHUNK_BYTES] for i in range(0, len(pcm), PCM_CHUNK_BYTES))
+    with span("vosk_window", offset_seconds=offset_seconds, audio_seconds=round(len(pcm) / (2.0 * AUDIO_SAMPLE_RATE), 2)) as window_span:
+        _, word_track = _recognize_chunks(AUDIO_SAMPLE_RATE, chunks, offset_seconds)
+        window_span.set(words=len(word_track))
+    return word_track
+
+def stitch_transcription_windows(window_tracks, windows, seam_tolerance=0.3):
+    # merge per-window word tracks into one timeline
+    # each overlap is cut at its midpoint (the seam): words centered before the cut come from the
+    # earlier window, words after it from the later one. a word both windows recognized can end up
+    # on both sides of the seam, so a repeated pair is dropped only when the two words come from
+    # different windows and both lie within seam_tolerance seconds of the seam - a speaker's own
+    # stutter ("no no") inside a window is kept
+    bytes_per_second = 2.0 * AUDIO_SAMPLE_RATE
+    kept = []
+    sources = []
+    seams = []
+    for i, track in enumerate(window_tracks):
+        lower = float("-inf")
+        upper = float("inf")
+        if i > 0:
+            overlap_start = windows[i][0] / bytes_per_second
+            overlap_end = windows[i - 1][1] / bytes_per_second
+            lower = (overlap_start + overlap_end) / 2
+            seams.append(lower)
+        if i + 1 < len(windows):
+            overlap_start = windows[i + 1][0] / bytes_per_second
+            overlap_end = windows[i][1] / bytes_per_second
+            upper = (overlap_start + overlap_end) / 2
+        center = (track.start + track.end) / 2
+        selected = track.select((center >= lower) & (center < upper))
+        kept.append(selected)
+        sources.append(np.full(len(selected), i))
+    merged = WordTrack.concatenate(kept)
+    if len(merged) < 2 or not seams:
+        return merged
+    source = np.concatenate(sources)
+    center = (merged.start + merged.end) / 2
+    near_seam = np.abs(center[:, None] - np.array(seams)[None, :]).min(axis=1) <= seam_tolerance
+    words = np.array(merged.words)
+    repeated = np.zeros(len(merged), dtype=bool)
+    repeated[1:] = ((words[1:] == words[:-1]) & (source[1:] != source[:-1])
+                    & near_seam[1:] & near_seam[:-1])
+    return merged.select(~repeated)
 
-def analyze_eye_contact(video_path):
-    #mediapipe face mesh for facial landmark detection
-    mp_face_mesh = mp.solutions.face_mesh
+def analyze_sentiment(text, word_track=None):
+    # overall polarity (-1 to 1, where -1 is negative, 1 is positive) and subjectivity from the
+    # numpy lexicon engine, plus a polarity timeline over time segments when the word track is given
+    lexicon = model_registry.get("sentiment")
+    with span("lexicon_sentiment", transcript_chars=len(text)):
+        result = lexicon.score_texts([text])[0]
+        if word_track is not None and len(word_track):
+            result["timeline"] = lexicon.timeline(word_track, settings.sentiment_segment_seconds)
+    return result
+
+def analyze_sentiment_batch(texts):
+    # many transcripts scored in one vectorized pass (bulk rescoring of stored interviews)
+    lexicon = model_registry.get("sentiment")
+    with span("lexicon_sentiment_batch", texts=len(texts)):
+        return lexicon.score_texts(texts)
+
+def _frame_stride(native_fps, sample_fps):
+    # how many decoded frames to step over between analyzed frames
+    if not sample_fps or sample_fps <= 0 or not native_fps or native_fps <= sample_fps:
+        return 1
+    return max(int(round(native_fps / sample_fps)), 1)
+
+def _check_frame_eye_contact(face_mesh, frame, max_width=0, roi=None, roi_margin=0.25):
+    # run face mesh on one bgr frame, returns (face_found, eye_contact, face_roi)
+    # roi is the normalized (x0, y0, x1, y1) face box from the previous detection,
+    # when given only that region of the frame is passed to face mesh
+    cv2 = model_registry.get("cv2")
+    height, width = frame.shape[:2]
+    if max_width and width > max_width:
+        scale = max_width / float(width)
+        frame = cv2.resize(frame, (max_width, max(int(height * scale), 1)), interpolation=cv2.INTER_AREA)
+        height, width = frame.shape[:2]
+
+    x0, y0, x1, y1 = roi if roi else (0.0, 0.0, 1.0, 1.0)
+    left, top = int(x0 * width), int(y0 * height)
+    right, bottom = max(int(x1 * width), left + 1), max(int(y1 * height), top + 1)
+    crop = frame[top:bottom, left:right]
+
+    # convert bgr to rgb for mediapipe
+    results = face_mesh.process(cv2.cvtColor(crop, cv2.COLOR_BGR2RGB))
+    if not results.multi_face_landmarks:
+        if roi:
+            # lost the face inside the crop, look at the whole frame again
+            return _check_frame_eye_contact(face_mesh, frame, 0, None, roi_margin)
+        return False, False, None
+
+    landmarks = results.multi_face_landmarks[0].landmark
+    crop_width, crop_height = right - left, bottom - top
+    # map crop-relative coordinates back to the full frame
+    to_x = lambda x: (left + x * crop_width) / width
+    to_y = lambda y: (top + y * crop_height) / height
+
+    # left and right eye center landmarks (33 and 263)
+    left_eye_x = to_x(landmarks[33].x)
+    right_eye_x = to_x(landmarks[263].x)
+    # if both eyes are horizontally centered (x between 0.4 and 0.6), count as eye contact
+    eye_contact = 0.4 < left_eye_x < 0.6 and 0.4 < right_eye_x < 0.6
+
+    # face bounding box padded by roi_margin, used to crop the next sampled frame
+    xs = [lm.x for lm in landmarks]
+    ys = [lm.y for lm in landmarks]
+    fx0, fx1, fy0, fy1 = to_x(min(xs)), to_x(max(xs)), to_y(min(ys)), to_y(max(ys))
+    pad_x, pad_y = (fx1 - fx0) * roi_margin, (fy1 - fy0) * roi_margin
+    face_roi = (max(fx0 - pad_x, 0.0), max(fy0 - pad_y, 0.0), min(fx1 + pad_x, 1.0), min(fy1 + pad_y, 1.0))
+    return True, eye_contact, face_roi
+
+def create_live_recognizer(sample_rate=AUDIO_SAMPLE_RATE):
+    # one long lived vosk recognizer per live session, fed audio chunks as they arrive
+    from vosk import KaldiRecognizer
+    rec = KaldiRecognizer(model_registry.get("vosk"), sample_rate)
+    rec.SetWords(True)
+    return rec
+
+def live_face_mesh():
+    # face mesh borrowed from the registry pool for a whole live session
+    # frames arrive at the client's pace and are cropped to the face, no tracking between them
+    return model_registry.face_mesh(static_image_mode=True)
+
+def check_live_frame(face_mesh, image, roi=None):
+    # one encoded (jpeg / png) frame of a live session, returns (face_found, eye_contact, face_roi)
+    # or None when the bytes are not an image
+    cv2 = model_registry.get("cv2")
+    frame = cv2.imdecode(np.frombuffer(image, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if frame is None:
+        return None
+    return _check_frame_eye_contact(face_mesh, frame, settings.eye_contact_max_width, roi, settings.eye_contact_roi_margin)
+
+def _eye_contact_result(eye_contact_frames, sampled_frames, total_frames, mode):
+    # calculate percentage of sampled frames with good eye contact
+    result = {
+        "eye_contact_percentage": 0,
+        "eye_contact_frames": eye_contact_frames,
+        "sampled_frames": sampled_frames,
+        "total_frames": total_frames,
+        "mode": mode,
+    }
+    if sampled_frames:
+        result["eye_contact_percentage"] = 100 * eye_contact_frames / sampled_frames
+    return result
+
+def get_video_frame_info(video_path):
+    # frame count and fps from the container header (frame count is 0 or negative
+    # for streams without an index, e.g. webm straight from MediaRecorder)
+    cv2 = model_registry.get("cv2")
     cap = cv2.VideoCapture(video_path)
-    face_mesh = mp_face_mesh.FaceMesh(static_image_mode=False, max_num_faces=1, min_detection_confidence=0.5, min_tracking_confidence=0.5)
+    try:
+        return int(cap.get(cv2.CAP_PROP_FRAME_COUNT)), cap.get(cv2.CAP_PROP_FPS)
+    finally:
+        cap.release()
+
+def analyze_eye_contact_segment(video_path, start_frame=0, end_frame=None, warmup_frames=0, mode=None):
+    # analyze frames [start_frame, end_frame) of the video
+    # the warmup_frames before start_frame go through face mesh too so tracking and the
+    # face roi are settled like in a sequential pass, but they are not counted
+    # mode "full" analyzes every frame at full resolution,
+    # mode "sampled" analyzes settings.eye_contact_sample_fps frames per second on
+    # downscaled frames cropped to the tracked face box
+    mode = mode or settings.eye_contact_mode
+    sampled_mode = mode == "sampled"
+    max_width = settings.eye_contact_max_width if sampled_mode else 0
+    roi_margin = settings.eye_contact_roi_margin
+
+    cv2 = model_registry.get("cv2")
+    cap = cv2.VideoCapture(video_path)
+    stride = _frame_stride(cap.get(cv2.CAP_PROP_FPS), settings.eye_contact_sample_fps) if sampled_mode else 1
     eye_contact_frames = 0
+    sampled_frames = 0
     total_frames = 0
+    face_roi = None
 
-    # process each frame in the video
-    while cap.isOpened():
-        ret, frame = cap.read()
-        if not ret:
-            break
-        total_frames += 1
-        # convert bgr to rgb for mediapipe
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = face_mesh.process(rgb_frame)
-        
-        if results.multi_face_landmarks:
-            landmarks = results.multi_face_landmarks[0].landmark
-            # left and right eye center landmarks (33 and 263)
-            left_eye = landmarks[33]
-            right_eye = landmarks[263]
-            # if both eyes are horizontally centered (x between 0.4 and 0.6), count as eye contact
-            if 0.4 < left_eye.x < 0.6 and 0.4 < right_eye.x < 0.6:
-                eye_contact_frames += 1
+    # seek to the start of the warm-up, the container may land on a nearby keyframe
+    # so the real position is read back and used as the frame index
+    frame_index = max(start_frame - warmup_frames, 0)
+    if frame_index:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, frame_index)
+        frame_index = int(cap.get(cv2.CAP_PROP_POS_FRAMES))
+
+    #mediapipe face mesh for facial landmark detection, borrowed from the registry pool
+    # sampled mode feeds sparse face crops of changing size, so every frame is detected from scratch
+    with model_registry.face_mesh(static_image_mode=sampled_mode) as face_mesh, span("face_mesh_scan", start_frame=start_frame) as scan_span:
+        # process each frame in the range, frames between samples are grabbed without decoding to rgb
+        # sampling is aligned to the global frame index so segments pick the same frames as one pass
+        while cap.isOpened() and (end_frame is None or frame_index < end_frame):
+            counted = frame_index >= start_frame
+            if frame_index % stride != 0:
+                if not cap.grab():
+                    break
+                frame_index += 1
+                total_frames += counted
+                continue
+            ret, frame = cap.read()
+            if not ret:
+                break
+            frame_index += 1
+            _, eye_contact, roi = _check_frame_eye_contact(
+                face_mesh, frame, max_width, face_roi if sampled_mode else None, roi_margin
+            )
+            face_roi = roi
+            if counted:
+                total_frames += 1
+                sampled_frames += 1
+                if eye_contact:
+                    eye_contact_frames += 1
+        scan_span.set(frames_processed=sampled_frames, frames_total=total_frames)
     cap.release()
-    face_mesh.close()
-    
-    # calculate percentage of frames with good eye contact
-    if total_frames == 0:
-        return {"eye_contact_percentage": 0}
-    return {"eye_contact_percentage": 100 * eye_contact_frames / total_frames}
+    return _eye_contact_result(eye_contact_frames, sampled_frames, total_frames, mode)
 
-def extract_audio_from_video(video_path, output_wav_path):
-    try:
-        # use ffmpeg to extract audio as wav format
-        command = [
-            "ffmpeg", "-y", "-i", video_path, "-vn", "-acodec", "pcm_s16le", "-ar", "16000", "-ac", "1", output_wav_path
-        ]
-        result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
-        return os.path.exists(output_wav_path)
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        # if ffmpeg is not available, return false and continue without audio analysis
-        print("Warning: ffmpeg not found. Audio analysis will be skipped.")
-        return False
-
-def generate_interview_tips(eye_contact, sentiment, transcript, question_type, question):
+def analyze_eye_contact(video_path, mode=None):
+    # single pass over the whole video
+    return analyze_eye_contact_segment(video_path, mode=mode)
+
+def plan_eye_contact_segments(frame_count, fps, max_segments):
+    # split the video into at most max_segments frame ranges for parallel analysis
+    # returns [] when the video is too short or its length is unknown
+    if frame_count <= 0 or not fps or fps <= 0 or max_segments < 2:
+        return []
+    min_segment_frames = int(settings.eye_contact_segment_min_seconds * fps)
+    segments = min(max_segments, frame_count // max(min_segment_frames, 1))
+    if segments < 2:
+        return []
+    bounds = [round(i * frame_count / segments) for i in range(segments + 1)]
+    warmup_frames = int(settings.eye_contact_segment_warmup_seconds * fps)
+    return [(bounds[i], bounds[i + 1], warmup_frames if i else 0) for i in range(segments)]
+
+def merge_eye_contact_segments(segment_results, mode=None):
+    # combine the per-segment counts into one result like a sequential pass
+    mode = mode or settings.eye_contact_mode
+    merged = _eye_contact_result(
+        sum(r.get("eye_contact_frames", 0) for r in segment_results),
+        sum(r.get("sampled_frames", 0) for r in segment_results),
+        sum(r.get("total_frames", 0) for r in segment_results),
+        mode,
+    )
+    merged["segments"] = len(segment_results)
+    return merged
+
+def generate_interview_tips(eye_contact, sentiment, transcript, question_type, question,
+                            text: Optional[TextAnalysis] = None):
     tips = []
     # eye contact feedback
     if eye_contact.get("eye_contact_percentage", 100) < 70:
         tips.append("Try to look at the camera more often to improve your eye contact.")
     
-    # transcript and question analysis
-    transcript_lower = transcript.lower()
-    question_lower = question.lower()
+    # transcript and question analysis, tokenized once for all the checks below
+    if text is None:
+        text = analyze_text(transcript, question)
+    word_count = text.word_count
     # check if the answer is relevant to the question
     if question_type == "behavioral":
-        if len(transcript.split()) < 20:
+        if word_count < 20:
             tips.append("For behavioral questions, use the STAR method (Situation, Task, Action, Result) and give a detailed story.")
-        if not any(word in transcript_lower for word in ["situation", "task", "action", "result"]):
+        if not text.has_keyword(*STAR_KEYWORDS):
             tips.append("Try to structure your answer using the STAR method keywords.")
         if sentiment.get("sentiment") == "negative":
             tips.append("Frame your answer positively, even if discussing a challenge. Focus on what you learned or how you improved.")
         if sentiment.get("sentiment") == "neutral":
             tips.append("Add more emotion or personal reflection to your answer.")
     elif question_type == "technical":
-        if len(transcript.split()) < 20:
+        if word_count < 20:
             tips.append("For technical questions, explain the concept step by step and give a real-world example if possible.")
-        if "example" not in transcript_lower:
+        if not text.has_keyword("example"):
             tips.append("Try to include a real-world example in your technical answer.")
-        if not any(word in transcript_lower for word in question_lower.split()):
+        if not text.question_overlap:
             tips.append("Make sure your answer directly addresses the technical question asked.")
         tips.append("Focus on clarity and structure. If you can, mention trade-offs or alternatives.")
     elif question_type == "general":
-        if len(transcript.split()) < 20:
+        if word_count < 20:
             tips.append("For general questions, expand on your answer to show your motivation and goals.")
         if sentiment.get("sentiment") == "negative":
             tips.append("Show confidence and motivation in your answer.")
-        if not any(word in transcript_lower for word in question_lower.split()):
+        if not text.question_overlap:
             tips.append("Make sure your answer is relevant to the question.")
     
-    if len(transcript.split()) < 5:
+    if word_count < 5:
         tips.append("Try to give a more complete answer with specific details.")
     if not tips:
         tips.append("Great job! Your answer matches what we'd expect for this question.")
     
     return tips
 
-def calculate_speech_rate(transcript: str, duration_seconds: float) -> float:
+def analyze_speech(word_track, duration_seconds=None):
+    # pace curve, pauses and filler timestamps from the word timestamps alone
+    return word_track.speech_analytics(
+        duration_seconds,
+        settings.pace_window_seconds,
+        settings.pace_step_seconds,
+        settings.pause_min_seconds,
+        settings.long_pause_seconds,
+    )
+
+def calculate_speech_rate(transcript: str, duration_seconds: float, text: Optional[TextAnalysis] = None) -> float:
     if not transcript or not duration_seconds or duration_seconds == 0:
         return 0.0
     
     # count words in transcript
-    word_count = len(transcript.split())
+    word_count = (text or analyze_text(transcript)).word_count
     minutes = duration_seconds / 60.0
     return word_count / minutes if minutes > 0 else 0.0
 
-def count_filler_words(transcript: str) -> int:
-    # define common filler words to look for
-    fillers = [r'\bum\b', r'\buh\b', r'\blike\b', r'\byou know\b', r'\ber\b', r'\bso\b']
-    count = 0
-    # count occurrences of each filler word
-    for filler in fillers:
-        count += len(re.findall(filler, transcript.lower()))
-    return count
+def count_filler_words(transcript: str, text: Optional[TextAnalysis] = None) -> int:
+    # common filler words (um, uh, like, you know, er, so) counted by the text analytics pass
+    return (text or analyze_text(transcript)).filler_total
 
 def calculate_overall_score(eye_contact_percentage, sentiment_polarity, speech_rate, filler_word_count):
     # normalize metrics (0-1 scale)
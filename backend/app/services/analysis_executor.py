@@ -0,0 +1,99 @@
+# analysis executor - runs the cpu bound ai_analysis functions in a process pool
+# so the asyncio event loop keeps serving requests while media is processed
+import asyncio
+import functools
+import logging
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional
+
+from app.core.config import settings
+from app.services.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+
+def _init_worker():
+    # runs once in every worker process, loads the models so each task doesn't pay for it
+    logging.basicConfig(level=logging.INFO)
+    from app.services.model_registry import model_registry
+    if not settings.mock_ai_responses:
+        model_registry.warm_up()
+    logging.getLogger(__name__).info(f"Analysis worker {os.getpid()} ready")
+
+
+def _traced_call(call: Callable[[], Any]):
+    # run call and return its result together with the tracing spans it opened,
+    # the caller attaches them to its own trace since worker processes don't keep traces
+    with tracer.collect() as collected:
+        result = call()
+    return result, [child.to_dict() for child in collected.children]
+
+
+def _worker_status() -> Dict:
+    # model status of the worker process that picks this task up
+    from app.services.model_registry import model_registry
+    return {"pid": os.getpid(), **model_registry.status()}
+
+
+class AnalysisExecutor:
+    def __init__(self, max_workers: Optional[int] = None, start_method: Optional[str] = None):
+        # 0 workers means run in a thread pool inside this process (useful for debugging)
+        self.max_workers = settings.analysis_workers if max_workers is None else max_workers
+        self.start_method = start_method or settings.analysis_start_method
+        self._executor: Optional[Executor] = None
+        self.worker_status: List[Dict] = []
+
+    def start(self) -> Executor:
+        # create the pool lazily so importing this module stays cheap
+        if self._executor is None:
+            if self.max_workers > 0:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context(self.start_method),
+                    initializer=_init_worker,
+                )
+                logger.info(f"Analysis process pool started with {self.max_workers} workers ({self.start_method})")
+            else:
+                self._executor = ThreadPoolExecutor(thread_name_prefix="analysis")
+                logger.info("Analysis executor running in thread mode")
+        return self._executor
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        # submit func to the pool and await its result without blocking the loop
+        # func must be a module level function so it can be pickled to the workers
+        executor = self.start()
+        loop = asyncio.get_running_loop()
+        call = functools.partial(func, *args, **kwargs)
+        try:
+            result, spans = await loop.run_in_executor(executor, _traced_call, call)
+            tracer.attach(spans)
+            return result
+        except BrokenProcessPool:
+            # a worker died (e.g. killed by the oom killer) - replace the pool for the next task
+            logger.error(f"Analysis pool broke while running {func.__name__}, restarting pool")
+            self.shutdown(wait=False)
+            raise
+
+    async def warm_up(self) -> List[Dict]:
+        # spawn the workers now so their initializer loads the models before the first upload
+        try:
+            self.worker_status = list(await asyncio.gather(
+                *[self.run(_worker_status) for _ in range(max(self.max_workers, 1))]
+            ))
+            logger.info(f"Analysis workers warmed up: {len(self.worker_status)}")
+        except Exception as e:
+            logger.error(f"Analysis worker warm-up failed: {e}")
+        return self.worker_status
+
+    def shutdown(self, wait: bool = True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=not wait)
+            self._executor = None
+            logger.info("Analysis executor shut down")
+
+
+# global analysis executor instance
+analysis_executor = AnalysisExecutor()
@@ -0,0 +1,296 @@
+# asynchronous analysis jobs - uploads are saved and queued, a pool of workers runs the
+# analysis pipeline and records stage progress so clients can poll or stream it
+# the queue sits behind JobQueue so it can use the redis from docker-compose or an
+# in-process stand-in for local runs
+import asyncio
+import json
+import logging
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.services.metrics import metrics_service
+from app.services.pipeline import PIPELINE_STAGES, AnalysisError, analyze_video, build_interview, build_response
+from app.services.response_cache import response_cache
+from app.services.storage import media_storage
+from app.services.tracing import span
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ("completed", "failed")
+
+
+def _new_job(payload: Dict) -> Dict:
+    now = datetime.now().isoformat()
+    return {
+        "id": uuid.uuid4().hex,
+        "status": "queued",
+        "stages": {stage: "pending" for stage in PIPELINE_STAGES + ["saving"]},
+        "progress": 0.0,
+        "payload": payload,
+        "result": None,
+        "error": None,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def _apply_update(job: Dict, fields: Dict) -> Dict:
+    # stage updates are merged into the stage map, progress follows completed stages
+    stage_updates = fields.pop("stages", None)
+    job.update(fields)
+    if stage_updates:
+        job["stages"].update(stage_updates)
+    completed = sum(1 for state in job["stages"].values() if state == "completed")
+    job["progress"] = round(completed / len(job["stages"]), 2)
+    if job["status"] == "completed":
+        job["progress"] = 1.0
+    job["updated_at"] = datetime.now().isoformat()
+    return job
+
+
+class JobQueue(ABC):
+    # storage for job state plus a fifo of job ids waiting for a worker
+    @abstractmethod
+    async def enqueue(self, payload: Dict) -> Dict:
+        ...
+
+    @abstractmethod
+    async def dequeue(self, timeout: float) -> Optional[str]:
+        # next job id, or None if nothing arrived within timeout seconds
+        ...
+
+    @abstractmethod
+    async def get(self, job_id: str) -> Optional[Dict]:
+        ...
+
+    @abstractmethod
+    async def update(self, job_id: str, **fields) -> Optional[Dict]:
+        ...
+
+    @abstractmethod
+    async def active_jobs(self) -> List[Dict]:
+        # jobs that are queued or running
+        ...
+
+    async def close(self):
+        pass
+
+
+class InMemoryJobQueue(JobQueue):
+    # in-process stand-in for local runs, jobs are lost on restart
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._jobs: "OrderedDict[str, Dict]" = OrderedDict()
+        self._created: Dict[str, float] = {}
+        self._queue: asyncio.Queue = asyncio.Queue()
+
+    def _expire(self):
+        # jobs are inserted in creation order so expired ones are at the front
+        cutoff = time.time() - self.ttl_seconds
+        while self._jobs:
+            job_id = next(iter(self._jobs))
+            if self._created[job_id] >= cutoff:
+                break
+            self._jobs.pop(job_id)
+            self._created.pop(job_id)
+
+    async def enqueue(self, payload: Dict) -> Dict:
+        self._expire()
+        job = _new_job(payload)
+        self._jobs[job["id"]] = job
+        self._created[job["id"]] = time.time()
+        await self._queue.put(job["id"])
+        return dict(job)
+
+    async def dequeue(self, timeout: float) -> Optional[str]:
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def get(self, job_id: str) -> Optional[Dict]:
+        job = self._jobs.get(job_id)
+        return json.loads(json.dumps(job)) if job else None
+
+    async def update(self, job_id: str, **fields) -> Optional[Dict]:
+        job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        return _apply_update(job, fields)
+
+    async def active_jobs(self) -> List[Dict]:
+        self._expire()
+        return [json.loads(json.dumps(job)) for job in self._jobs.values() if job["status"] not in TERMINAL_STATUSES]
+
+
+class RedisJobQueue(JobQueue):
+    # jobs stored as json strings with a ttl, pending ids in a redis list
+    def __init__(self, url: str, ttl_seconds: int, prefix: str = "interview-ai:jobs"):
+        import redis.asyncio as redis
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+        self._redis = redis.from_url(url, decode_responses=True)
+        # the two pipeline branches report progress concurrently, updates are serialized
+        self._update_lock = asyncio.Lock()
+
+    def _key(self, job_id: str) -> str:
+        return f"{self.prefix}:job:{job_id}"
+
+    async def enqueue(self, payload: Dict) -> Dict:
+        job = _new_job(payload)
+        await self._redis.set(self._key(job["id"]), json.dumps(job), ex=self.ttl_seconds)
+        await self._redis.rpush(f"{self.prefix}:queue", job["id"])
+        return job
+
+    async def dequeue(self, timeout: float) -> Optional[str]:
+        item = await self._redis.blpop(f"{self.prefix}:queue", timeout=max(int(timeout), 1))
+        return item[1] if item else None
+
+    async def get(self, job_id: str) -> Optional[Dict]:
+        raw = await self._redis.get(self._key(job_id))
+        return json.loads(raw) if raw else None
+
+    async def update(self, job_id: str, **fields) -> Optional[Dict]:
+        # only the worker that owns a job writes to it, so a local lock is enough
+        async with self._update_lock:
+            job = await self.get(job_id)
+            if job is None:
+                return None
+            job = _apply_update(job, fields)
+            await self._redis.set(self._key(job_id), json.dumps(job), ex=self.ttl_seconds)
+            return job
+
+    async def active_jobs(self) -> List[Dict]:
+        # every api process shares the queue, so this sees jobs enqueued anywhere
+        jobs = []
+        keys = [key async for key in self._redis.scan_iter(match=self._key("*"), count=500)]
+        for start in range(0, len(keys), 500):
+            for raw in await self._redis.mget(keys[start:start + 500]):
+                job = json.loads(raw) if raw else None
+                if job and job["status"] not in TERMINAL_STATUSES:
+                    jobs.append(job)
+        return jobs
+
+    async def close(self):
+        await self._redis.close()
+
+
+def create_job_queue() -> JobQueue:
+    if settings.job_backend == "redis":
+        logger.info(f"Using redis job queue at {settings.redis_url}")
+        return RedisJobQueue(settings.redis_url, settings.job_ttl_seconds)
+    return InMemoryJobQueue(settings.job_ttl_seconds)
+
+
+async def run_video_analysis_job(queue: JobQueue, job_id: str):
+    # run the pipeline for one queued upload and save the interview
+    job = await queue.get(job_id)
+    if job is None:
+        logger.warning(f"Job {job_id} expired before it was picked up")
+        return
+    payload = job["payload"]
+    start_time = time.time()
+    await queue.update(job_id, status="running")
+
+    async def progress(stage: str, state: str):
+        await queue.update(job_id, stages={stage: state})
+
+    # each job is its own trace, the pipeline stage spans nest under it
+    with span("analysis_job", question_type=payload["question_type"]):
+        saved = False
+        try:
+            analysis = await analyze_video(
+                payload["video_path"], payload["question"], payload["question_type"], progress, payload.get("sha256")
+            )
+            await progress("saving", "running")
+            async with SessionLocal() as db:
+                db_interview = build_interview(payload["video_path"], payload["question"], payload["question_type"], analysis)
+                with span("db_commit"):
+                    db.add(db_interview)
+                    await db.flush()
+                    media_storage.track(db, db_interview.id, "video", payload["video_path"])
+                    await db.commit()
+                    saved = True
+                    await db.refresh(db_interview)
+                response_cache.invalidate(db_interview.id)
+            processing_time = time.time() - start_time
+            metrics_service.record_analysis_success(
+                db_interview.id,
+                processing_time,
+                analysis["eye_contact"].get("eye_contact_percentage", 0),
+                analysis["sentiment"].get("polarity", 0),
+                analysis["speech_rate"],
+                analysis["overall_score"]
+            )
+            await queue.update(
+                job_id, status="completed", stages={"saving": "completed"},
+                result=build_response(db_interview.id, analysis),
+            )
+            logger.info(f"Job {job_id} completed: interview {db_interview.id} (took {processing_time:.2f}s)")
+        except AnalysisError as e:
+            metrics_service.record_analysis_failure(e.stage, time.time() - start_time)
+            media_storage.discard(payload["video_path"])
+            await queue.update(job_id, status="failed", error=e.detail)
+        except asyncio.CancelledError:
+            # worker stopped mid job (shutdown) - settle the job instead of leaving it "running" until its ttl
+            logger.warning(f"Job {job_id} cancelled")
+            if not saved:
+                media_storage.discard(payload["video_path"])
+            await queue.update(job_id, status="failed", error="cancelled")
+            raise
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {e}")
+            metrics_service.record_analysis_failure("general_error", time.time() - start_time)
+            media_storage.discard(payload["video_path"])
+            await queue.update(job_id, status="failed", error=f"Analysis failed: {str(e)}")
+
+
+class JobManager:
+    # owns the queue and the worker tasks, started and stopped from lifespan
+    def __init__(self):
+        self.queue: Optional[JobQueue] = None
+        self._workers: List[asyncio.Task] = []
+
+    async def start(self, workers: Optional[int] = None):
+        self.queue = create_job_queue()
+        workers = settings.job_workers if workers is None else workers
+        self._workers = [asyncio.create_task(self._worker(i)) for i in range(workers)]
+        logger.info(f"Started {workers} analysis job workers ({settings.job_backend} backend)")
+
+    async def _worker(self, index: int):
+        while True:
+            try:
+                job_id = await self.queue.dequeue(timeout=5)
+                if job_id:
+                    await run_video_analysis_job(self.queue, job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # keep the worker alive if the backend hiccups (e.g. redis restart)
+                logger.error(f"Job worker {index} error: {e}")
+                await asyncio.sleep(1)
+
+    async def active_media_paths(self) -> Set[str]:
+        # uploads still waiting for or going through analysis, kept out of media garbage collection
+        if self.queue is None:
+            return set()
+        return {job["payload"]["video_path"] for job in await self.queue.active_jobs()
+                if job.get("payload", {}).get("video_path")}
+
+    async def stop(self):
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        if self.queue is not None:
+            await self.queue.close()
+
+
+# global job manager instance
+job_manager = JobManager()
@@ -0,0 +1,126 @@
+# live interview session - analyzes an answer while it is being recorded
+# audio chunks go into one long lived vosk recognizer (partial + final results as they come),
+# sampled video frames into one face mesh kept for the whole session, so when the stream ends
+# only the final recognizer flush, sentiment and scoring are left to do
+# every method here is blocking, the websocket endpoint runs them in a worker thread
+import json
+import logging
+import time
+from contextlib import ExitStack
+from typing import Dict, Optional
+
+from app.core.config import settings
+from app.services.ai_analysis import AUDIO_SAMPLE_RATE, _eye_contact_result
+from app.services.word_track import WordTrack
+
+# same switch as the pipeline - stub recognizer and frame check when mock responses are on
+if settings.mock_ai_responses:
+    from app.services.mock_analysis import (
+        analyze_sentiment,
+        check_live_frame,
+        create_live_recognizer,
+        live_face_mesh,
+    )
+else:
+    from app.services.ai_analysis import (
+        analyze_sentiment,
+        check_live_frame,
+        create_live_recognizer,
+        live_face_mesh,
+    )
+
+logger = logging.getLogger(__name__)
+
+
+class LiveSession:
+    def __init__(self, question: str, question_type: str, sample_rate: int = AUDIO_SAMPLE_RATE):
+        self.question = question
+        self.question_type = question_type
+        self.sample_rate = sample_rate
+        self.started = time.time()
+        self.audio_bytes = 0
+        self.results = []  # final vosk results with word timestamps
+        self.eye_contact_frames = 0
+        self.sampled_frames = 0
+        self._recognizer = None
+        self._face_mesh = None
+        self._face_mesh_ready = False
+        self._face_mesh_error: Optional[str] = None
+        self._roi = None
+        self._resources = ExitStack()
+
+    @property
+    def audio_seconds(self) -> float:
+        # 2 bytes per sample, one channel
+        return self.audio_bytes / (2.0 * self.sample_rate)
+
+    def _get_recognizer(self):
+        if self._recognizer is None:
+            self._recognizer = create_live_recognizer(self.sample_rate)
+        return self._recognizer
+
+    def accept_audio(self, pcm: bytes) -> Optional[Dict]:
+        # 16 bit mono pcm at sample_rate, returns the event to send back (final or partial text)
+        recognizer = self._get_recognizer()
+        self.audio_bytes += len(pcm)
+        if recognizer.AcceptWaveform(pcm):
+            result = json.loads(recognizer.Result())
+            self.results.append(result)
+            words = result.get("result", [])
+            return {
+                "type": "final",
+                "text": result.get("text", ""),
+                "start": words[0]["start"] if words else None,
+                "end": words[-1]["end"] if words else None,
+            }
+        partial = json.loads(recognizer.PartialResult()).get("partial", "")
+        return {"type": "partial", "text": partial} if partial else None
+
+    def accept_frame(self, image: bytes) -> Dict:
+        # one encoded (jpeg / png) video frame, updates the running eye contact percentage
+        if not self._face_mesh_ready and self._face_mesh_error is None:
+            try:
+                self._face_mesh = self._resources.enter_context(live_face_mesh())
+                self._face_mesh_ready = True
+            except Exception as e:
+                self._face_mesh_error = str(e)
+                logger.error(f"Live session face mesh unavailable: {e}")
+        if not self._face_mesh_ready:
+            return {"type": "error", "detail": "Eye contact analysis unavailable"}
+
+        checked = check_live_frame(self._face_mesh, image, self._roi)
+        if checked is None:
+            return {"type": "error", "detail": "Could not decode video frame"}
+        found, eye_contact, self._roi = checked
+        self.sampled_frames += 1
+        if eye_contact:
+            self.eye_contact_frames += 1
+        return {
+            "type": "eye_contact",
+            "face_found": found,
+            "eye_contact": eye_contact,
+            "eye_contact_percentage": round(100 * self.eye_contact_frames / self.sampled_frames, 1),
+        }
+
+    def finish(self) -> Dict:
+        # flush the recognizer and hand back everything scoring needs
+        if self._recognizer is not None:
+            self.results.append(json.loads(self._recognizer.FinalResult()))
+        transcript = " ".join(r.get("text", "") for r in self.results if r.get("text")).strip()
+        word_track = WordTrack.from_vosk(self.results)
+        eye_contact = _eye_contact_result(self.eye_contact_frames, self.sampled_frames, self.sampled_frames, "live")
+        sentiment = analyze_sentiment(transcript, word_track)
+        return {
+            "eye_contact": eye_contact,
+            "transcript": transcript,
+            "word_track": word_track,
+            "sentiment": sentiment,
+            "duration_seconds": self.audio_seconds or word_track.duration,
+        }
+
+    def close(self):
+        # the face mesh goes back to the registry pool
+        self._resources.close()
+        self._face_mesh = None
+        self._face_mesh_ready = False
+        self._recognizer = None
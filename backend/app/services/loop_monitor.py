@@ -0,0 +1,140 @@
+# event loop lag monitor - finds blocking calls inside async handlers
+# a ticker task sleeps interval seconds at a time and records how late it woke up (the scheduling
+# lag every request sees at that moment) into a latency histogram. a watchdog thread checks that
+# the ticker keeps running, when it has been stuck longer than the threshold the loop thread is
+# blocked and the watchdog grabs its python stack right then - the culprit is still on it.
+# the last stalls (lag, stack, task) are kept for the /metrics response
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+from app.services.stats import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+
+def _format_stack(frame, depth: int) -> List[str]:
+    # innermost depth frames as "file:line in function - source"
+    entries = traceback.extract_stack(frame)[-depth:]
+    return [f"{entry.filename}:{entry.lineno} in {entry.name} - {(entry.line or '').strip()}" for entry in entries]
+
+
+class LoopMonitor:
+    def __init__(self, interval: float, threshold: float, max_stalls: int, stack_depth: int):
+        self.interval = interval
+        self.threshold = threshold
+        self.stack_depth = stack_depth
+        self.lag = LatencyHistogram()
+        self.stalls: deque = deque(maxlen=max_stalls)
+        self.stall_count = 0
+        # shared between the ticker on the loop and the watchdog thread
+        self._lock = threading.Lock()
+        self._last_tick = time.monotonic()
+        self._captured: Optional[Dict] = None  # stack grabbed during the stall in progress
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    def start(self):
+        # called from the running loop (app lifespan)
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_tick = time.monotonic()
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._tick(), name="loop-monitor")
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+        logger.info(f"Event loop monitor started (interval {self.interval}s, stall threshold {self.threshold}s)")
+
+    async def stop(self):
+        self._stopping.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=self.interval * 2)
+            self._watchdog = None
+
+    async def _tick(self):
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(now - expected, 0.0)
+            with self._lock:
+                self.lag.observe(lag)
+                self._last_tick = now
+                captured, self._captured = self._captured, None
+            if lag >= self.threshold:
+                self._record_stall(lag, captured)
+
+    def _record_stall(self, lag: float, captured: Optional[Dict]):
+        stall = {
+            "lag_seconds": round(lag, 4),
+            "ended_at": datetime.now().isoformat(),
+            "task": captured["task"] if captured else None,
+            "stack": captured["stack"] if captured else [],
+        }
+        with self._lock:
+            self.stalls.append(stall)
+            self.stall_count += 1
+        where = stall["stack"][-1] if stall["stack"] else "stack not captured"
+        logger.warning(f"Event loop blocked for {lag:.3f}s (task {stall['task']}): {where}")
+
+    def _watch(self):
+        # poll often enough to catch a stall while it is still going on
+        poll = max(min(self.interval, self.threshold) / 2, 0.005)
+        while not self._stopping.wait(poll):
+            with self._lock:
+                stuck_for = time.monotonic() - self._last_tick - self.interval
+                already_captured = self._captured is not None
+            if stuck_for < self.threshold or already_captured:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            task = None
+            try:
+                current = asyncio.current_task(self._loop)
+                if current is not None:
+                    task = f"{current.get_name()} {getattr(current.get_coro(), '__qualname__', '')}".strip()
+            except RuntimeError:
+                pass
+            captured = {"task": task, "stack": _format_stack(frame, self.stack_depth)}
+            with self._lock:
+                self._captured = captured
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "enabled": self._task is not None,
+                "interval_seconds": self.interval,
+                "stall_threshold_seconds": self.threshold,
+                "lag": self.lag.summary(),
+                "stall_count": self.stall_count,
+                "recent_stalls": list(self.stalls),
+            }
+
+
+# global loop monitor instance
+loop_monitor = LoopMonitor(
+    settings.loop_monitor_interval,
+    settings.loop_monitor_threshold,
+    settings.loop_monitor_max_stalls,
+    settings.loop_monitor_stack_depth,
+)
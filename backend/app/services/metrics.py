@@ -1,22 +1,61 @@
 import json
 import os
+import threading
+import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 import logging
 
+from app.core.config import settings
+from app.services.stats import LatencyHistogram, RingBuffer
+from app.services.tracing import tracer
+
 logger = logging.getLogger(__name__)
 
 #key features are performance tracking ( so eye contact, sentiment, etc)
 # keeps last 100 perforamance entries to prevent file from growing too large
 # counts diff types of failures tracks statistics by date , and removes older data.
 #this data will be written back to metric json file. The api endpoint will call this service to get the metrics.
+# events only update the in-memory aggregate, a background thread flushes it to disk every
+# flush_interval seconds or after flush_events events, so request handlers never touch the file
+# latency is tracked in log bucketed histograms per endpoint+method and per analysis stage so the
+# summary can report p50/p95/p99 instead of only a running mean (histograms cover this process' uptime)
+
+PERFORMANCE_KEYS = ["eye_contact_scores", "sentiment_scores", "speech_rates", "overall_scores"]
+PERFORMANCE_HISTORY = 100  # last n scores kept per performance metric
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _histogram_lines(name: str, labels: str, histogram: LatencyHistogram) -> List[str]:
+    lines = [f'{name}_bucket{{{labels},le="{bound:.6g}"}} {count}' for bound, count in histogram.cumulative_buckets()]
+    lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+    lines.append(f"{name}_sum{{{labels}}} {histogram.sum:.6f}")
+    lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+    return lines
+
 
 class MetricsService:
-    def __init__(self, metrics_dir: str = "metrics"):
+    def __init__(self, metrics_dir: str = "metrics", flush_interval: Optional[float] = None,
+                 flush_events: Optional[int] = None):
         # initialize metrics directory and file paths
         self.metrics_dir = metrics_dir
         os.makedirs(metrics_dir, exist_ok=True)
         self.metrics_file = os.path.join(metrics_dir, "app_metrics.json")
+        self.flush_interval = flush_interval or settings.metrics_flush_interval
+        self.flush_events = flush_events or settings.metrics_flush_events
+        # guards self.metrics between request handlers and the flush thread
+        self._lock = threading.RLock()
+        self._pending_events = 0
+        self._flush_requested = threading.Event()
+        self._stopping = False
+        self._flush_thread: Optional[threading.Thread] = None
+        # "METHOD /path/template" -> histogram / error count, stage name -> histogram
+        self.request_latency: Dict[str, LatencyHistogram] = {}
+        self.request_errors: Dict[str, int] = {}
+        self.stage_latency: Dict[str, LatencyHistogram] = {}
+        self._started = time.monotonic()
         self.load_metrics()
     
     def load_metrics(self):
@@ -31,6 +70,12 @@ class MetricsService:
         except Exception as e:
             logger.error(f"Error loading metrics: {e}")
             self.metrics = self._initialize_metrics()
+        # recent scores live in fixed size ring buffers, the json file keeps them as lists
+        stored = self.metrics.pop("performance_metrics", {})
+        self.performance = {
+            key: RingBuffer(PERFORMANCE_HISTORY, stored.get(key, [])[-PERFORMANCE_HISTORY:])
+            for key in PERFORMANCE_KEYS
+        }
     
     def _initialize_metrics(self) -> Dict:
         return {
@@ -42,93 +87,148 @@ class MetricsService:
             "total_processing_time": 0.0,
             "daily_stats": {},
             "error_counts": {},
-            "performance_metrics": {
-                "eye_contact_scores": [],
-                "sentiment_scores": [],
-                "speech_rates": [],
-                "overall_scores": []
-            }
+            "performance_metrics": {key: [] for key in PERFORMANCE_KEYS}
         }
     
     def save_metrics(self):
         try:
-            # write metrics to json file with proper formatting
-            with open(self.metrics_file, 'w') as f:
-                json.dump(self.metrics, f, indent=2)
+            # snapshot under the lock, write outside it to a temp file and rename it over the
+            # old one so a crash mid-write never leaves a truncated metrics file
+            with self._lock:
+                snapshot = dict(self.metrics)
+                snapshot["performance_metrics"] = {key: buffer.to_list() for key, buffer in self.performance.items()}
+                data = json.dumps(snapshot, indent=2)
+                self._pending_events = 0
+            tmp_file = f"{self.metrics_file}.tmp"
+            with open(tmp_file, 'w') as f:
+                f.write(data)
+            os.replace(tmp_file, self.metrics_file)
         except Exception as e:
             logger.error(f"Error saving metrics: {e}")
     
+    def _mark_dirty(self):
+        # called with every event, wakes the flush thread once enough events are buffered
+        self._pending_events += 1
+        if self._pending_events >= self.flush_events:
+            self._flush_requested.set()
+    
+    def _flush_loop(self):
+        while not self._stopping:
+            self._flush_requested.wait(self.flush_interval)
+            self._flush_requested.clear()
+            if self._pending_events:
+                self.save_metrics()
+    
+    def start(self):
+        # start the background flush thread (called from the app lifespan)
+        if self._flush_thread is None:
+            self._stopping = False
+            self._flush_thread = threading.Thread(target=self._flush_loop, name="metrics-flush", daemon=True)
+            self._flush_thread.start()
+    
+    def stop(self):
+        # stop the flush thread and write whatever is still buffered
+        self._stopping = True
+        self._flush_requested.set()
+        if self._flush_thread is not None:
+            self._flush_thread.join(timeout=5)
+            self._flush_thread = None
+        if self._pending_events:
+            self.save_metrics()
+    
     def record_interview_created(self, interview_id: int, title: str):
-        # increment total interview count
-        self.metrics["total_interviews"] += 1
-        # update daily statistics
-        self._update_daily_stats("interviews_created", 1)
+        with self._lock:
+            # increment total interview count
+            self.metrics["total_interviews"] += 1
+            # update daily statistics
+            self._update_daily_stats("interviews_created", 1)
+            self._mark_dirty()
         logger.info(f"📊 Metrics: Interview created - ID: {interview_id}, Title: {title}")
-        self.save_metrics()
     
     def record_analysis_success(self, interview_id: int, processing_time: float, 
                                eye_contact: float, sentiment_score: float, 
                                speech_rate: float, overall_score: float):
-        # increment successful analysis count
-        self.metrics["successful_analyses"] += 1
-        # update total and average processing time
-        self.metrics["total_processing_time"] += processing_time
-        self.metrics["average_processing_time"] = (
-            self.metrics["total_processing_time"] / self.metrics["successful_analyses"]
-        )
+        with self._lock:
+            # increment successful analysis count
+            self.metrics["successful_analyses"] += 1
+            # update total and average processing time
+            self.metrics["total_processing_time"] += processing_time
+            self.metrics["average_processing_time"] = (
+                self.metrics["total_processing_time"] / self.metrics["successful_analyses"]
+            )
         
-        # record performance metrics for analysis
-        self.metrics["performance_metrics"]["eye_contact_scores"].append(eye_contact)
-        self.metrics["performance_metrics"]["sentiment_scores"].append(sentiment_score)
-        self.metrics["performance_metrics"]["speech_rates"].append(speech_rate)
-        self.metrics["performance_metrics"]["overall_scores"].append(overall_score)
+            # record performance metrics for analysis, ring buffers keep the last 100 entries
+            self.performance["eye_contact_scores"].append(eye_contact)
+            self.performance["sentiment_scores"].append(sentiment_score)
+            self.performance["speech_rates"].append(speech_rate)
+            self.performance["overall_scores"].append(overall_score)
+            self._observe_stage("analysis_total", processing_time)
         
-        # keep only last 100 entries to prevent file from growing too large
-        for key in self.metrics["performance_metrics"]:
-            if len(self.metrics["performance_metrics"][key]) > 100:
-                self.metrics["performance_metrics"][key] = self.metrics["performance_metrics"][key][-100:]
+            # update daily statistics
+            self._update_daily_stats("analyses_completed", 1)
+            self._update_daily_stats("total_processing_time", processing_time)
         
-        # update daily statistics
-        self._update_daily_stats("analyses_completed", 1)
-        self._update_daily_stats("total_processing_time", processing_time)
+            self._mark_dirty()
         
         logger.info(f"📊 Metrics: Analysis success - ID: {interview_id}, Time: {processing_time:.2f}s, Score: {overall_score}%")
-        self.save_metrics()
     
     def record_analysis_failure(self, error_type: str, processing_time: float):
-        # increment failed analysis count
-        self.metrics["failed_analyses"] += 1
-        # track error counts by type
-        if error_type not in self.metrics["error_counts"]:
-            self.metrics["error_counts"][error_type] = 0
-        self.metrics["error_counts"][error_type] += 1
+        with self._lock:
+            # increment failed analysis count
+            self.metrics["failed_analyses"] += 1
+            # track error counts by type
+            if error_type not in self.metrics["error_counts"]:
+                self.metrics["error_counts"][error_type] = 0
+            self.metrics["error_counts"][error_type] += 1
+        
+            # update daily statistics
+            self._update_daily_stats("analyses_failed", 1)
         
-        # update daily statistics
-        self._update_daily_stats("analyses_failed", 1)
+            self._mark_dirty()
         
         logger.warning(f"📊 Metrics: Analysis failed - Error: {error_type}, Time: {processing_time:.2f}s")
-        self.save_metrics()
     
     def record_api_request(self, endpoint: str, method: str, status_code: int, processing_time: float):
-        today = datetime.now().strftime("%Y-%m-%d")
-        # initialize daily stats if not exists
-        if today not in self.metrics["daily_stats"]:
-            self.metrics["daily_stats"][today] = {
-                "interviews_created": 0,
-                "analyses_completed": 0,
-                "analyses_failed": 0,
-                "total_processing_time": 0.0,
-                "api_requests": 0,
-                "successful_requests": 0,
-                "failed_requests": 0
-            }
+        with self._lock:
+            today = datetime.now().strftime("%Y-%m-%d")
+            # initialize daily stats if not exists
+            if today not in self.metrics["daily_stats"]:
+                self.metrics["daily_stats"][today] = {
+                    "interviews_created": 0,
+                    "analyses_completed": 0,
+                    "analyses_failed": 0,
+                    "total_processing_time": 0.0,
+                    "api_requests": 0,
+                    "successful_requests": 0,
+                    "failed_requests": 0
+                }
         
-        # increment api request counters
-        self.metrics["daily_stats"][today]["api_requests"] += 1
-        if 200 <= status_code < 400:
-            self.metrics["daily_stats"][today]["successful_requests"] += 1
-        else:
-            self.metrics["daily_stats"][today]["failed_requests"] += 1
+            # latency histogram and server error count per endpoint + method
+            key = f"{method} {endpoint}"
+            if key not in self.request_latency:
+                self.request_latency[key] = LatencyHistogram()
+                self.request_errors[key] = 0
+            self.request_latency[key].observe(processing_time)
+            if status_code >= 500:
+                self.request_errors[key] += 1
+        
+            # increment api request counters
+            self.metrics["daily_stats"][today]["api_requests"] += 1
+            if 200 <= status_code < 400:
+                self.metrics["daily_stats"][today]["successful_requests"] += 1
+            else:
+                self.metrics["daily_stats"][today]["failed_requests"] += 1
+            self._mark_dirty()
+    
+    def record_stage_timing(self, stage: str, processing_time: float):
+        # duration of one analysis stage (eye_contact, transcription, sentiment, ...)
+        with self._lock:
+            self._observe_stage(stage, processing_time)
+    
+    def _observe_stage(self, stage: str, processing_time: float):
+        if stage not in self.stage_latency:
+            self.stage_latency[stage] = LatencyHistogram()
+        self.stage_latency[stage].observe(processing_time)
     
     def _update_daily_stats(self, stat_name: str, value: float):
         today = datetime.now().strftime("%Y-%m-%d")
@@ -151,6 +251,10 @@ class MetricsService:
             self.metrics["daily_stats"][today][stat_name] = value
     
     def get_summary(self) -> Dict:
+        with self._lock:
+            return self._build_summary()
+    
+    def _build_summary(self) -> Dict:
         return {
             "total_interviews": self.metrics["total_interviews"],
             "successful_analyses": self.metrics["successful_analyses"],
@@ -162,9 +266,60 @@ class MetricsService:
             "average_processing_time": self.metrics["average_processing_time"],
             "uptime": self._calculate_uptime(),
             "recent_errors": dict(list(self.metrics["error_counts"].items())[-5:]),  # last 5 errors
-            "today_stats": self._get_today_stats()
+            "today_stats": self._get_today_stats(),
+            "latency": self._latency_summary()
         }
     
+    def _latency_summary(self) -> Dict:
+        # percentiles, throughput and error rate since this process started
+        elapsed = max(time.monotonic() - self._started, 1e-9)
+        endpoints = {}
+        for key, histogram in self.request_latency.items():
+            endpoints[key] = {
+                **histogram.summary(),
+                "throughput_rps": round(histogram.count / elapsed, 4),
+                "error_rate": round(self.request_errors[key] / histogram.count, 4) if histogram.count else 0.0,
+            }
+        stages = {}
+        for stage, histogram in self.stage_latency.items():
+            stages[stage] = {**histogram.summary(), "throughput_per_min": round(histogram.count * 60 / elapsed, 4)}
+        return {"window_seconds": round(elapsed, 1), "endpoints": endpoints, "stages": stages}
+    
+    def export_prometheus(self) -> str:
+        # histograms and counters in the prometheus text exposition format
+        with self._lock:
+            lines = [
+                "# HELP interview_http_request_duration_seconds API request latency.",
+                "# TYPE interview_http_request_duration_seconds histogram",
+            ]
+            for key, histogram in sorted(self.request_latency.items()):
+                method, endpoint = key.split(" ", 1)
+                labels = f'method="{method}",endpoint="{_escape_label(endpoint)}"'
+                lines.extend(_histogram_lines("interview_http_request_duration_seconds", labels, histogram))
+            lines.extend([
+                "# HELP interview_http_request_errors_total API requests that returned a 5xx status.",
+                "# TYPE interview_http_request_errors_total counter",
+            ])
+            for key, errors in sorted(self.request_errors.items()):
+                method, endpoint = key.split(" ", 1)
+                lines.append(f'interview_http_request_errors_total{{method="{method}",endpoint="{_escape_label(endpoint)}"}} {errors}')
+            lines.extend([
+                "# HELP interview_stage_duration_seconds Duration of traced analysis stages.",
+                "# TYPE interview_stage_duration_seconds histogram",
+            ])
+            for stage, histogram in sorted(self.stage_latency.items()):
+                lines.extend(_histogram_lines("interview_stage_duration_seconds", f'stage="{_escape_label(stage)}"', histogram))
+            lines.extend([
+                "# HELP interview_analyses_total Completed video analyses by outcome.",
+                "# TYPE interview_analyses_total counter",
+                f'interview_analyses_total{{outcome="success"}} {self.metrics["successful_analyses"]}',
+                f'interview_analyses_total{{outcome="failure"}} {self.metrics["failed_analyses"]}',
+                "# HELP interview_interviews_created_total Interviews created.",
+                "# TYPE interview_interviews_created_total counter",
+                f'interview_interviews_created_total {self.metrics["total_interviews"]}',
+            ])
+        return "\n".join(lines) + "\n"
+
     def _calculate_uptime(self) -> str:
         try:
             # parse startup time and calculate difference
@@ -197,12 +352,15 @@ class MetricsService:
                 continue
         
         # remove old data
-        for date_str in dates_to_remove:
-            del self.metrics["daily_stats"][date_str]
+        with self._lock:
+            for date_str in dates_to_remove:
+                del self.metrics["daily_stats"][date_str]
         
         if dates_to_remove:
             logger.info(f" Cleaned up {len(dates_to_remove)} old daily statistics")
-            self.save_metrics()
+            self._mark_dirty()
 
 # global metrics service instance
-metrics_service = MetricsService() 
\ No newline at end of file
+metrics_service = MetricsService(settings.metrics_path)
+# every finished tracing span becomes a per-stage latency observation
+tracer.add_listener(lambda finished: metrics_service.record_stage_timing(finished.name, finished.duration)) 
\ No newline at end of file
@@ -0,0 +1,221 @@
+# deterministic stand-ins for the model backed ai_analysis functions, used when
+# settings.mock_ai_responses is on - load tests exercise the http, db, cache and metrics layers
+# without vosk, mediapipe or ffmpeg installed
+# same signatures and result shapes as the real functions, the values are derived from the input
+# (file bytes or text) so the same upload always gets the same analysis. every call costs
+# settings.mock_ai_cost_ms, slept or spent spinning the cpu (mock_ai_cost_mode "cpu") so the
+# analysis pool and the event loop feel a realistic load
+import hashlib
+import json
+import logging
+import os
+import time
+from contextlib import nullcontext
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.ai_analysis import AUDIO_SAMPLE_RATE, _eye_contact_result
+from app.services.sentiment import classify_polarity
+from app.services.tracing import span
+from app.services.word_track import WordTrack
+
+logger = logging.getLogger(__name__)
+
+MOCK_FPS = 30.0
+WORDS_PER_SECOND = 2.2
+LIVE_FINAL_SECONDS = 5.0  # a live mock recognizer finalizes an utterance every 5 seconds of audio
+
+_PHRASES = [
+    "in my last role i handled a difficult situation with the team",
+    "the main task was to deliver the project before the deadline",
+    "so the action i took was to split the work into smaller pieces",
+    "um the result was a great launch and a really happy customer",
+    "i learned a lot from that example and i would do it again",
+    "you know it was not easy but we improved the system a lot",
+    "like the database was slow so i fixed the queries",
+    "uh overall i think it was a good experience for everyone",
+]
+
+
+def simulate_cost(fraction: float = 1.0):
+    # stand-in for the model's processing time, fraction scales it for partial work (segments, windows)
+    seconds = max(settings.mock_ai_cost_ms, 0.0) * fraction / 1000.0
+    if seconds <= 0:
+        return
+    if settings.mock_ai_cost_mode == "cpu":
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            pass
+    else:
+        time.sleep(seconds)
+
+
+def _fingerprint(path: str) -> int:
+    # stable per file - size plus the first 64 KB
+    hasher = hashlib.sha256(str(os.path.getsize(path)).encode("utf-8"))
+    with open(path, "rb") as f:
+        hasher.update(f.read(64 * 1024))
+    return int.from_bytes(hasher.digest()[:8], "big")
+
+
+def _media_seconds(path: str) -> float:
+    # 20 to 90 seconds of "recording" per file
+    return 20.0 + _fingerprint(path) % 7000 / 100.0
+
+
+def _words_for(seed: int, start_seconds: float, end_seconds: float) -> WordTrack:
+    # evenly paced words picked from the phrase list, timestamps in [start_seconds, end_seconds)
+    count = int((end_seconds - start_seconds) * WORDS_PER_SECOND)
+    if count <= 0:
+        return WordTrack.empty()
+    rng = np.random.default_rng(seed)
+    words: List[str] = []
+    while len(words) < count:
+        words.extend(_PHRASES[rng.integers(len(_PHRASES))].split())
+    start = start_seconds + np.arange(count) / WORDS_PER_SECOND
+    return WordTrack(words[:count], start, start + 0.8 / WORDS_PER_SECOND, rng.uniform(0.7, 1.0, count))
+
+
+def get_video_frame_info(video_path):
+    return int(_media_seconds(video_path) * MOCK_FPS), MOCK_FPS
+
+
+def analyze_eye_contact_segment(video_path, start_frame=0, end_frame=None, warmup_frames=0, mode=None):
+    mode = mode or settings.eye_contact_mode
+    frame_count, _ = get_video_frame_info(video_path)
+    end_frame = frame_count if end_frame is None else min(end_frame, frame_count)
+    frames = max(end_frame - start_frame, 0)
+    with span("mock_eye_contact", start_frame=start_frame):
+        simulate_cost(frames / frame_count if frame_count else 1.0)
+    # 55 to 95 % eye contact, the same for every segment of a file so merged results match one pass
+    ratio = 0.55 + _fingerprint(video_path) % 41 / 100.0
+    return _eye_contact_result(int(frames * ratio), frames, frames, mode)
+
+
+def analyze_eye_contact(video_path, mode=None):
+    return analyze_eye_contact_segment(video_path, mode=mode)
+
+
+def probe_media_duration(media_path):
+    return _media_seconds(media_path)
+
+
+def decode_audio_pcm(media_path):
+    # silent pcm of the file's mock duration, its length drives the window planning like real audio
+    with span("mock_audio_decode"):
+        simulate_cost(0.1)
+    return bytes(int(_media_seconds(media_path) * AUDIO_SAMPLE_RATE) * 2)
+
+
+def transcribe_pcm_window(pcm, offset_seconds=0.0):
+    seconds = len(pcm) / (2.0 * AUDIO_SAMPLE_RATE)
+    with span("mock_vosk_window", offset_seconds=offset_seconds):
+        simulate_cost(min(seconds / 30.0, 1.0))
+    # seeded by position so overlapping windows agree on the same words
+    return _words_for(int(offset_seconds * 1000), offset_seconds, offset_seconds + seconds)
+
+
+def transcribe_media_stream(media_path):
+    duration_seconds = _media_seconds(media_path)
+    with span("mock_transcription"):
+        simulate_cost()
+    word_track = _words_for(_fingerprint(media_path), 0.0, duration_seconds)
+    return {"transcript": word_track.text, "word_track": word_track, "duration_seconds": duration_seconds}
+
+
+def transcribe_audio(file_path):
+    return transcribe_media_stream(file_path)
+
+
+class MockLiveRecognizer:
+    # KaldiRecognizer stand-in for live sessions - the words follow the audio fed so far, a final
+    # result every LIVE_FINAL_SECONDS and partials in between, in vosk's json format
+    def __init__(self, sample_rate: int = AUDIO_SAMPLE_RATE):
+        self.sample_rate = sample_rate
+        self.audio_bytes = 0
+        self.finalized_seconds = 0.0
+
+    def _seconds(self) -> float:
+        return self.audio_bytes / (2.0 * self.sample_rate)
+
+    def _pending(self) -> WordTrack:
+        # seeded by position like transcribe_pcm_window, so a partial is a prefix of the final result
+        start = self.finalized_seconds
+        return _words_for(int(start * 1000), start, self._seconds())
+
+    def _finalize(self) -> str:
+        track = self._pending()
+        self.finalized_seconds = self._seconds()
+        return json.dumps({
+            "text": track.text,
+            "result": [
+                {"word": word, "start": float(begin), "end": float(end), "conf": float(conf)}
+                for word, begin, end, conf in zip(track.words, track.start, track.end, track.conf)
+            ],
+        })
+
+    def AcceptWaveform(self, pcm: bytes) -> bool:
+        self.audio_bytes += len(pcm)
+        with span("mock_live_audio"):
+            simulate_cost(min(len(pcm) / (2.0 * self.sample_rate) / 30.0, 1.0))
+        return self._seconds() - self.finalized_seconds >= LIVE_FINAL_SECONDS
+
+    def Result(self) -> str:
+        return self._finalize()
+
+    def PartialResult(self) -> str:
+        return json.dumps({"partial": self._pending().text})
+
+    def FinalResult(self) -> str:
+        return self._finalize()
+
+
+def create_live_recognizer(sample_rate=AUDIO_SAMPLE_RATE):
+    return MockLiveRecognizer(sample_rate)
+
+
+def live_face_mesh():
+    # nothing to borrow, check_live_frame never looks at it
+    return nullcontext(None)
+
+
+def check_live_frame(face_mesh, image, roi=None):
+    if not image:
+        return None
+    with span("mock_live_frame"):
+        simulate_cost(1.0 / MOCK_FPS)
+    # derived from the frame bytes, about 3 of 4 frames count as eye contact
+    seed = int.from_bytes(hashlib.sha256(image).digest()[:8], "big")
+    return True, seed % 4 != 0, None
+
+
+def _text_sentiment(text: str) -> Dict:
+    seed = int.from_bytes(hashlib.sha256((text or "").encode("utf-8")).digest()[:8], "big")
+    polarity = -0.3 + seed % 1100 / 1000.0  # -0.3 to 0.8
+    return {
+        "sentiment": classify_polarity(polarity),
+        "polarity": polarity,
+        "subjectivity": 0.3 + seed % 500 / 1000.0,
+    }
+
+
+def analyze_sentiment(text, word_track: Optional[WordTrack] = None):
+    with span("mock_sentiment", transcript_chars=len(text)):
+        simulate_cost(0.1)
+    result = _text_sentiment(text)
+    if word_track is not None and len(word_track):
+        segment = settings.sentiment_segment_seconds
+        result["timeline"] = [
+            {"start": round(start, 2), "end": round(min(start + segment, word_track.duration), 2),
+             "polarity": result["polarity"], "subjectivity": result["subjectivity"]}
+            for start in np.arange(0.0, word_track.duration, segment).tolist()
+        ]
+    return result
+
+
+def analyze_sentiment_batch(texts):
+    with span("mock_sentiment_batch", texts=len(texts)):
+        simulate_cost(0.1)
+    return [_text_sentiment(text) for text in texts]
@@ -0,0 +1,123 @@
+# model registry - loads the heavy ai libraries and models lazily on first use
+# importing ai_analysis no longer pays for vosk / mediapipe / opencv / the sentiment lexicon,
+# so process start, test runs and --reload cycles can answer /health right away
+import importlib
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _load_vosk_model():
+    from vosk import Model
+    return Model(settings.vosk_model_path)
+
+
+def _load_sentiment_lexicon():
+    # textblob's adjective lexicon compiled into numpy arrays (see app/services/sentiment.py)
+    from app.services.sentiment import load_textblob_lexicon
+    return load_textblob_lexicon()
+
+
+class ModelRegistry:
+    def __init__(self):
+        # name -> loader, every loader runs at most once per process
+        self._loaders: Dict[str, Callable[[], Any]] = {
+            "cv2": lambda: importlib.import_module("cv2"),
+            "mediapipe": lambda: importlib.import_module("mediapipe"),
+            "sentiment": _load_sentiment_lexicon,
+            "vosk": _load_vosk_model,
+        }
+        self._models: Dict[str, Any] = {}
+        self._load_seconds: Dict[str, float] = {}
+        self._errors: Dict[str, str] = {}
+        self._locks: Dict[str, threading.Lock] = {name: threading.Lock() for name in self._loaders}
+        # idle face mesh instances per static_image_mode, reused between videos instead of rebuilding the graph
+        self._face_meshes: Dict[bool, List[Any]] = {False: [], True: []}
+        self._face_mesh_lock = threading.Lock()
+        self._warmup_thread: Optional[threading.Thread] = None
+
+    def get(self, name: str) -> Any:
+        # return the loaded model, loading it now if this is the first use
+        if name in self._models:
+            return self._models[name]
+        with self._locks[name]:
+            if name not in self._models:
+                start = time.perf_counter()
+                try:
+                    self._models[name] = self._loaders[name]()
+                except Exception as e:
+                    self._errors[name] = str(e)
+                    logger.error(f"Failed to load {name}: {e}")
+                    raise
+                self._load_seconds[name] = time.perf_counter() - start
+                self._errors.pop(name, None)
+                logger.info(f"Loaded {name} in {self._load_seconds[name]:.2f}s")
+        return self._models[name]
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._models
+
+    @contextmanager
+    def face_mesh(self, static_image_mode: bool = False):
+        # borrow a face mesh from the pool, tracking state is reset before it goes back
+        # tracking mode (static_image_mode False) assumes consecutive full frames of the same size,
+        # sampled frames and face crops that change size every frame need static_image_mode True
+        with self._face_mesh_lock:
+            idle = self._face_meshes[static_image_mode]
+            face_mesh = idle.pop() if idle else None
+        if face_mesh is None:
+            mp = self.get("mediapipe")
+            face_mesh = mp.solutions.face_mesh.FaceMesh(
+                static_image_mode=static_image_mode, max_num_faces=1,
+                min_detection_confidence=0.5, min_tracking_confidence=0.5
+            )
+        try:
+            yield face_mesh
+        except BaseException:
+            # don't return a mesh that may be in a broken state
+            face_mesh.close()
+            raise
+        reset = getattr(face_mesh, "reset", None)
+        if reset is not None:
+            reset()
+        with self._face_mesh_lock:
+            self._face_meshes[static_image_mode].append(face_mesh)
+
+    def warm_up(self, names: Optional[List[str]] = None) -> Dict:
+        # load everything now instead of on the first request, errors are recorded not raised
+        for name in names or list(self._loaders):
+            try:
+                self.get(name)
+            except Exception:
+                continue
+        return self.status()
+
+    def start_background_warm_up(self):
+        # warm up in a daemon thread so startup doesn't wait for the models
+        if self._warmup_thread is None:
+            self._warmup_thread = threading.Thread(target=self.warm_up, name="model-warmup", daemon=True)
+            self._warmup_thread.start()
+
+    def status(self) -> Dict:
+        return {
+            "ready": all(name in self._models for name in self._loaders),
+            "warming_up": bool(self._warmup_thread and self._warmup_thread.is_alive()),
+            "models": {
+                name: {
+                    "loaded": name in self._models,
+                    "load_seconds": round(self._load_seconds[name], 3) if name in self._load_seconds else None,
+                    "error": self._errors.get(name),
+                }
+                for name in self._loaders
+            },
+        }
+
+
+# global model registry instance (one per process, pool workers get their own)
+model_registry = ModelRegistry()
@@ -0,0 +1,342 @@
+# video analysis pipeline - runs the ai_analysis stages as a small dependency graph
+#
+#   upload -> vision branch (eye contact) -----------------------\
+#          -> audio branch (ffmpeg | vosk -> sentiment) ---------+-> scoring + tips
+#
+# the two branches only share the input file so they run concurrently and
+# the end to end latency is roughly the slower branch instead of the sum of both
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.services.ai_analysis import (
+    AUDIO_SAMPLE_RATE,
+    analyze_speech,
+    calculate_overall_score,
+    calculate_speech_rate,
+    count_filler_words,
+    generate_interview_tips,
+    merge_eye_contact_segments,
+    plan_eye_contact_segments,
+    plan_transcription_windows,
+    stitch_transcription_windows,
+)
+# the model backed stages, or their deterministic stubs for load testing without models / ffmpeg
+if settings.mock_ai_responses:
+    from app.services.mock_analysis import (
+        analyze_eye_contact,
+        analyze_eye_contact_segment,
+        analyze_sentiment,
+        analyze_sentiment_batch,
+        decode_audio_pcm,
+        get_video_frame_info,
+        probe_media_duration,
+        transcribe_media_stream,
+        transcribe_pcm_window,
+    )
+else:
+    from app.services.ai_analysis import (
+        analyze_eye_contact,
+        analyze_eye_contact_segment,
+        analyze_sentiment,
+        analyze_sentiment_batch,
+        decode_audio_pcm,
+        get_video_frame_info,
+        probe_media_duration,
+        transcribe_media_stream,
+        transcribe_pcm_window,
+    )
+from app.services.analysis_executor import analysis_executor
+from app.services.text_analytics import analyze_text
+from app.services.tracing import span
+from app.services.word_track import WordTrack
+from app.services.response_cache import response_cache
+from app.services.result_cache import cache_key, result_cache
+from app.models.interview import Interview
+
+logger = logging.getLogger(__name__)
+
+# stages reported to progress callbacks, in the order they usually finish
+PIPELINE_STAGES = ["eye_contact", "transcription", "sentiment", "scoring"]
+
+# progress(stage, state) is awaited with state "running" / "completed"
+ProgressCallback = Callable[[str, str], Awaitable[None]]
+
+
+async def _report(progress: Optional[ProgressCallback], stage: str, state: str):
+    if progress is not None:
+        await progress(stage, state)
+
+
+class AnalysisError(Exception):
+    # raised when a pipeline stage fails, stage is used as the metrics error type
+    def __init__(self, stage: str, detail: str):
+        super().__init__(detail)
+        self.stage = stage
+        self.detail = detail
+
+
+async def run_vision_branch(video_path: str, progress: Optional[ProgressCallback] = None) -> Dict:
+    # eye contact analysis using mediapipe face mesh
+    branch_start = time.time()
+    await _report(progress, "eye_contact", "running")
+    logger.info("Starting eye contact analysis...")
+    with span("eye_contact") as stage_span:
+        segments = []
+        if settings.eye_contact_segmented:
+            frame_count, fps = await analysis_executor.run(get_video_frame_info, video_path)
+            segments = plan_eye_contact_segments(frame_count, fps, analysis_executor.max_workers)
+        if segments:
+            # long video - every worker seeks to its own range and the counts are merged
+            logger.info(f"Analyzing eye contact in {len(segments)} parallel segments")
+            segment_results = await asyncio.gather(*[
+                analysis_executor.run(analyze_eye_contact_segment, video_path, start, end, warmup)
+                for start, end, warmup in segments
+            ])
+            eye_contact = merge_eye_contact_segments(segment_results)
+        else:
+            eye_contact = await analysis_executor.run(analyze_eye_contact, video_path)
+        stage_span.set(
+            segments=len(segments) or 1,
+            frames_processed=(eye_contact or {}).get("sampled_frames", 0),
+            frames_total=(eye_contact or {}).get("total_frames", 0),
+        )
+    if not eye_contact or 'eye_contact_percentage' not in eye_contact:
+        logger.error("Eye contact analysis failed.")
+        raise AnalysisError("eye_contact_analysis", "Eye contact analysis failed.")
+    logger.info(f"Eye contact analysis completed: {eye_contact.get('eye_contact_percentage', 0)}% (took {time.time() - branch_start:.2f}s)")
+    await _report(progress, "eye_contact", "completed")
+    return eye_contact
+
+
+async def transcribe_parallel(media_path: str) -> Optional[Dict]:
+    # the route is picked from the container duration before anything is decoded: long audio is
+    # decoded once and its overlapping windows transcribed across the pool, short audio (or a file
+    # without a duration in its header) is streamed through one recognizer like the sequential path
+    probed_seconds = await analysis_executor.run(probe_media_duration, media_path)
+    if probed_seconds is None or probed_seconds < settings.transcription_parallel_min_seconds:
+        return await analysis_executor.run(transcribe_media_stream, media_path)
+    pcm = await analysis_executor.run(decode_audio_pcm, media_path)
+    if pcm is None:
+        return None
+    duration_seconds = len(pcm) / (2.0 * AUDIO_SAMPLE_RATE)
+    windows = plan_transcription_windows(
+        len(pcm), settings.transcription_window_seconds, settings.transcription_overlap_seconds
+    )
+    logger.info(f"Transcribing {duration_seconds:.1f}s of audio in {len(windows)} parallel windows")
+    window_tracks = await asyncio.gather(*[
+        analysis_executor.run(transcribe_pcm_window, pcm[start:end], offset)
+        for start, end, offset in windows
+    ])
+    word_track = stitch_transcription_windows(window_tracks, windows)
+    return {
+        "transcript": word_track.text,
+        "word_track": word_track,
+        "duration_seconds": duration_seconds,
+    }
+
+
+async def run_audio_branch(video_path: str, progress: Optional[ProgressCallback] = None) -> Dict:
+    # ffmpeg decoded pcm piped into vosk -> sentiment analysis
+    branch_start = time.time()
+    await _report(progress, "transcription", "running")
+    logger.info("Starting transcription...")
+    with span("transcription") as stage_span:
+        if settings.transcription_parallel and analysis_executor.max_workers > 1:
+            transcription = await transcribe_parallel(video_path)
+        else:
+            transcription = await analysis_executor.run(transcribe_media_stream, video_path)
+        if transcription is not None:
+            stage_span.set(
+                audio_seconds=round(transcription["duration_seconds"], 2),
+                transcript_chars=len(transcription["transcript"]),
+            )
+    if transcription is None:
+        logger.error("Audio extraction failed (ffmpeg required)")
+        raise AnalysisError("audio_extraction", "Audio extraction failed (ffmpeg required)")
+    transcript = transcription["transcript"]
+    duration_seconds = transcription["duration_seconds"]
+    if not transcript:
+        logger.error("Transcription failed.")
+        raise AnalysisError("transcription", "Transcription failed.")
+    logger.info(f"Transcription completed: {len(transcript)} characters, {duration_seconds:.1f}s of audio")
+    await _report(progress, "transcription", "completed")
+
+    # overall sentiment and its timeline over the answer from the lexicon engine
+    logger.info("Starting sentiment analysis...")
+    await _report(progress, "sentiment", "running")
+    with span("sentiment", transcript_chars=len(transcript)):
+        sentiment = await analysis_executor.run(analyze_sentiment, transcript, transcription["word_track"])
+    if not sentiment or 'polarity' not in sentiment:
+        logger.error("Sentiment analysis failed.")
+        raise AnalysisError("sentiment_analysis", "Sentiment analysis failed.")
+    logger.info(f"Sentiment analysis completed: {sentiment.get('sentiment', 'unknown')} (audio branch took {time.time() - branch_start:.2f}s)")
+    await _report(progress, "sentiment", "completed")
+
+    return {
+        "transcript": transcript,
+        "word_track": transcription["word_track"],
+        "sentiment": sentiment,
+        "duration_seconds": duration_seconds,
+    }
+
+
+async def analyze_video(
+    video_path: str,
+    question: str,
+    question_type: str,
+    progress: Optional[ProgressCallback] = None,
+    content_hash: Optional[str] = None,
+) -> Dict:
+    # identical uploads (same content hash, question and analyzer settings) come from the cache
+    key = None
+    if settings.result_cache_enabled and content_hash:
+        key = cache_key(content_hash, question, question_type)
+        cached = await result_cache.get(key)
+        if cached is not None:
+            logger.info(f"Analysis cache hit for upload {content_hash[:12]}, skipping media stages")
+            for stage in PIPELINE_STAGES:
+                await _report(progress, stage, "completed")
+            return cached
+
+    # run both branches in parallel and join them before scoring
+    vision = asyncio.ensure_future(run_vision_branch(video_path, progress))
+    audio = asyncio.ensure_future(run_audio_branch(video_path, progress))
+    try:
+        eye_contact, audio_result = await asyncio.gather(vision, audio)
+    except BaseException:
+        # one branch failed - don't leave the other one queued in the pool
+        for task in (vision, audio):
+            task.cancel()
+        raise
+
+    transcript = audio_result["transcript"]
+    sentiment = audio_result["sentiment"]
+    word_track = audio_result["word_track"]
+    # the decoded audio length, the last word's end time if the decoder reported nothing
+    duration_seconds = audio_result["duration_seconds"] or word_track.duration
+
+    logger.info("Calculating performance metrics...")
+    await _report(progress, "scoring", "running")
+    analysis = score_analysis(
+        eye_contact, transcript, word_track, sentiment, duration_seconds, question, question_type
+    )
+    await _report(progress, "scoring", "completed")
+    if key is not None:
+        await result_cache.put(key, analysis)
+    return analysis
+
+
+def score_analysis(eye_contact: Dict, transcript: str, word_track: WordTrack, sentiment: Dict,
+                   duration_seconds: float, question: str, question_type: str) -> Dict:
+    # final scoring shared by uploads and live sessions, cheap enough to run on the event loop
+    with span("scoring", transcript_chars=len(transcript)):
+        # one tokenization pass shared by speech rate, filler count and tips
+        text = analyze_text(transcript, question)
+        speech_rate = calculate_speech_rate(transcript, duration_seconds, text)
+        filler_word_count = count_filler_words(transcript, text)
+        # pace curve, pauses and filler timings straight from the word timestamps
+        speech = analyze_speech(word_track, duration_seconds)
+        overall_score = calculate_overall_score(
+            eye_contact.get("eye_contact_percentage", 0),
+            sentiment.get("polarity", 0),
+            speech_rate,
+            filler_word_count
+        )
+        # helper method to generate interview tips
+        ai_feedback = generate_interview_tips(eye_contact, sentiment, transcript, question_type, question, text)
+    logger.info(f"Performance metrics calculated - Score: {overall_score}%, Speech Rate: {speech_rate:.1f} wpm, Fillers: {filler_word_count}")
+
+    return {
+        "eye_contact": eye_contact,
+        "transcript": transcript,
+        "words": word_track.to_dict(),
+        "speech": speech,
+        "sentiment": sentiment,
+        "duration_seconds": duration_seconds,
+        "speech_rate": speech_rate,
+        "filler_word_count": filler_word_count,
+        "overall_score": overall_score,
+        "ai_feedback": ai_feedback,
+    }
+
+
+def build_interview(video_path: Optional[str], question: str, question_type: str, analysis: Dict) -> Interview:
+    # interview row for a finished analysis, the caller adds and commits it
+    sentiment = analysis["sentiment"]
+    return Interview(
+        title=question[:100] if question else "Interview",
+        interview_type=question_type or "general",
+        status="completed",
+        video_file_path=video_path,
+        audio_file_path=None,  # audio is streamed from the video, no wav is kept
+        duration_seconds=int(analysis["duration_seconds"]),
+        transcript=analysis["transcript"],
+        sentiment_score=sentiment.get("polarity", 0),
+        confidence_score=sentiment.get("subjectivity", 0),
+        eye_contact_score=analysis["eye_contact"].get("eye_contact_percentage", 0),
+        speech_rate=analysis["speech_rate"],
+        filler_word_count=analysis["filler_word_count"],
+        ai_feedback=json.dumps(analysis["ai_feedback"]),
+        improvement_suggestions="", # empty for now
+        overall_score=analysis["overall_score"],
+        completed_at=datetime.utcnow()
+    )
+
+
+def _rescored_overall(row, polarity: float) -> Optional[float]:
+    # overall score from the stored metrics with the new polarity, rows that never had one keep None
+    if row.overall_score is None:
+        return None
+    return calculate_overall_score(row.eye_contact_score or 0, polarity, row.speech_rate or 0, row.filler_word_count or 0)
+
+
+async def rescore_sentiment(db: AsyncSession, batch_size: int = 500) -> int:
+    # re-score every stored transcript in id order, one vectorized batch per pool task
+    # the overall score is recomputed in the same update and cached responses are dropped
+    rescored = 0
+    last_id = 0
+    while True:
+        result = await db.execute(
+            select(Interview.id, Interview.transcript, Interview.eye_contact_score, Interview.speech_rate,
+                   Interview.filler_word_count, Interview.overall_score)
+            .where(Interview.id > last_id, Interview.transcript.isnot(None))
+            .order_by(Interview.id)
+            .limit(batch_size)
+        )
+        rows = result.all()
+        if not rows:
+            return rescored
+        scores = await analysis_executor.run(analyze_sentiment_batch, [row.transcript for row in rows])
+        await db.execute(update(Interview), [
+            {"id": row.id, "sentiment_score": score["polarity"], "confidence_score": score["subjectivity"],
+             "overall_score": _rescored_overall(row, score["polarity"])}
+            for row, score in zip(rows, scores)
+        ])
+        await db.commit()
+        for row in rows:
+            response_cache.invalidate(row.id)
+        rescored += len(rows)
+        last_id = rows[-1].id
+
+
+def build_response(interview_id: int, analysis: Dict) -> Dict:
+    # analysis results in the shape the frontend expects
+    return {
+        "id": interview_id,
+        "eye_contact": analysis["eye_contact"],
+        "transcript": analysis["transcript"],
+        "sentiment": analysis["sentiment"],
+        "speech_rate": analysis["speech_rate"],
+        "filler_word_count": analysis["filler_word_count"],
+        "overall_score": analysis["overall_score"],
+        "ai_feedback": analysis["ai_feedback"],
+        "speech": analysis.get("speech"),
+    }
@@ -0,0 +1,63 @@
+# in-process cache of serialized GET responses for single interviews
+# the frontend polls /interviews/{id} and /{id}/analysis after an upload, a hit skips the
+# database round trip and the json parse of the stored analysis blob
+# entries are keyed by (view, interview id) and dropped whenever that interview is written or deleted
+import hashlib
+import json
+from typing import Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.services.lru_cache import LRUCache
+
+VIEWS = ("interview", "analysis")
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    # If-None-Match holds a list of (possibly weak) etags or *
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class ResponseCache:
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.entries = LRUCache(max_entries, ttl_seconds)
+        self.invalidations = 0
+
+    def get(self, view: str, interview_id: int) -> Optional[Tuple[str, bytes]]:
+        if not settings.response_cache_enabled:
+            return None
+        return self.entries.get((view, interview_id))
+
+    def put(self, view: str, interview_id: int, payload: Dict) -> Tuple[str, bytes]:
+        # serialize once, the same bytes are served to every later hit
+        body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        entry = (make_etag(body), body)
+        if settings.response_cache_enabled:
+            self.entries.put((view, interview_id), entry)
+        return entry
+
+    def invalidate(self, interview_id: int):
+        for view in VIEWS:
+            self.entries.pop((view, interview_id))
+        self.invalidations += 1
+
+    def stats(self) -> Dict:
+        return {
+            "enabled": settings.response_cache_enabled,
+            "ttl_seconds": self.entries.ttl_seconds,
+            "invalidations": self.invalidations,
+            **self.entries.stats(),
+        }
+
+
+# global response cache instance
+response_cache = ResponseCache(settings.response_cache_entries, settings.response_cache_ttl_seconds)
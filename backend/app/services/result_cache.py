@@ -0,0 +1,185 @@
+# content addressed cache of analysis results - re-uploads of the same recording
+# (retries after timeouts, frontend re-submits) skip mediapipe + ffmpeg + vosk entirely
+# results live on disk as json files with a bounded in-memory lru in front,
+# the disk side is evicted by total size and by age
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from app.core.config import settings
+from app.services.ai_analysis import ANALYZER_VERSIONS
+from app.services.analysis_executor import analysis_executor
+from app.services.lru_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+
+def analysis_parameters() -> Dict:
+    # settings that change the analysis output, part of the cache key
+    parameters = {
+        "eye_contact_mode": settings.eye_contact_mode,
+        "eye_contact_sample_fps": settings.eye_contact_sample_fps,
+        "eye_contact_max_width": settings.eye_contact_max_width,
+        "eye_contact_roi_margin": settings.eye_contact_roi_margin,
+        "vosk_model_path": settings.vosk_model_path,
+        # long audio is transcribed in stitched windows when the pool has more than one worker,
+        # the words around a seam can differ from a single streamed pass
+        "transcription_parallel": settings.transcription_parallel,
+        "transcription_parallel_workers": analysis_executor.max_workers > 1,
+        "transcription_window_seconds": settings.transcription_window_seconds,
+        "transcription_overlap_seconds": settings.transcription_overlap_seconds,
+        "transcription_parallel_min_seconds": settings.transcription_parallel_min_seconds,
+        "sentiment_segment_seconds": settings.sentiment_segment_seconds,
+        "pace_window_seconds": settings.pace_window_seconds,
+        "pace_step_seconds": settings.pace_step_seconds,
+        "pause_min_seconds": settings.pause_min_seconds,
+        "long_pause_seconds": settings.long_pause_seconds,
+    }
+    # stub results must never be served to a real analysis (only added when on so existing keys stay valid)
+    if settings.mock_ai_responses:
+        parameters["mock_ai_responses"] = True
+    return parameters
+
+
+def cache_key(content_hash: str, question: str, question_type: str) -> str:
+    key_data = {
+        "content": content_hash,
+        "versions": ANALYZER_VERSIONS,
+        "parameters": analysis_parameters(),
+        "question": question,
+        "question_type": question_type,
+    }
+    return hashlib.sha256(json.dumps(key_data, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    def __init__(self, cache_dir: str, memory_entries: int, max_bytes: int, max_age_seconds: int):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.memory = LRUCache(memory_entries)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # key -> (size, mtime) of the files on disk, built on first use
+        self._index: Optional[Dict[str, tuple]] = None
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> str:
+        # shard by key prefix so no single directory gets huge
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def _load_index(self) -> Dict[str, tuple]:
+        if self._index is None:
+            index = {}
+            if os.path.isdir(self.cache_dir):
+                for root, _, files in os.walk(self.cache_dir):
+                    for name in files:
+                        if name.endswith(".json"):
+                            stat = os.stat(os.path.join(root, name))
+                            index[name[:-5]] = (stat.st_size, stat.st_mtime)
+            self._index = index
+        return self._index
+
+    def _remove(self, key: str):
+        self._load_index().pop(key, None)
+        self.memory.pop(key)
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def _evict(self):
+        # drop expired entries, then the oldest until the cache fits in max_bytes
+        index = self._load_index()
+        cutoff = time.time() - self.max_age_seconds
+        for key in [k for k, (_, mtime) in index.items() if mtime < cutoff]:
+            self._remove(key)
+            self.evictions += 1
+        total = sum(size for size, _ in index.values())
+        if total > self.max_bytes:
+            for key, (size, _) in sorted(index.items(), key=lambda item: item[1][1]):
+                self._remove(key)
+                self.evictions += 1
+                total -= size
+                if total <= self.max_bytes:
+                    break
+
+    def get_sync(self, key: str) -> Optional[Dict]:
+        # the age limit holds for both tiers, a memory hit is checked against its file's mtime
+        result = self.memory.get(key)
+        with self._lock:
+            entry = self._load_index().get(key)
+            if entry is None or entry[1] < time.time() - self.max_age_seconds:
+                if entry is not None:
+                    self._remove(key)
+                    self.evictions += 1
+                else:
+                    self.memory.pop(key)
+                self.misses += 1
+                return None
+            if result is None:
+                try:
+                    with open(self._path(key), "r") as f:
+                        result = json.load(f)
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Dropping unreadable cache entry {key}: {e}")
+                    self._remove(key)
+                    self.misses += 1
+                    return None
+                self.memory.put(key, result)
+        self.hits += 1
+        return result
+
+    def put_sync(self, key: str, result: Dict):
+        self.memory.put(key, result)
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(result, f)
+        # atomic rename so readers never see a partial file
+        os.replace(tmp_path, path)
+        stat = os.stat(path)
+        with self._lock:
+            self._load_index()[key] = (stat.st_size, stat.st_mtime)
+            self._evict()
+
+    async def get(self, key: str) -> Optional[Dict]:
+        # disk reads happen in a thread so the event loop is not blocked
+        return await asyncio.to_thread(self.get_sync, key)
+
+    async def put(self, key: str, result: Dict):
+        try:
+            await asyncio.to_thread(self.put_sync, key, result)
+        except Exception as e:
+            # a failed cache write must never fail the analysis
+            logger.error(f"Failed to write analysis cache entry: {e}")
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        index = self._index or {}
+        return {
+            "enabled": settings.result_cache_enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "disk_entries": len(index),
+            "disk_bytes": sum(size for size, _ in index.values()),
+            "memory": self.memory.stats(),
+        }
+
+
+# global analysis result cache instance
+result_cache = ResultCache(
+    settings.result_cache_dir,
+    settings.result_cache_memory_entries,
+    settings.result_cache_max_bytes,
+    settings.result_cache_max_age_seconds,
+)
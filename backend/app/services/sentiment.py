@@ -0,0 +1,234 @@
+# lexicon based sentiment engine - scores many texts (or many segments of one text) at once
+# uses the adjective lexicon textblob ships (en-sentiment.xml), textblob's tokenizer and its rules
+# for modifiers ("very good"), negations ("not good") and exclamation marks ("good!"), but every
+# token is looked up once and the rules and per-text averages are computed over whole numpy arrays
+# instead of building a TextBlob per text. scores match TextBlob(text).sentiment except for
+# emoticons and "(!)" which textblob also scores and transcripts never contain
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+from xml.etree import ElementTree
+
+import numpy as np
+
+NEGATIONS = ("no", "not", "never", "n't")
+EXCLAMATION_BOOST = 1.25
+
+
+def classify_polarity(polarity: float) -> str:
+    # same thresholds the single transcript analysis has always used
+    if polarity > 0.1:
+        return "positive"
+    if polarity < -0.1:
+        return "negative"
+    return "neutral"
+
+
+def tokenize(text: str) -> List[str]:
+    # lowercased tokens exactly as textblob splits them before scoring - punctuation is split from
+    # words and so is every apostrophe ("wasn't" -> was n ' t, "it's" -> it ' s), so textblob's
+    # "n't" negation never fires and this engine doesn't apply it either
+    from textblob.en import tokenize as textblob_tokenize
+    return " ".join(textblob_tokenize(text or "")).lower().split()
+
+
+def textblob_lexicon_path() -> str:
+    import textblob
+    return os.path.join(os.path.dirname(textblob.__file__), "en", "en-sentiment.xml")
+
+
+class SentimentLexicon:
+    def __init__(self, entries: Dict[str, Tuple[float, float, float]], modifiers: Sequence[str]):
+        # word -> row in the score arrays, two extra rows for unknown words and negations
+        self.vocabulary = {word: index for index, word in enumerate(entries)}
+        self.unknown_id = len(entries)
+        self.negation_id = len(entries) + 1
+        size = len(entries) + 2
+        self.polarity = np.zeros(size)
+        self.subjectivity = np.zeros(size)
+        self.intensity = np.ones(size)
+        self.known = np.zeros(size, dtype=bool)
+        self.modifier = np.zeros(size, dtype=bool)
+        self.negation = np.zeros(size, dtype=bool)
+        # textblob only lets an adverb ending in -ly carry a negation over ("really not good")
+        self.ly = np.zeros(size, dtype=bool)
+        for word, index in self.vocabulary.items():
+            self.polarity[index], self.subjectivity[index], self.intensity[index] = entries[word]
+        self.known[:len(entries)] = True
+        for word, index in self.vocabulary.items():
+            self.ly[index] = word.endswith("ly")
+        for word in modifiers:
+            if word in self.vocabulary:
+                self.modifier[self.vocabulary[word]] = True
+        self.negation[self.negation_id] = True
+        for word in NEGATIONS:
+            if word in self.vocabulary:
+                self.negation[self.vocabulary[word]] = True
+
+    @classmethod
+    def from_xml(cls, path: str) -> "SentimentLexicon":
+        # scores are averaged per part of speech and then across them, like textblob does for untagged text
+        senses: Dict[str, Dict[Optional[str], List[Tuple[float, float, float]]]] = {}
+        for element in ElementTree.parse(path).getroot().iter("word"):
+            word = element.attrib.get("form")
+            if not word:
+                continue
+            senses.setdefault(word, {}).setdefault(element.attrib.get("pos"), []).append((
+                float(element.attrib.get("polarity", 0.0)),
+                float(element.attrib.get("subjectivity", 0.0)),
+                float(element.attrib.get("intensity", 1.0)),
+            ))
+        by_pos = {
+            word: {pos: tuple(float(np.mean(values)) for values in zip(*scores)) for pos, scores in tags.items()}
+            for word, tags in senses.items()
+        }
+        entries = {word: tuple(float(np.mean(values)) for values in zip(*tags.values())) for word, tags in by_pos.items()}
+        # adverbs ("very", "really") modify the word that follows them
+        modifiers = {word for word, tags in by_pos.items() if "RB" in tags}
+        # every adjective also scores its adverb ("terrible" -> "terribly"), as textblob adds them
+        for word, tags in by_pos.items():
+            if "JJ" in tags:
+                if word.endswith("y"):
+                    word = word[:-1] + "i"
+                if word.endswith("le"):
+                    word = word[:-2]
+                entries[word + "ly"] = tags["JJ"]
+                modifiers.add(word + "ly")
+        return cls(entries, sorted(modifiers))
+
+    def token_ids(self, tokens: Sequence[str]) -> np.ndarray:
+        vocabulary, unknown, negation = self.vocabulary, self.unknown_id, self.negation_id
+        return np.fromiter(
+            (vocabulary.get(token, negation if token in NEGATIONS else unknown) for token in tokens),
+            dtype=np.int64,
+            count=len(tokens),
+        )
+
+    def score_tokens(self, tokens: Sequence[str], groups: np.ndarray, group_count: int):
+        # tokens: lowercased textblob tokens, groups: which text/segment each token belongs to (non decreasing)
+        # returns per group (polarity, subjectivity, assessment count)
+        # textblob walks the tokens keeping the last modifier and negation it saw, here every token
+        # finds the last known word before it and the state is derived from what lies in between
+        polarity = np.zeros(group_count)
+        subjectivity = np.zeros(group_count)
+        size = len(tokens)
+        if size == 0:
+            return polarity, subjectivity, np.zeros(group_count, dtype=np.int64)
+        ids = self.token_ids(tokens)
+        lengths = np.fromiter((len(token) for token in tokens), dtype=np.int64, count=size)
+        stripped = np.fromiter((len(token.strip("'")) for token in tokens), dtype=np.int64, count=size)
+        exclamation = np.fromiter((token == "!" for token in tokens), dtype=bool, count=size)
+        known = self.known[ids]
+        negation = self.negation[ids]
+        positions = np.arange(size)
+
+        def last_before(mask: np.ndarray) -> np.ndarray:
+            # index of the last masked token strictly before each token, -1 when there is none
+            last = np.maximum.accumulate(np.where(mask, positions, -1))
+            return np.concatenate(([-1], last[:-1]))
+
+        def count_between(mask: np.ndarray, after: np.ndarray) -> np.ndarray:
+            # masked tokens strictly between index after (>= 0) and each token
+            total = np.cumsum(mask)
+            return total - mask - total[after]
+
+        group_start = np.searchsorted(groups, groups, side="left")
+        previous = last_before(known)  # the word that started or extended the latest assessment
+        has_previous = previous >= group_start
+        anchor = np.where(has_previous, previous, 0)
+
+        # a known adverb stays the pending modifier across unknown words of up to 2 letters
+        # ("really is a good"), a negation after an -ly adverb doesn't cancel it ("really not good")
+        after_ly = has_previous & self.ly[ids[anchor]]
+        breaks = ~known & (lengths > 2) & ~(negation & after_ly)
+        modifying = has_previous & self.modifier[ids[anchor]] & (count_between(breaks, anchor) == 0)
+        # "really not": the negation goes to the adverb's assessment right away
+        negates_previous = negation & modifying & after_ly
+
+        # a negation stays pending across unknown words of one letter ("not a good", "n ' t")
+        last_negation = last_before(negation)
+        since_negation = np.where(last_negation >= 0, last_negation, 0)
+        floor = np.where(has_previous, previous, group_start - 1)
+        clears = ~known & ~negation & (stripped > 1)
+        negated_here = (known & (last_negation > floor) & ~negates_previous[since_negation]
+                        & (count_between(clears, since_negation) == 0))
+
+        # a known word after a pending modifier is folded into its assessment ("very good"),
+        # every other known word starts a new one
+        known_index = np.flatnonzero(known)
+        extends = modifying[known_index]
+        assessment = np.cumsum(~extends) - 1
+        assessment_count = int(assessment[-1]) + 1 if known_index.size else 0
+        if assessment_count == 0:
+            return polarity, subjectivity, np.zeros(group_count, dtype=np.int64)
+        rank = np.zeros(size, dtype=np.int64)
+        rank[known_index] = assessment
+        negated = np.bincount(assessment, weights=negated_here[known_index], minlength=assessment_count) > 0
+        flipped = negates_previous & has_previous
+        negated |= np.bincount(rank[previous[flipped]], minlength=assessment_count) > 0
+
+        # the score comes from its last word, scaled by the intensity of the word before it in the
+        # same assessment (inverted when that one was negated, "not very good" is milder than "not good")
+        last = known_index[np.append(assessment[1:] != assessment[:-1], True)]
+        scale = np.ones(assessment_count)
+        chained = modifying[last]
+        before = previous[last[chained]]
+        intensity = self.intensity[ids[before]]
+        scale[chained] = np.where(negated_here[before], 1.0 / intensity, intensity)
+        # every "!" after the last word boosts the assessment by a quarter
+        boosts = np.bincount(previous[exclamation & has_previous], minlength=size)[last]
+        token_polarity = np.clip(self.polarity[ids[last]] * scale * EXCLAMATION_BOOST ** boosts, -1.0, 1.0)
+        token_subjectivity = np.clip(self.subjectivity[ids[last]] * scale, -1.0, 1.0)
+        token_polarity = np.where(negated, -0.5 * token_polarity, token_polarity)
+
+        assessment_groups = groups[last]
+        counts = np.bincount(assessment_groups, minlength=group_count)
+        np.divide(np.bincount(assessment_groups, weights=token_polarity, minlength=group_count), counts,
+                  out=polarity, where=counts > 0)
+        np.divide(np.bincount(assessment_groups, weights=token_subjectivity, minlength=group_count), counts,
+                  out=subjectivity, where=counts > 0)
+        return polarity, subjectivity, counts.astype(np.int64)
+
+    def score_texts(self, texts: Sequence[str]) -> List[Dict]:
+        # many texts in one vectorized pass, e.g. bulk rescoring of stored transcripts
+        token_lists = [tokenize(text) for text in texts]
+        lengths = np.fromiter((len(tokens) for tokens in token_lists), dtype=np.int64, count=len(token_lists))
+        groups = np.repeat(np.arange(len(texts)), lengths)
+        tokens = [token for tokens in token_lists for token in tokens]
+        polarity, subjectivity, _ = self.score_tokens(tokens, groups, len(texts))
+        return [
+            {"sentiment": classify_polarity(p), "polarity": float(p), "subjectivity": float(s)}
+            for p, s in zip(polarity, subjectivity)
+        ]
+
+    def timeline(self, word_track, segment_seconds: float) -> List[Dict]:
+        # polarity per fixed length time segment, built from the vosk word timestamps
+        if not len(word_track) or segment_seconds <= 0:
+            return []
+        groups = np.floor(np.maximum(word_track.start, 0.0) / segment_seconds).astype(np.int64)
+        # vosk words can come back slightly out of order around window boundaries
+        groups = np.maximum.accumulate(groups)
+        group_count = int(groups[-1]) + 1
+        # vosk words are tokenized one by one ("wasn't" -> 4 tokens), each distinct word once
+        cache: Dict[str, List[str]] = {}
+        token_lists = [cache[word] if word in cache else cache.setdefault(word, tokenize(word))
+                       for word in word_track.words]
+        lengths = np.fromiter((len(tokens) for tokens in token_lists), dtype=np.int64, count=len(token_lists))
+        tokens = [token for tokens in token_lists for token in tokens]
+        polarity, subjectivity, counts = self.score_tokens(tokens, np.repeat(groups, lengths), group_count)
+        word_counts = np.bincount(groups, minlength=group_count)
+        end = word_track.duration
+        return [
+            {
+                "start": round(index * segment_seconds, 2),
+                "end": round(min((index + 1) * segment_seconds, max(end, index * segment_seconds)), 2),
+                "polarity": round(float(polarity[index]), 4),
+                "subjectivity": round(float(subjectivity[index]), 4),
+                "words": int(word_counts[index]),
+                "assessed": int(counts[index]),
+            }
+            for index in range(group_count)
+        ]
+
+
+def load_textblob_lexicon() -> SentimentLexicon:
+    return SentimentLexicon.from_xml(textblob_lexicon_path())
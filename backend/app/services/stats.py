@@ -0,0 +1,93 @@
+# fixed size statistics containers used by the metrics service
+# memory per series stays constant no matter how many events are recorded
+import math
+from array import array
+from typing import Dict, Iterable, List
+
+
+class RingBuffer:
+    # last `capacity` float values in a preallocated array, oldest overwritten first
+    def __init__(self, capacity: int, values: Iterable[float] = ()):
+        self.capacity = capacity
+        self._data = array("d", [0.0] * capacity)
+        self._next = 0
+        self._size = 0
+        for value in values:
+            self.append(value)
+
+    def append(self, value: float):
+        self._data[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def to_list(self) -> List[float]:
+        # values in insertion order, oldest first
+        if self._size < self.capacity:
+            return self._data[:self._size].tolist()
+        return (self._data[self._next:] + self._data[:self._next]).tolist()
+
+
+class LatencyHistogram:
+    # log bucketed latency histogram, bucket upper bounds grow by sqrt(2) from 1ms to ~12min
+    BOUNDS = [0.001 * 2 ** (i / 2) for i in range(40)]
+
+    def __init__(self):
+        # one extra bucket for values above the last bound
+        self.counts = array("q", [0] * (len(self.BOUNDS) + 1))
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        seconds = max(seconds, 0.0)
+        if seconds <= self.BOUNDS[0]:
+            index = 0
+        else:
+            # bucket i covers (BOUNDS[i-1], BOUNDS[i]]
+            index = min(math.ceil(2 * math.log2(seconds / 0.001) - 1e-9), len(self.BOUNDS))
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def percentile(self, q: float) -> float:
+        # estimate from the bucket holding the q-th value, interpolated on a log scale
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count and cumulative + bucket_count >= rank:
+                lower = self.BOUNDS[index - 1] if index > 0 else self.min
+                upper = self.BOUNDS[index] if index < len(self.BOUNDS) else self.max
+                fraction = (rank - cumulative) / bucket_count
+                lower = max(lower, self.min, 1e-9)
+                upper = max(min(upper, self.max), lower)
+                return lower * (upper / lower) ** fraction
+            cumulative += bucket_count
+        return self.max
+
+    def cumulative_buckets(self) -> List:
+        # (upper_bound, cumulative_count) pairs, the format prometheus expects
+        buckets = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.BOUNDS, self.counts):
+            cumulative += bucket_count
+            buckets.append((bound, cumulative))
+        return buckets
+
+    def summary(self) -> Dict:
+        return {
+            "count": self.count,
+            "mean": round(self.sum / self.count, 6) if self.count else 0.0,
+            "min": round(self.min, 6) if self.count else 0.0,
+            "max": round(self.max, 6),
+            "p50": round(self.percentile(0.50), 6),
+            "p95": round(self.percentile(0.95), 6),
+            "p99": round(self.percentile(0.99), 6),
+        }
@@ -0,0 +1,237 @@
+# managed media storage under settings.upload_folder
+# every stored file gets a collision free path <shard>/<uuid4 hex><ext> - concurrent uploads of the
+# same filename never overwrite each other and the files are spread over 256 shard directories
+# instead of piling up in one. files kept for an interview are tracked in media_artifacts,
+# intermediates and uploads whose analysis failed are discarded right away, and a periodic garbage
+# collection removes media past the retention age and then the oldest media while over the quota
+# (interviews keep their analysis, only the media paths are cleared). media of queued or running
+# jobs and of interviews that are not completed yet is never collected
+import asyncio
+import logging
+import os
+import time
+import uuid
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from fastapi import UploadFile
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.interview import Interview
+from app.models.media_artifact import MediaArtifact
+from app.services.response_cache import response_cache
+from app.services.uploads import SavedUpload, check_extension, save_upload_stream
+
+logger = logging.getLogger(__name__)
+
+# sqlite allows 999 bound parameters per statement
+_IN_CHUNK = 500
+
+
+class MediaStorage:
+    def __init__(self, root: str, quota_bytes: int, max_age_seconds: float,
+                 gc_interval: float, grace_seconds: float):
+        self.root = root
+        self.quota_bytes = quota_bytes
+        self.max_age_seconds = max_age_seconds
+        self.gc_interval = gc_interval
+        self.grace_seconds = grace_seconds
+        self.last_gc: Optional[Dict] = None
+        self._gc_task: Optional[asyncio.Task] = None
+
+    def new_path(self, filename: Optional[str]) -> str:
+        # only the extension of the client's filename is kept
+        key = uuid.uuid4().hex
+        extension = os.path.splitext(filename or "")[1].lower()
+        shard = os.path.join(self.root, key[:2])
+        os.makedirs(shard, exist_ok=True)
+        return os.path.join(shard, key + extension)
+
+    async def save_upload(self, file: UploadFile) -> SavedUpload:
+        check_extension(file.filename)
+        return await save_upload_stream(file, self.new_path(file.filename))
+
+    def _is_managed(self, path: Optional[str]) -> bool:
+        # never touch anything outside the upload folder, whatever a row says
+        if not path:
+            return False
+        root = os.path.realpath(self.root)
+        return os.path.realpath(path).startswith(root + os.sep)
+
+    def discard(self, path: Optional[str]) -> int:
+        # remove an intermediate or orphaned file, returns the bytes freed
+        if not self._is_managed(path):
+            return 0
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except FileNotFoundError:
+            return 0
+        except OSError as e:
+            logger.error(f"Failed to remove media file {path}: {e}")
+            return 0
+        logger.info(f"Removed media file {path} ({size} bytes)")
+        return size
+
+    def track(self, db: AsyncSession, interview_id: int, kind: str, path: str):
+        # record a file kept for the interview, saved with the caller's transaction
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            size = 0
+        db.add(MediaArtifact(interview_id=interview_id, kind=kind, path=path, size_bytes=size))
+
+    async def delete_interview_media(self, db: AsyncSession, interview: Interview) -> Set[str]:
+        # drops the artifact rows with the caller's transaction and returns every file of the interview -
+        # the caller discards them once the commit went through, so a failed commit leaves the files in place
+        result = await db.execute(select(MediaArtifact.path).where(MediaArtifact.interview_id == interview.id))
+        paths = {path for path in result.scalars().all()}
+        paths.update(path for path in (interview.video_file_path, interview.audio_file_path) if path)
+        await db.execute(delete(MediaArtifact).where(MediaArtifact.interview_id == interview.id))
+        return paths
+
+    async def discard_all(self, paths: Iterable[str]) -> int:
+        # discard off the event loop, returns the bytes freed
+        paths = list(paths)
+        freed = await asyncio.to_thread(lambda: sum(self.discard(path) for path in paths))
+        logger.info(f"Removed {len(paths)} media files ({freed} bytes)")
+        return freed
+
+    def _scan(self) -> List[Tuple[str, int, float]]:
+        # (path, size, mtime) of every file in the root and its shard directories
+        files = []
+        directories = [self.root]
+        while directories:
+            try:
+                entries = list(os.scandir(directories.pop()))
+            except FileNotFoundError:
+                continue
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    directories.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    stat = entry.stat(follow_symlinks=False)
+                    files.append((entry.path, stat.st_size, stat.st_mtime))
+        return files
+
+    def collect_garbage(self, now: Optional[float] = None, in_use: Iterable[str] = ()) -> Dict:
+        # expired files first, then the oldest ones until the folder fits the quota
+        # files younger than the grace period are left alone, they may belong to a running analysis,
+        # and so are the in_use paths whatever their age
+        now = now or time.time()
+        keep = {os.path.realpath(path) for path in in_use}
+        files = self._scan()
+        usage = sum(size for _, size, _ in files)
+        candidates = sorted((f for f in files if now - f[2] >= self.grace_seconds and os.path.realpath(f[0]) not in keep),
+                            key=lambda f: f[2])
+        removed = []
+        freed = 0
+        for path, size, mtime in candidates:
+            expired = self.max_age_seconds > 0 and now - mtime >= self.max_age_seconds
+            if not expired and usage - freed <= self.quota_bytes:
+                # sorted by age, nothing after this one is expired either
+                break
+            self.discard(path)
+            if not os.path.exists(path):
+                removed.append(path)
+                freed += size
+        return {"removed": removed, "freed_bytes": freed, "usage_bytes": usage - freed, "files": len(files) - len(removed)}
+
+    async def _paths_in_use(self) -> Set[str]:
+        # uploads of queued / running jobs and media of interviews that are not completed yet
+        from app.services.jobs import job_manager  # jobs imports this module
+        paths = await job_manager.active_media_paths()
+        async with SessionLocal() as db:
+            result = await db.execute(
+                select(Interview.video_file_path, Interview.audio_file_path).where(Interview.status != "completed")
+            )
+            paths.update(path for row in result.all() for path in row if path)
+            result = await db.execute(
+                select(MediaArtifact.path)
+                .join(Interview, Interview.id == MediaArtifact.interview_id)
+                .where(Interview.status != "completed")
+            )
+            paths.update(result.scalars().all())
+        return paths
+
+    async def _forget(self, paths: List[str]):
+        # clear references to collected files so deletes and responses don't point at missing media
+        affected: Set[int] = set()
+        async with SessionLocal() as db:
+            for start in range(0, len(paths), _IN_CHUNK):
+                chunk = paths[start:start + _IN_CHUNK]
+                result = await db.execute(select(Interview.id).where(
+                    Interview.video_file_path.in_(chunk) | Interview.audio_file_path.in_(chunk)
+                ))
+                affected.update(result.scalars().all())
+                result = await db.execute(select(MediaArtifact.interview_id).where(MediaArtifact.path.in_(chunk)))
+                affected.update(result.scalars().all())
+                await db.execute(update(Interview).where(Interview.video_file_path.in_(chunk)).values(video_file_path=None))
+                await db.execute(update(Interview).where(Interview.audio_file_path.in_(chunk)).values(audio_file_path=None))
+                await db.execute(delete(MediaArtifact).where(MediaArtifact.path.in_(chunk)))
+            await db.commit()
+        # cached responses still carry the old paths
+        for interview_id in affected:
+            response_cache.invalidate(interview_id)
+
+    async def run_garbage_collection(self) -> Dict:
+        start_time = time.time()
+        in_use = await self._paths_in_use()
+        result = await asyncio.to_thread(self.collect_garbage, None, in_use)
+        if result["removed"]:
+            await self._forget(result["removed"])
+        self.last_gc = {
+            "finished_at": time.time(),
+            "removed_files": len(result["removed"]),
+            "freed_bytes": result["freed_bytes"],
+            "usage_bytes": result["usage_bytes"],
+            "files": result["files"],
+            "in_use_files": len(in_use),
+            "seconds": round(time.time() - start_time, 3),
+        }
+        logger.info(f"Media garbage collection removed {len(result['removed'])} files "
+                    f"({result['freed_bytes']} bytes), {result['usage_bytes']} bytes in use")
+        return self.last_gc
+
+    async def _gc_loop(self):
+        while True:
+            try:
+                await self.run_garbage_collection()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Media garbage collection failed: {e}")
+            await asyncio.sleep(self.gc_interval)
+
+    def start(self):
+        if self._gc_task is None and self.gc_interval > 0:
+            self._gc_task = asyncio.create_task(self._gc_loop(), name="media-gc")
+
+    async def stop(self):
+        if self._gc_task is not None:
+            self._gc_task.cancel()
+            try:
+                await self._gc_task
+            except asyncio.CancelledError:
+                pass
+            self._gc_task = None
+
+    def stats(self) -> Dict:
+        return {
+            "root": self.root,
+            "quota_bytes": self.quota_bytes,
+            "max_age_seconds": self.max_age_seconds,
+            "last_gc": self.last_gc,
+        }
+
+
+# global media storage instance
+media_storage = MediaStorage(
+    settings.upload_folder,
+    settings.storage_quota_bytes,
+    settings.storage_max_age_days * 86400,
+    settings.storage_gc_interval_seconds,
+    settings.storage_gc_grace_seconds,
+)
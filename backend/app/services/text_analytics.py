@@ -0,0 +1,65 @@
+# transcript analytics used by scoring and interview tips
+# the transcript is lowercased and tokenized once into a bag of words (token -> count), fillers are
+# counted by one combined precompiled matcher, keyword hits and question overlap are then looked up
+# per distinct word instead of rescanning the text for every keyword
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Optional, Set
+
+FILLER_WORDS = ("um", "uh", "like", "you know", "er", "so")
+STAR_KEYWORDS = ("situation", "task", "action", "result")
+# keywords counted by substring, so "actions" or "examples" still count
+TRACKED_KEYWORDS = STAR_KEYWORDS + ("example",)
+
+_FILLER_PATTERN = re.compile(r"\b(?:" + "|".join(re.escape(filler) for filler in FILLER_WORDS) + r")\b")
+_WORD_PATTERN = re.compile(r"[a-z0-9']+")
+
+
+@lru_cache(maxsize=4096)
+def _keyword_in(token: str) -> Optional[str]:
+    # tracked keyword contained in a token, cached per distinct word across transcripts
+    for keyword in TRACKED_KEYWORDS:
+        if keyword in token:
+            return keyword
+    return None
+
+
+def question_tokens(question: str) -> Set[str]:
+    return set(_WORD_PATTERN.findall(question.lower()))
+
+
+@dataclass
+class TextAnalysis:
+    word_counts: Counter  # lowercase word -> occurrences
+    word_count: int = 0
+    filler_counts: Dict[str, int] = field(default_factory=dict)
+    keyword_counts: Dict[str, int] = field(default_factory=dict)
+    question_overlap: int = 0  # distinct question words that also appear in the answer
+
+    @property
+    def filler_total(self) -> int:
+        return sum(self.filler_counts.values())
+
+    def has_keyword(self, *keywords: str) -> bool:
+        return any(self.keyword_counts.get(keyword) for keyword in keywords)
+
+
+def analyze_text(transcript: str, question: str = "") -> TextAnalysis:
+    lower = (transcript or "").lower()
+    tokens = _WORD_PATTERN.findall(lower)
+    word_counts = Counter(tokens)
+    keywords: Counter = Counter()
+    for word, count in word_counts.items():
+        keyword = _keyword_in(word)
+        if keyword is not None:
+            keywords[keyword] += count
+    overlap = len(question_tokens(question) & word_counts.keys()) if question else 0
+    return TextAnalysis(
+        word_counts,
+        len(tokens),
+        dict(Counter(_FILLER_PATTERN.findall(lower))),
+        dict(keywords),
+        overlap,
+    )
@@ -0,0 +1,123 @@
+# lightweight tracing - nested timing spans with attributes for the analysis pipeline
+#
+#   with span("eye_contact", frames=120) as s:
+#       ...
+#       s.set(eye_contact_frames=80)
+#
+# spans nest through a contextvar so they follow asyncio tasks, spans finished inside
+# analysis pool workers are shipped back with the result and attached to the caller's span.
+# finished root spans are kept in a small ring of recent traces and handed to listeners
+# (the metrics service turns every span into a per-stage latency observation)
+import logging
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Span:
+    def __init__(self, name: str, parent: Optional["Span"] = None, attributes: Optional[Dict] = None):
+        self.name = name
+        self.parent = parent
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.children: List["Span"] = []
+        self.start = time.time()
+        self.duration: Optional[float] = None
+        self._started = time.perf_counter()
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def finish(self):
+        self.duration = time.perf_counter() - self._started
+
+    def walk(self) -> Iterator["Span"]:
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+    def to_dict(self) -> Dict:
+        return {
+            "name": self.name,
+            "start": self.start,
+            "duration": round(self.duration, 6) if self.duration is not None else None,
+            "attributes": self.attributes,
+            "children": [child.to_dict() for child in self.children],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict, parent: Optional["Span"] = None) -> "Span":
+        span = cls(data["name"], parent, data.get("attributes"))
+        span.start = data["start"]
+        span.duration = data["duration"]
+        span.children = [cls.from_dict(child, span) for child in data.get("children", [])]
+        return span
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+class Tracer:
+    def __init__(self, max_traces: int = 50):
+        self.recent: deque = deque(maxlen=max_traces)
+        self._listeners: List[Callable[[Span], None]] = []
+
+    def add_listener(self, listener: Callable[[Span], None]):
+        # called once for every span of every finished trace
+        self._listeners.append(listener)
+
+    def _finish_root(self, root: Span):
+        self.recent.append(root)
+        for span in root.walk():
+            for listener in self._listeners:
+                try:
+                    listener(span)
+                except Exception as e:
+                    logger.error(f"Trace listener failed for span {span.name}: {e}")
+
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator[Span]:
+        parent = _current_span.get()
+        current = Span(name, parent, attributes)
+        if parent is not None:
+            parent.children.append(current)
+        token = _current_span.set(current)
+        try:
+            yield current
+        except BaseException as e:
+            current.set(error=type(e).__name__)
+            raise
+        finally:
+            current.finish()
+            _current_span.reset(token)
+            # detached spans collect worker spans for export, they are not traces of their own
+            if parent is None and not current.attributes.get("_detached"):
+                self._finish_root(current)
+
+    @contextmanager
+    def collect(self) -> Iterator[Span]:
+        # gather the spans opened inside the block without recording them here,
+        # used in pool workers to send spans back to the process that owns the trace
+        with self.span("worker", _detached=True) as container:
+            yield container
+
+    def attach(self, exported: List[Dict]):
+        # re-parent spans exported from a worker under the caller's current span
+        parent = _current_span.get()
+        for data in exported:
+            span = Span.from_dict(data, parent)
+            if parent is not None:
+                parent.children.append(span)
+            else:
+                self._finish_root(span)
+
+    def recent_traces(self, limit: int = 10) -> List[Dict]:
+        return [root.to_dict() for root in list(self.recent)[-limit:]]
+
+
+# global tracer instance
+tracer = Tracer()
+span = tracer.span
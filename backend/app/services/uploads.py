@@ -0,0 +1,166 @@
+# streaming upload handling - copies uploads to disk in fixed size chunks
+# so memory per upload stays constant no matter how large the file is
+import hashlib
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional
+
+import aiofiles
+from fastapi import UploadFile
+
+from app.core.config import settings
+from app.services.metrics import metrics_service
+
+logger = logging.getLogger(__name__)
+
+
+class UploadRejected(Exception):
+    # raised when an upload breaks the size or extension rules
+    # status_code is what the endpoint should answer with (400 / 413)
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+@dataclass
+class SavedUpload:
+    path: str  # where the upload was written
+    size: int  # number of bytes written
+    sha256: str  # content hash computed while streaming
+
+
+def check_extension(filename: Optional[str], allowed_extensions: Optional[Iterable[str]] = None) -> str:
+    # validate the file extension before reading any bytes from the request
+    allowed = [ext.lower() for ext in (allowed_extensions or settings.allowed_extensions)]
+    extension = os.path.splitext(filename or "")[1].lower()
+    if extension not in allowed:
+        raise UploadRejected(400, f"File type '{extension or 'unknown'}' is not allowed")
+    return extension
+
+
+async def save_upload_stream(
+    file: UploadFile,
+    destination: str,
+    max_size: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+) -> SavedUpload:
+    # copy the upload to destination chunk by chunk, hashing on the fly
+    # starlette has already spooled the request body by now (UploadLimitMiddleware caps how much),
+    # max_size is the per file limit inside that body - a file past it is refused and its partial copy removed
+    max_size = max_size or settings.max_file_size
+    chunk_size = chunk_size or settings.upload_chunk_size
+    check_extension(file.filename)
+
+    hasher = hashlib.sha256()
+    size = 0
+    os.makedirs(os.path.dirname(destination) or ".", exist_ok=True)
+    try:
+        async with aiofiles.open(destination, "wb") as out:
+            while True:
+                chunk = await file.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_size:
+                    raise UploadRejected(
+                        413, f"File exceeds maximum upload size of {max_size} bytes"
+                    )
+                hasher.update(chunk)
+                await out.write(chunk)
+    except BaseException:
+        # never leave a half written upload behind
+        if os.path.exists(destination):
+            os.remove(destination)
+        raise
+    finally:
+        await file.close()
+
+    logger.info(f"Streamed upload to {destination} ({size} bytes)")
+    return SavedUpload(path=destination, size=size, sha256=hasher.hexdigest())
+
+
+class _BodyTooLarge(Exception):
+    pass
+
+
+class UploadLimitMiddleware:
+    # pure asgi middleware in front of the upload endpoints - refuses a body past the limit
+    # before starlette spools it to a temp file and parses the form
+    # routes maps a path to how many files one request may carry, the limit is
+    # max_file_size per file plus upload_multipart_slack for boundaries and form fields
+    def __init__(self, app, routes: Dict[str, int]):
+        self.app = app
+        self.routes = routes
+
+    def _limit(self, scope) -> Optional[int]:
+        if scope["type"] != "http" or scope["method"] != "POST":
+            return None
+        files = self.routes.get(scope["path"])
+        if files is None:
+            return None
+        return settings.max_file_size * files + settings.upload_multipart_slack
+
+    async def __call__(self, scope, receive, send):
+        limit = self._limit(scope)
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+        started = time.time()
+
+        # declared size - answer straight away, the body is never read
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                try:
+                    declared = int(value)
+                except ValueError:
+                    declared = 0
+                if declared > limit:
+                    await self._reject(scope, send, limit, started)
+                    return
+
+        # chunked or understated bodies - count the bytes as they arrive and stop at the limit
+        received = 0
+        exceeded = False
+
+        async def limited_receive():
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    exceeded = True
+                    raise _BodyTooLarge()
+            return message
+
+        async def guarded_send(message):
+            # whatever the app answers to the cut off body (fastapi turns it into a 400) is replaced by the 413
+            if not exceeded:
+                await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            if not exceeded:
+                raise
+        if exceeded:
+            await self._reject(scope, send, limit, started)
+
+    async def _reject(self, scope, send, limit: int, started: float):
+        detail = f"Request body exceeds maximum upload size of {limit} bytes"
+        logger.warning(f"Refused upload to {scope['path']}: {detail}")
+        metrics_service.record_api_request(scope["path"], "POST", 413, time.time() - started)
+        body = json.dumps({"detail": detail}).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("ascii")),
+                (b"connection", b"close"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,139 @@
+# compact per word track of a transcription - parallel arrays of words, start / end times and
+# vosk confidences instead of one dict per word
+# duration, the pace curve, pause statistics and filler timings are all derived from the
+# timestamps with numpy, the audio is never read a second time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from app.services.text_analytics import FILLER_WORDS
+
+
+@dataclass
+class WordTrack:
+    words: List[str]
+    start: np.ndarray  # seconds from the start of the recording
+    end: np.ndarray
+    conf: np.ndarray
+
+    @classmethod
+    def empty(cls) -> "WordTrack":
+        return cls([], np.zeros(0), np.zeros(0), np.zeros(0))
+
+    @classmethod
+    def from_vosk(cls, results: Iterable[Dict], offset_seconds: float = 0.0) -> "WordTrack":
+        # vosk results with SetWords(True) carry a "result" list of {"word", "start", "end", "conf"}
+        entries = [entry for result in results for entry in result.get("result", [])]
+        return cls(
+            [entry["word"] for entry in entries],
+            np.fromiter((entry["start"] for entry in entries), dtype=np.float64, count=len(entries)) + offset_seconds,
+            np.fromiter((entry["end"] for entry in entries), dtype=np.float64, count=len(entries)) + offset_seconds,
+            np.fromiter((entry.get("conf", 1.0) for entry in entries), dtype=np.float64, count=len(entries)),
+        )
+
+    @classmethod
+    def concatenate(cls, tracks: Sequence["WordTrack"]) -> "WordTrack":
+        if not tracks:
+            return cls.empty()
+        return cls(
+            [word for track in tracks for word in track.words],
+            np.concatenate([track.start for track in tracks]),
+            np.concatenate([track.end for track in tracks]),
+            np.concatenate([track.conf for track in tracks]),
+        )
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def select(self, mask: np.ndarray) -> "WordTrack":
+        indices = np.flatnonzero(mask)
+        return WordTrack([self.words[i] for i in indices], self.start[indices], self.end[indices], self.conf[indices])
+
+    @property
+    def text(self) -> str:
+        return " ".join(self.words)
+
+    @property
+    def duration(self) -> float:
+        # end of the last recognized word, a lower bound for the audio duration
+        return float(self.end.max()) if len(self) else 0.0
+
+    def to_dict(self) -> Dict:
+        # json friendly form stored with the analysis result
+        return {
+            "words": list(self.words),
+            "start": np.round(self.start, 3).tolist(),
+            "end": np.round(self.end, 3).tolist(),
+            "conf": np.round(self.conf, 3).tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "WordTrack":
+        return cls(
+            list(data["words"]),
+            np.asarray(data["start"], dtype=np.float64),
+            np.asarray(data["end"], dtype=np.float64),
+            np.asarray(data["conf"], dtype=np.float64),
+        )
+
+    def pace_curve(self, window_seconds: float, step_seconds: float, duration: Optional[float] = None) -> List[Dict]:
+        # words per minute in sliding windows, counted by word start time
+        duration = max(duration or 0.0, self.duration)
+        if not len(self) or duration <= 0 or window_seconds <= 0 or step_seconds <= 0:
+            return []
+        window_starts = np.arange(0.0, duration, step_seconds)
+        window_ends = np.minimum(window_starts + window_seconds, duration)
+        starts = np.sort(self.start)
+        counts = np.searchsorted(starts, window_ends, side="left") - np.searchsorted(starts, window_starts, side="left")
+        minutes = np.maximum(window_ends - window_starts, 1e-6) / 60.0
+        wpm = counts / minutes
+        return [
+            {"start": round(float(s), 2), "end": round(float(e), 2), "wpm": round(float(rate), 1)}
+            for s, e, rate in zip(window_starts, window_ends, wpm)
+        ]
+
+    def pause_stats(self, min_pause_seconds: float, long_pause_seconds: float) -> Dict:
+        # silences between consecutive words
+        gaps = self.start[1:] - self.end[:-1] if len(self) > 1 else np.zeros(0)
+        pauses = gaps[gaps >= min_pause_seconds]
+        speaking = float(np.sum(self.end - self.start)) if len(self) else 0.0
+        return {
+            "count": int(pauses.size),
+            "long_count": int(np.count_nonzero(pauses >= long_pause_seconds)),
+            "total_seconds": round(float(pauses.sum()), 2),
+            "mean_seconds": round(float(pauses.mean()), 2) if pauses.size else 0.0,
+            "longest_seconds": round(float(pauses.max()), 2) if pauses.size else 0.0,
+            "speaking_seconds": round(speaking, 2),
+        }
+
+    def filler_times(self, fillers: Sequence[str] = FILLER_WORDS) -> List[Dict]:
+        # when each filler was said, multi word fillers ("you know") span their words
+        if not len(self):
+            return []
+        words = np.array([word.lower() for word in self.words])
+        hits = []
+        for filler in fillers:
+            parts = filler.split()
+            mask = np.ones(len(words) - len(parts) + 1, dtype=bool) if len(words) >= len(parts) else np.zeros(0, dtype=bool)
+            for offset, part in enumerate(parts):
+                mask &= words[offset:len(words) - len(parts) + 1 + offset] == part
+            for index in np.flatnonzero(mask):
+                hits.append({
+                    "word": filler,
+                    "start": round(float(self.start[index]), 2),
+                    "end": round(float(self.end[index + len(parts) - 1]), 2),
+                })
+        hits.sort(key=lambda hit: hit["start"])
+        return hits
+
+    def speech_analytics(self, duration: Optional[float], pace_window_seconds: float, pace_step_seconds: float,
+                         min_pause_seconds: float, long_pause_seconds: float) -> Dict:
+        return {
+            "duration_seconds": round(max(duration or 0.0, self.duration), 2),
+            "word_count": len(self),
+            "mean_confidence": round(float(self.conf.mean()), 3) if len(self) else 0.0,
+            "pace": self.pace_curve(pace_window_seconds, pace_step_seconds, duration),
+            "pauses": self.pause_stats(min_pause_seconds, long_pause_seconds),
+            "fillers": self.filler_times(),
+        }
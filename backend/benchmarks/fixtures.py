@@ -0,0 +1,114 @@
+# deterministic synthetic inputs for the benchmarks - generated offline with numpy, same seed same bytes
+# video: a face-like shape (skin ellipse, eyes, mouth) drifting slowly over a noisy background
+# audio: voiced "syllables" (harmonic stack with a pitch contour and an envelope) separated by pauses
+# transcripts: interview style sentences mixing fillers, star keywords and sentiment words
+import wave
+from typing import List
+
+import numpy as np
+
+VIDEO_FPS = 30
+AUDIO_SAMPLE_RATE = 16000
+
+_OPENERS = ["so", "um", "well", "honestly", "i think", "in my last role", "uh", "you know"]
+_SUBJECTS = ["the team", "our project", "the customer", "my manager", "the deadline", "the system", "i"]
+_VERBS = ["handled", "improved", "struggled with", "delivered", "designed", "learned from", "fixed", "missed"]
+_OBJECTS = ["a difficult situation", "the main task", "every action item", "a great result", "a terrible bug",
+            "a really good example", "the slow database", "an amazing launch", "a bad outage", "the new api"]
+_CLOSERS = ["and it worked", "like really well", "which was not easy", "and we were happy", "so yeah",
+            "but it was frustrating", "and i would do it again", ""]
+
+
+def _face_sprite(width: int, height: int):
+    # face drawn once into its bounding box, (pixels, mask), pasted at a new position every frame
+    face_w, face_h = int(width * 0.16), int(height * 0.3)
+    ys, xs = np.mgrid[-face_h:face_h + 1, -face_w:face_w + 1].astype(np.float32)
+    sprite = np.zeros(ys.shape + (3,), dtype=np.uint8)
+    mask = (xs / face_w) ** 2 + (ys / face_h) ** 2 <= 1.0
+    sprite[mask] = (120, 160, 210)
+    for side in (-1, 1):
+        eye = ((xs - side * face_w * 0.4) / (face_w * 0.15)) ** 2 + ((ys + face_h * 0.2) / (face_h * 0.06)) ** 2 <= 1.0
+        sprite[eye] = (30, 30, 30)
+    mouth = (np.abs(xs) < face_w * 0.35) & (np.abs(ys - face_h * 0.45) < face_h * 0.04)
+    sprite[mouth] = (60, 60, 150)
+    return sprite, mask
+
+
+def render_frames(width: int, height: int, frame_count: int, seed: int = 0, first_index: int = 0) -> np.ndarray:
+    # (frame_count, height, width, 3) uint8 bgr frames
+    rng = np.random.default_rng(seed)
+    background = rng.integers(40, 90, size=(height, width, 3), dtype=np.uint8)
+    sprite, mask = _face_sprite(width, height)
+    sprite_h, sprite_w = mask.shape
+    frames = np.empty((frame_count, height, width, 3), dtype=np.uint8)
+    for offset in range(frame_count):
+        index = first_index + offset
+        # slow head motion, like someone talking in front of a webcam
+        cx = int(width / 2 + np.sin(index / 40.0) * width * 0.05)
+        cy = int(height / 2 + np.cos(index / 55.0) * height * 0.03)
+        top, left = cy - sprite_h // 2, cx - sprite_w // 2
+        frames[offset] = background
+        region = frames[offset, top:top + sprite_h, left:left + sprite_w]
+        region[mask] = sprite[mask]
+    return frames
+
+
+def write_video(path: str, width: int, height: int, seconds: float, seed: int = 0) -> int:
+    # mp4 (mp4v) file through opencv, returns the frame count written
+    import cv2
+    frame_count = max(int(seconds * VIDEO_FPS), 1)
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), VIDEO_FPS, (width, height))
+    if not writer.isOpened():
+        raise RuntimeError(f"OpenCV can't write {path}")
+    try:
+        # rendered in blocks so long clips don't hold every frame in memory
+        for start in range(0, frame_count, VIDEO_FPS):
+            for frame in render_frames(width, height, min(VIDEO_FPS, frame_count - start), seed, start):
+                writer.write(frame)
+    finally:
+        writer.release()
+    return frame_count
+
+
+def synthesize_speech_pcm(seconds: float, seed: int = 0, sample_rate: int = AUDIO_SAMPLE_RATE) -> np.ndarray:
+    # int16 mono samples
+    rng = np.random.default_rng(seed)
+    total = int(seconds * sample_rate)
+    signal = rng.normal(0.0, 0.01, total)  # room noise
+    position = 0
+    while position < total:
+        length = int(rng.uniform(0.12, 0.35) * sample_rate)
+        t = np.arange(min(length, total - position)) / sample_rate
+        pitch = rng.uniform(100, 220) * (1 + 0.1 * np.sin(2 * np.pi * rng.uniform(2, 5) * t))
+        phase = 2 * np.pi * np.cumsum(pitch) / sample_rate
+        voiced = sum(np.sin(phase * harmonic) / harmonic for harmonic in range(1, 6))
+        envelope = np.sin(np.pi * t / max(t[-1], 1e-6)) if t.size > 1 else np.ones(t.size)
+        signal[position:position + t.size] += 0.3 * voiced * envelope
+        # gap between syllables, now and then a longer pause between phrases
+        position += t.size + int(rng.choice([0.05, 0.08, 0.1, 0.6], p=[0.4, 0.3, 0.2, 0.1]) * sample_rate)
+    return (np.clip(signal, -1.0, 1.0) * 32767 * 0.8).astype(np.int16)
+
+
+def write_wav(path: str, seconds: float, seed: int = 0, sample_rate: int = AUDIO_SAMPLE_RATE):
+    pcm = synthesize_speech_pcm(seconds, seed, sample_rate)
+    with wave.open(path, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate)
+        wf.writeframes(pcm.tobytes())
+
+
+def make_transcript(word_count: int, seed: int = 0) -> str:
+    # exactly word_count words
+    rng = np.random.default_rng(seed)
+    words: List[str] = []
+    while len(words) < word_count:
+        parts = [
+            _OPENERS[rng.integers(len(_OPENERS))],
+            _SUBJECTS[rng.integers(len(_SUBJECTS))],
+            _VERBS[rng.integers(len(_VERBS))],
+            _OBJECTS[rng.integers(len(_OBJECTS))],
+            _CLOSERS[rng.integers(len(_CLOSERS))],
+        ]
+        words.extend(" ".join(parts).split())
+    return " ".join(words[:word_count])
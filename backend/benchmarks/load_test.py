@@ -0,0 +1,227 @@
+# in-process load test of the api layer - concurrent httpx clients drive the asgi app directly
+# (no sockets, no uvicorn) with the ai stages replaced by the stubs in app/services/mock_analysis.py,
+# so the numbers show how routing, the database, the caches and metrics scale on their own
+#
+#   cd backend
+#   python -m benchmarks.load_test                                   # 20 clients for 30 s
+#   python -m benchmarks.load_test --concurrency 50 --duration 60 --cost-ms 200 --cost-mode cpu
+#   python -m benchmarks.load_test --mix create=1,list=4,get=8,upload=1,delete=1 --workers 2
+#
+# everything the app writes (database, uploads, result cache, metrics, logs) goes to a temporary directory.
+# reports requests/s, latency percentiles and error rates per operation and writes them as json
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUTPUT = os.path.join(BENCHMARK_DIR, "results", "load_test.json")
+DEFAULT_MIX = "create=2,list=4,get=8,upload=1,delete=1"
+OPERATIONS = ["create", "list", "get", "upload", "delete"]
+API = "/api/v1/interviews"
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"unknown operation {name!r}, expected one of {OPERATIONS}")
+        weights[name.strip()] = float(weight or 1)
+    return weights
+
+
+def configure_environment(args, workdir: str):
+    # has to happen before anything imports app.core.config
+    os.environ.update({
+        "MOCK_AI_RESPONSES": "true",
+        "MOCK_AI_COST_MS": str(args.cost_ms),
+        "MOCK_AI_COST_MODE": args.cost_mode,
+        "ANALYSIS_WORKERS": str(args.workers),
+        "DATABASE_URL": args.database_url or f"sqlite:///{os.path.join(workdir, 'load_test.db')}",
+        "UPLOAD_FOLDER": os.path.join(workdir, "uploads"),
+        "RESULT_CACHE_DIR": os.path.join(workdir, "cache"),
+        "METRICS_PATH": os.path.join(workdir, "metrics"),
+        "LOG_FILE": os.path.join(workdir, "logs", "app.log"),
+    })
+
+
+class LoadRunner:
+    def __init__(self, client, weights: Dict[str, float], upload_bytes: int, seed: int):
+        self.client = client
+        self.operations = list(weights)
+        self.weights = list(weights.values())
+        self.upload_bytes = upload_bytes
+        self.random = random.Random(seed)
+        self.ids: List[int] = []  # interviews that exist, get and delete pick from here
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Counter] = defaultdict(Counter)
+
+    async def create(self):
+        response = await self.client.post(f"{API}/", json={"title": f"Load test {uuid.uuid4().hex[:8]}",
+                                                           "interview_type": "behavioral"})
+        if response.status_code == 200:
+            self.ids.append(response.json()["id"])
+        return response
+
+    async def list(self):
+        return await self.client.get(f"{API}/", params={"limit": 20})
+
+    async def get(self):
+        if not self.ids:
+            return await self.create()
+        return await self.client.get(f"{API}/{self.random.choice(self.ids)}")
+
+    async def upload(self):
+        # random bytes, so every upload misses the result cache and runs the (stub) pipeline
+        files = {"file": (f"load_{uuid.uuid4().hex}.mp4", os.urandom(self.upload_bytes), "video/mp4")}
+        data = {"question": "Tell me about a time you solved a difficult problem.", "question_type": "behavioral"}
+        response = await self.client.post(f"{API}/upload-video/", files=files, data=data)
+        if response.status_code == 200:
+            self.ids.append(response.json()["id"])
+        return response
+
+    async def delete(self):
+        if not self.ids:
+            return await self.create()
+        # taken out first so other clients stop fetching it
+        interview_id = self.ids.pop(self.random.randrange(len(self.ids)))
+        return await self.client.delete(f"{API}/{interview_id}")
+
+    async def client_loop(self, deadline: float):
+        while time.perf_counter() < deadline:
+            operation = self.random.choices(self.operations, self.weights)[0]
+            start = time.perf_counter()
+            try:
+                response = await getattr(self, operation)()
+                status = response.status_code
+            except Exception as e:
+                status = type(e).__name__
+            self.latencies[operation].append(time.perf_counter() - start)
+            self.statuses[operation][status] += 1
+
+    async def run(self, concurrency: int, duration: float) -> float:
+        start = time.perf_counter()
+        await asyncio.gather(*[self.client_loop(start + duration) for _ in range(concurrency)])
+        return time.perf_counter() - start
+
+
+def is_error(status) -> bool:
+    return not isinstance(status, int) or status >= 400
+
+
+def summarize(latencies: List[float], statuses: Counter, elapsed: float) -> Dict:
+    values = np.array(latencies) * 1000.0
+    errors = sum(count for status, count in statuses.items() if is_error(status))
+    percentiles = np.percentile(values, [50, 90, 95, 99]) if values.size else [0.0] * 4
+    return {
+        "requests": int(values.size),
+        "requests_per_second": round(values.size / elapsed, 2) if elapsed else 0.0,
+        "errors": errors,
+        "error_rate": round(errors / values.size, 4) if values.size else 0.0,
+        "latency_ms": {
+            "mean": round(float(values.mean()), 2) if values.size else 0.0,
+            "p50": round(float(percentiles[0]), 2),
+            "p90": round(float(percentiles[1]), 2),
+            "p95": round(float(percentiles[2]), 2),
+            "p99": round(float(percentiles[3]), 2),
+            "max": round(float(values.max()), 2) if values.size else 0.0,
+        },
+        "status_codes": {str(status): count for status, count in sorted(statuses.items(), key=str)},
+    }
+
+
+async def load_test(args) -> Dict:
+    import httpx
+    from app.main import app, lifespan
+
+    # request logging would dominate the profile, only warnings are shown
+    import logging
+    logging.getLogger().setLevel(args.log_level)
+
+    async with lifespan(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://load-test", timeout=None) as client:
+            runner = LoadRunner(client, args.mix, args.upload_kb * 1024, args.seed)
+            for _ in range(args.seed_interviews):
+                await runner.create()
+            # only the timed phase is reported
+            runner.latencies.clear()
+            runner.statuses.clear()
+            elapsed = await runner.run(args.concurrency, args.duration)
+            server_metrics = (await client.get(f"{API}/metrics")).json()
+
+    all_latencies = [value for values in runner.latencies.values() for value in values]
+    all_statuses = sum(runner.statuses.values(), Counter())
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        "config": {
+            "concurrency": args.concurrency,
+            "duration_seconds": args.duration,
+            "mix": args.mix,
+            "cost_ms": args.cost_ms,
+            "cost_mode": args.cost_mode,
+            "analysis_workers": args.workers,
+            "upload_kb": args.upload_kb,
+        },
+        "elapsed_seconds": round(elapsed, 3),
+        "total": summarize(all_latencies, all_statuses, elapsed),
+        "operations": {
+            operation: summarize(runner.latencies[operation], runner.statuses[operation], elapsed)
+            for operation in OPERATIONS if runner.latencies.get(operation)
+        },
+        # the server's own view - per endpoint and per pipeline stage latency histograms
+        "server_latency": server_metrics["data"]["latency"],
+    }
+
+
+def print_report(report: Dict):
+    print(f"{'operation':<10} {'requests':>9} {'req/s':>9} {'errors':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    rows = list(report["operations"].items()) + [("total", report["total"])]
+    for name, stats in rows:
+        latency = stats["latency_ms"]
+        print(f"{name:<10} {stats['requests']:>9} {stats['requests_per_second']:>9.1f} {stats['error_rate']:>8.2%} "
+              f"{latency['p50']:>9.1f} {latency['p95']:>9.1f} {latency['p99']:>9.1f} {latency['max']:>9.1f}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load test the interview api with stub analyzers")
+    parser.add_argument("--concurrency", type=int, default=20, help="concurrent clients")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of load")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX),
+                        help=f"operation weights (default {DEFAULT_MIX})")
+    parser.add_argument("--cost-ms", type=float, default=50.0, help="simulated cost of every stub analyzer call")
+    parser.add_argument("--cost-mode", choices=["sleep", "cpu"], default="sleep")
+    parser.add_argument("--workers", type=int, default=0, help="analysis process pool size (0 = thread mode)")
+    parser.add_argument("--upload-kb", type=int, default=256, help="size of every uploaded video")
+    parser.add_argument("--seed-interviews", type=int, default=50, help="interviews created before the timed run")
+    parser.add_argument("--database-url", help="database to test against (default: a temporary sqlite file)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--log-level", default="WARNING")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="interview-load-") as workdir:
+        configure_environment(args, workdir)
+        report = asyncio.run(load_test(args))
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print_report(report)
+    print(f"\nResults written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,269 @@
+# benchmark suite for the analysis stages in app/services/ai_analysis.py, on synthetic inputs
+#
+#   cd backend
+#   python -m benchmarks.run                          # full matrix, writes benchmarks/results/latest.json
+#   python -m benchmarks.run --quick                  # smallest case of every stage
+#   python -m benchmarks.run --stages sentiment filler_words
+#   python -m benchmarks.run --save-baseline          # store the run as benchmarks/baseline.json
+#   python -m benchmarks.run --baseline benchmarks/baseline.json --threshold 0.15
+#
+# every case runs once untimed (model loading, warm caches), then `repeat` timed runs of which the
+# fastest counts. peak memory comes from one more run under tracemalloc - it sees python and numpy
+# allocations, not native ones inside vosk or mediapipe.
+# the exit status is 1 when a case got slower or hungrier than the baseline allows
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.services import ai_analysis
+from benchmarks import fixtures
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUTPUT = os.path.join(BENCHMARK_DIR, "results", "latest.json")
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, "baseline.json")
+
+# (width, height) x seconds, audio seconds and transcript words - the first entry is the --quick case
+VIDEO_RESOLUTIONS = [(320, 240), (640, 480), (1280, 720)]
+VIDEO_SECONDS = [2, 10]
+EYE_CONTACT_MODES = ["sampled", "full"]
+AUDIO_SECONDS = [5, 30, 120]
+TRANSCRIPT_WORDS = [10, 100, 1000, 10000]
+SCORE_CALLS = 10000
+
+STAGES = ["eye_contact", "transcription", "sentiment", "filler_words", "overall_score"]
+
+
+@dataclass
+class Case:
+    stage: str
+    name: str
+    units: float  # work done by one run, throughput is units per second
+    unit: str
+    run: Callable[[], object]
+    repeat: int = 3
+
+    @property
+    def key(self) -> str:
+        return f"{self.stage}/{self.name}"
+
+
+def eye_contact_cases(workdir: str, quick: bool) -> List[Case]:
+    cases = []
+    resolutions = VIDEO_RESOLUTIONS[:1] if quick else VIDEO_RESOLUTIONS
+    lengths = VIDEO_SECONDS[:1] if quick else VIDEO_SECONDS
+    for width, height in resolutions:
+        for seconds in lengths:
+            path = os.path.join(workdir, f"video_{width}x{height}_{seconds}s.mp4")
+            frame_count = fixtures.write_video(path, width, height, seconds)
+            for mode in EYE_CONTACT_MODES:
+                cases.append(Case(
+                    "eye_contact", f"{mode}_{width}x{height}_{seconds}s", frame_count, "frames",
+                    lambda path=path, mode=mode: ai_analysis.analyze_eye_contact(path, mode=mode),
+                    repeat=1 if seconds > 2 else 2,
+                ))
+    return cases
+
+
+def transcription_cases(workdir: str, quick: bool) -> List[Case]:
+    cases = []
+    for seconds in (AUDIO_SECONDS[:1] if quick else AUDIO_SECONDS):
+        path = os.path.join(workdir, f"audio_{seconds}s.wav")
+        fixtures.write_wav(path, seconds)
+        cases.append(Case(
+            "transcription", f"wav_{seconds}s", seconds, "audio_seconds",
+            lambda path=path: ai_analysis.transcribe_audio(path),
+            repeat=1 if seconds > 5 else 2,
+        ))
+    return cases
+
+
+def text_cases(stage: str, quick: bool) -> List[Case]:
+    function = ai_analysis.analyze_sentiment if stage == "sentiment" else ai_analysis.count_filler_words
+    cases = []
+    for words in (TRANSCRIPT_WORDS[:1] if quick else TRANSCRIPT_WORDS):
+        transcript = fixtures.make_transcript(words)
+        # small inputs are timed over a batch of calls so the clock resolution doesn't matter
+        calls = max(1, 10000 // words)
+        cases.append(Case(
+            stage, f"{words}_words", words * calls, "words",
+            lambda transcript=transcript, calls=calls: [function(transcript) for _ in range(calls)],
+            repeat=5,
+        ))
+    return cases
+
+
+def overall_score_cases() -> List[Case]:
+    rng = np.random.default_rng(0)
+    inputs = list(zip(
+        rng.uniform(0, 100, SCORE_CALLS).tolist(),
+        rng.uniform(-1, 1, SCORE_CALLS).tolist(),
+        rng.uniform(0, 250, SCORE_CALLS).tolist(),
+        rng.integers(0, 20, SCORE_CALLS).tolist(),
+    ))
+    return [Case(
+        "overall_score", f"{SCORE_CALLS}_calls", SCORE_CALLS, "calls",
+        lambda: [ai_analysis.calculate_overall_score(*args) for args in inputs],
+        repeat=5,
+    )]
+
+
+def build_cases(stage: str, workdir: str, quick: bool) -> List[Case]:
+    if stage == "eye_contact":
+        return eye_contact_cases(workdir, quick)
+    if stage == "transcription":
+        return transcription_cases(workdir, quick)
+    if stage in ("sentiment", "filler_words"):
+        return text_cases(stage, quick)
+    return overall_score_cases()
+
+
+def measure(case: Case) -> Dict:
+    result = {"stage": case.stage, "case": case.name, "units": case.units, "unit": case.unit}
+    try:
+        case.run()
+        timings = []
+        for _ in range(case.repeat):
+            start = time.perf_counter()
+            case.run()
+            timings.append(time.perf_counter() - start)
+        tracemalloc.start()
+        try:
+            case.run()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    except Exception as e:
+        result.update(status="error", error=f"{type(e).__name__}: {e}")
+        return result
+    best = min(timings)
+    result.update(
+        status="ok",
+        seconds=round(best, 6),
+        mean_seconds=round(sum(timings) / len(timings), 6),
+        throughput=round(case.units / best, 3) if best > 0 else None,
+        peak_memory_mb=round(peak / (1024 * 1024), 3),
+    )
+    return result
+
+
+def compare(results: List[Dict], baseline: Dict, threshold: float) -> List[Dict]:
+    # throughput more than `threshold` below the baseline, or peak memory more than `threshold`
+    # above it (ignoring growth under 1 MB), counts as a regression - and so does a case that ran
+    # in the baseline and errors now (failed fixtures take every case of their stage with them)
+    previous = {f"{r['stage']}/{r['case']}": r for r in baseline.get("results", []) if r.get("status") == "ok"}
+    regressions = []
+    for result in results:
+        key = f"{result['stage']}/{result['case']}"
+        base = previous.get(key)
+        if result.get("status") != "ok":
+            if result["case"] == "fixtures":
+                failed = [k for k in previous if k.startswith(f"{result['stage']}/")]
+            else:
+                failed = [key] if base is not None else []
+            regressions.extend({"key": k, "metric": "status", "baseline": "ok", "current": result.get("error", "error")}
+                               for k in failed)
+            continue
+        if base is None:
+            continue
+        result["baseline_throughput"] = base["throughput"]
+        result["throughput_change"] = round(result["throughput"] / base["throughput"] - 1, 4) if base["throughput"] else None
+        if base["throughput"] and result["throughput"] < base["throughput"] * (1 - threshold):
+            regressions.append({"key": f"{result['stage']}/{result['case']}", "metric": "throughput",
+                                "baseline": base["throughput"], "current": result["throughput"]})
+        memory_growth = result["peak_memory_mb"] - base["peak_memory_mb"]
+        if memory_growth > 1.0 and result["peak_memory_mb"] > base["peak_memory_mb"] * (1 + threshold):
+            regressions.append({"key": f"{result['stage']}/{result['case']}", "metric": "peak_memory_mb",
+                                "baseline": base["peak_memory_mb"], "current": result["peak_memory_mb"]})
+    return regressions
+
+
+def environment() -> Dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=BENCHMARK_DIR, timeout=5).stdout.strip() or None
+    except Exception:
+        commit = None
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "analyzer_versions": ai_analysis.ANALYZER_VERSIONS,
+        "eye_contact_sample_fps": settings.eye_contact_sample_fps,
+        "eye_contact_max_width": settings.eye_contact_max_width,
+    }
+
+
+def print_table(results: List[Dict]):
+    print(f"{'case':<42} {'throughput':>16} {'best s':>10} {'peak MB':>9} {'vs base':>8}")
+    for result in results:
+        key = f"{result['stage']}/{result['case']}"
+        if result["status"] != "ok":
+            print(f"{key:<42} {'error: ' + result['error']}")
+            continue
+        change = result.get("throughput_change")
+        print(f"{key:<42} {result['throughput']:>10.1f} {result['unit'][:5] + '/s':>5} "
+              f"{result['seconds']:>10.4f} {result['peak_memory_mb']:>9.2f} "
+              f"{'' if change is None else f'{change:+.1%}':>8}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the interview analysis stages on synthetic inputs")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--quick", action="store_true", help="only the smallest case of every stage")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="where to write the json results")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15, help="allowed relative regression")
+    parser.add_argument("--save-baseline", action="store_true", help="write the results to --baseline too")
+    args = parser.parse_args(argv)
+    # the analysis modules log every call, only warnings are interesting here
+    logging.basicConfig(level=logging.WARNING)
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="interview-bench-") as workdir:
+        for stage in args.stages:
+            try:
+                cases = build_cases(stage, workdir, args.quick)
+            except Exception as e:
+                results.append({"stage": stage, "case": "fixtures", "status": "error", "error": f"{type(e).__name__}: {e}"})
+                continue
+            for case in cases:
+                results.append(measure(case))
+
+    regressions = []
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+
+    report = {"environment": environment(), "threshold": args.threshold, "results": results, "regressions": regressions}
+    paths = [args.output] + ([args.baseline] if args.save_baseline else [])
+    for path in paths:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+
+    print_table(results)
+    print(f"\nResults written to {', '.join(paths)}")
+    for regression in regressions:
+        print(f"REGRESSION {regression['key']} {regression['metric']}: "
+              f"{regression['baseline']} -> {regression['current']}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+# the vectorized sentiment engine has to score exactly like TextBlob(text).sentiment
+import numpy as np
+import pytest
+
+textblob = pytest.importorskip("textblob")
+
+from app.services.sentiment import load_textblob_lexicon, tokenize
+from app.services.word_track import WordTrack
+
+# vosk style transcripts (lowercase, no punctuation, contractions kept) and typed answers
+CORPUS = [
+    "it wasn't good",
+    "i can't say it was a good experience",
+    "honestly it's bad",
+    "it was good!!!",
+    "um so in my last role i handled a really difficult situation with the team",
+    "the main task was to deliver the project before the deadline and it wasn't easy",
+    "i don't think the first approach was very good but the second one worked really well",
+    "you know it was not easy but we improved the system a lot",
+    "uh overall i think it was a great experience for everyone involved",
+    "honestly i'm not very proud of how that went and i'd do it differently now",
+    "the customer was extremely unhappy and it was a terrible week",
+    "we never had a bad release after that",
+    "no good solution existed so we built our own",
+    "really not great to be honest",
+    "i was really really happy with the result",
+    "it's not a big deal, really!",
+    "Mr. Smith was very helpful. Great!",
+    "I'd say it went well... mostly.",
+    "That was \"fine\" - not amazing, not awful.",
+    "",
+]
+
+
+@pytest.fixture(scope="module")
+def lexicon():
+    return load_textblob_lexicon()
+
+
+def test_tokens_match_textblob():
+    assert tokenize("it wasn't good!") == ["it", "was", "n", "'", "t", "good", "!"]
+    assert tokenize("Honestly it's bad") == ["honestly", "it", "'", "s", "bad"]
+
+
+@pytest.mark.parametrize("text", CORPUS)
+def test_single_text_matches_textblob(lexicon, text):
+    expected = textblob.TextBlob(text).sentiment
+    result = lexicon.score_texts([text])[0]
+    assert result["polarity"] == pytest.approx(expected.polarity, abs=1e-9)
+    assert result["subjectivity"] == pytest.approx(expected.subjectivity, abs=1e-9)
+
+
+def test_batch_matches_one_by_one(lexicon):
+    # state never leaks from one text into the next
+    batch = lexicon.score_texts(CORPUS)
+    for text, result in zip(CORPUS, batch):
+        assert result == lexicon.score_texts([text])[0]
+
+
+def test_timeline_segments_match_textblob(lexicon):
+    words = " ".join(CORPUS[:16]).split()
+    start = np.arange(len(words)) * 0.5
+    track = WordTrack(words, start, start + 0.4, np.ones(len(words)))
+    timeline = lexicon.timeline(track, 10.0)
+    assert len(timeline) == int(start[-1] // 10.0) + 1
+    for segment in timeline:
+        text = " ".join(word for word, begin in zip(words, start) if segment["start"] <= begin < segment["start"] + 10.0)
+        assert segment["polarity"] == pytest.approx(textblob.TextBlob(text).sentiment.polarity, abs=1e-4)
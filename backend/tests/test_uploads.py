@@ -0,0 +1,90 @@
+# oversize uploads are refused by UploadLimitMiddleware before the body is spooled and parsed
+import asyncio
+import json
+
+from fastapi import FastAPI, File, UploadFile
+
+from app.core.config import settings
+from app.services.uploads import UploadLimitMiddleware
+
+PATH = "/upload"
+
+
+def _upload_app():
+    # a real multipart endpoint, so the cut off body goes through starlette's form parsing
+    app = FastAPI()
+
+    @app.post(PATH)
+    async def upload(file: UploadFile = File(...)):
+        return {"size": len(await file.read())}
+
+    return UploadLimitMiddleware(app, routes={PATH: 1})
+
+
+def _multipart(size: int):
+    boundary = b"limit-test"
+    head = (
+        b"--" + boundary + b"\r\n"
+        b'Content-Disposition: form-data; name="file"; filename="answer.mp4"\r\n'
+        b"Content-Type: video/mp4\r\n\r\n"
+    )
+    tail = b"\r\n--" + boundary + b"--\r\n"
+    return head + bytes(size) + tail, b"multipart/form-data; boundary=" + boundary
+
+
+def _call(app, body: bytes, content_type: bytes, declared=None, chunk_size=1024):
+    # drives the asgi app by hand, counting how many body chunks it pulls from the client
+    chunks = [body[i:i + chunk_size] for i in range(0, len(body), chunk_size)] or [b""]
+    pulled = []
+    sent = []
+
+    async def receive():
+        index = len(pulled)
+        pulled.append(index)
+        return {"type": "http.request", "body": chunks[index], "more_body": index + 1 < len(chunks)}
+
+    async def send(message):
+        sent.append(message)
+
+    headers = [(b"content-type", content_type)]
+    if declared is not None:
+        headers.append((b"content-length", str(declared).encode("ascii")))
+    scope = {
+        "type": "http", "method": "POST", "path": PATH, "raw_path": PATH.encode("ascii"),
+        "query_string": b"", "headers": headers, "scheme": "http", "http_version": "1.1",
+        "server": ("test", 80), "client": ("test", 1234), "root_path": "",
+    }
+    asyncio.run(app(scope, receive, send))
+    status = next(message["status"] for message in sent if message["type"] == "http.response.start")
+    payload = b"".join(message.get("body", b"") for message in sent if message["type"] == "http.response.body")
+    return status, json.loads(payload), len(pulled), len(chunks)
+
+
+def test_declared_oversize_is_refused_without_reading_the_body(monkeypatch):
+    monkeypatch.setattr(settings, "max_file_size", 4096)
+    body, content_type = _multipart(256 * 1024)
+    status, payload, pulled, _ = _call(_upload_app(), body, content_type, declared=len(body))
+    assert status == 413
+    assert "exceeds maximum upload size" in payload["detail"]
+    assert pulled == 0
+
+
+def test_streamed_oversize_stops_at_the_limit(monkeypatch):
+    # no content-length (chunked) - the body is cut off once it passes the limit, the rest is never pulled
+    monkeypatch.setattr(settings, "max_file_size", 4096)
+    monkeypatch.setattr(settings, "upload_multipart_slack", 1024)
+    body, content_type = _multipart(256 * 1024)
+    status, payload, pulled, total = _call(_upload_app(), body, content_type)
+    assert status == 413
+    assert "exceeds maximum upload size" in payload["detail"]
+    assert pulled <= (4096 + 1024) // 1024 + 1
+    assert pulled < total
+
+
+def test_upload_within_the_limit_passes(monkeypatch):
+    monkeypatch.setattr(settings, "max_file_size", 64 * 1024)
+    body, content_type = _multipart(10_000)
+    status, payload, pulled, total = _call(_upload_app(), body, content_type, declared=len(body))
+    assert status == 200
+    assert payload == {"size": 10_000}
+    assert pulled == total